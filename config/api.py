@@ -12,6 +12,9 @@ API_CONTEXT = {
         'master/linkedplaces-context-v1.1.jsonld',
     'LOUD': 'https://linked.art/ns/v1/linked-art.json'}
 
+# Entities formatted at once for streamed API results (stream=true)
+API_STREAM_CHUNK_SIZE = 100
+
 CORS_ALLOWANCE = '*'  # Cross-Origin source (CORS)
 ALLOWED_IPS = ['127.0.0.1']
 
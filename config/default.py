@@ -13,6 +13,9 @@ DATABASE_USER = 'openatlas'
 DATABASE_HOST = 'localhost'
 DATABASE_PORT = 5432
 DATABASE_PASS = 'CHANGE ME'
+DATABASE_POOL_MIN = 1  # Connections kept open for each worker process
+DATABASE_POOL_MAX = 10  # Set to 0 to open a new connection for each request
+DATABASE_POOL_CHECK_IDLE = 60  # Test connections idle longer (seconds)
 MAIL_PASSWORD = 'CHANGE ME'
 SECRET_KEY = 'CHANGE ME'  # Used for cookies
 
@@ -41,6 +44,13 @@ IMAGE_SIZE = {
     'thumbnail': '200',
     'table': '100'}
 
+# IIIF conversion of all files: parallel vips processes and attempts per file
+IIIF_CONVERSION_WORKERS = 4
+IIIF_CONVERSION_ATTEMPTS = 3
+# Take width and height for IIIF manifests from converted files instead of
+# asking the image server for the info.json
+IIIF_INFO_FROM_FILE = False
+
 # Security
 SESSION_COOKIE_SECURE = False  # Should be True in production.py if using HTTPS
 REMEMBER_COOKIE_SECURE = True
@@ -54,6 +64,16 @@ PROXIES: dict[str, str] = {}
 
 # Table options
 TABLE_ROWS = {10: '10', 25: '25', 50: '50', 100: '100'}
+# Entity index tables and entity selections in forms with more rows are paged,
+# sorted and filtered in the database instead of the browser. Set to 0 to
+# always load all rows.
+TABLE_SERVER_SIDE_ROWS = 5000
+
+# Maximum of places loaded for the visible area of a map
+MAP_FEATURES_MAX = 5000
+
+# Maximum of nodes shown in the network of an entity, 0 for no limit
+NETWORK_EGO_MAX_NODES = 2000
 
 # Minimum required characters for table filters
 MIN_CHARS_JSTREE_SEARCH = 1
@@ -64,6 +84,11 @@ CSS = {
         'primary': 'btn btn-outline-primary btn-sm',
         'secondary': 'btn btn-outline-secondary btn-sm'}}
 
+# Long running admin tasks, e.g. imports and exports, are run as jobs in
+# separate worker processes. Queued jobs can also be run with:
+# python3 -m flask --app openatlas run-jobs
+JOBS_IN_BACKGROUND = True
+
 # Tests
 LOAD_WINDOWS_TEST_SQL = False
 
@@ -20,6 +20,10 @@ ALTER TABLE IF EXISTS ONLY web.user_settings DROP CONSTRAINT IF EXISTS user_sett
 ALTER TABLE IF EXISTS ONLY web.user_notes DROP CONSTRAINT IF EXISTS user_notes_user_id_fkey;
 ALTER TABLE IF EXISTS ONLY web.user_notes DROP CONSTRAINT IF EXISTS user_notes_entity_id_fkey;
 ALTER TABLE IF EXISTS ONLY web."user" DROP CONSTRAINT IF EXISTS user_group_id_fkey;
+ALTER TABLE IF EXISTS ONLY web.iiif_conversion DROP CONSTRAINT IF EXISTS iiif_conversion_file_id_fkey;
+ALTER TABLE IF EXISTS ONLY web.iiif_info DROP CONSTRAINT IF EXISTS iiif_info_file_id_fkey;
+ALTER TABLE IF EXISTS ONLY web.invalid_link DROP CONSTRAINT IF EXISTS invalid_link_link_id_fkey;
+ALTER TABLE IF EXISTS ONLY web.job DROP CONSTRAINT IF EXISTS job_user_id_fkey;
 ALTER TABLE IF EXISTS ONLY web.user_bookmarks DROP CONSTRAINT IF EXISTS user_bookmarks_user_id_fkey;
 ALTER TABLE IF EXISTS ONLY web.user_bookmarks DROP CONSTRAINT IF EXISTS user_bookmarks_entity_id_fkey;
 ALTER TABLE IF EXISTS ONLY web.type_none_selectable DROP CONSTRAINT IF EXISTS type_none_selectable_entity_id_fkey;
@@ -58,6 +62,27 @@ ALTER TABLE IF EXISTS ONLY model.annotation_image DROP CONSTRAINT IF EXISTS anno
 ALTER TABLE IF EXISTS ONLY import.entity DROP CONSTRAINT IF EXISTS entity_user_id_fkey;
 ALTER TABLE IF EXISTS ONLY import.entity DROP CONSTRAINT IF EXISTS entity_project_id_fkey;
 ALTER TABLE IF EXISTS ONLY import.entity DROP CONSTRAINT IF EXISTS entity_entity_id_fkey;
+DROP TRIGGER IF EXISTS update_type_count_update ON model.link;
+DROP TRIGGER IF EXISTS update_property_count_update ON model.link;
+DROP TRIGGER IF EXISTS update_property_count ON model.link;
+DROP TRIGGER IF EXISTS update_class_count_update ON model.entity;
+DROP TRIGGER IF EXISTS update_class_count ON model.entity;
+DROP TRIGGER IF EXISTS update_type_count ON model.link;
+DROP TRIGGER IF EXISTS update_metadata_version ON web.type_none_selectable;
+DROP TRIGGER IF EXISTS update_metadata_version ON web.reference_system_openatlas_class;
+DROP TRIGGER IF EXISTS update_metadata_version ON web.reference_system;
+DROP TRIGGER IF EXISTS update_metadata_version ON web.hierarchy_openatlas_class;
+DROP TRIGGER IF EXISTS update_metadata_version ON web.hierarchy;
+DROP TRIGGER IF EXISTS update_metadata_version ON model.openatlas_class;
+DROP TRIGGER IF EXISTS log_network_change_update ON model.link;
+DROP TRIGGER IF EXISTS log_network_change_delete ON model.link;
+DROP TRIGGER IF EXISTS log_network_change ON model.link;
+DROP TRIGGER IF EXISTS log_network_change ON model.entity;
+DROP TRIGGER IF EXISTS update_metadata_version_delete ON model.link;
+DROP TRIGGER IF EXISTS update_metadata_version ON model.link;
+DROP TRIGGER IF EXISTS update_metadata_version ON model.file_info;
+DROP TRIGGER IF EXISTS update_metadata_version_delete ON model.entity;
+DROP TRIGGER IF EXISTS update_metadata_version ON model.entity;
 DROP TRIGGER IF EXISTS update_modified ON web.user_settings;
 DROP TRIGGER IF EXISTS update_modified ON web.user_notes;
 DROP TRIGGER IF EXISTS update_modified ON web.user_bookmarks;
@@ -71,11 +96,19 @@ DROP TRIGGER IF EXISTS update_modified ON web."group";
 DROP TRIGGER IF EXISTS update_modified ON model.link;
 DROP TRIGGER IF EXISTS update_modified ON model.gis;
 DROP TRIGGER IF EXISTS update_modified ON model.file_info;
+DROP TRIGGER IF EXISTS update_search_vector ON model.entity;
 DROP TRIGGER IF EXISTS update_modified ON model.entity;
 DROP TRIGGER IF EXISTS update_modified ON model.annotation_text;
 DROP TRIGGER IF EXISTS update_modified ON model.annotation_image;
 DROP TRIGGER IF EXISTS on_delete_entity ON model.entity;
 DROP TRIGGER IF EXISTS update_modified ON import.project;
+DROP INDEX IF EXISTS web.network_change_transaction_id_idx;
+DROP INDEX IF EXISTS model.gis_geom_polygon_idx;
+DROP INDEX IF EXISTS model.cidoc_valid_link_idx;
+DROP INDEX IF EXISTS model.gis_geom_point_idx;
+DROP INDEX IF EXISTS model.gis_geom_linestring_idx;
+DROP INDEX IF EXISTS model.entity_search_vector_idx;
+DROP INDEX IF EXISTS model.entity_name_trgm_idx;
 ALTER TABLE IF EXISTS ONLY web."user" DROP CONSTRAINT IF EXISTS user_username_key;
 ALTER TABLE IF EXISTS ONLY web.user_settings DROP CONSTRAINT IF EXISTS user_settings_user_id_name_key;
 ALTER TABLE IF EXISTS ONLY web.user_settings DROP CONSTRAINT IF EXISTS user_settings_pkey;
@@ -96,6 +129,10 @@ ALTER TABLE IF EXISTS ONLY web.reference_system_openatlas_class DROP CONSTRAINT
 ALTER TABLE IF EXISTS ONLY web.map_overlay DROP CONSTRAINT IF EXISTS map_overlay_pkey;
 ALTER TABLE IF EXISTS ONLY web.map_overlay DROP CONSTRAINT IF EXISTS map_overlay_image_id_key;
 ALTER TABLE IF EXISTS ONLY web.system_log DROP CONSTRAINT IF EXISTS log_pkey;
+ALTER TABLE IF EXISTS ONLY web.iiif_conversion DROP CONSTRAINT IF EXISTS iiif_conversion_pkey;
+ALTER TABLE IF EXISTS ONLY web.iiif_info DROP CONSTRAINT IF EXISTS iiif_info_pkey;
+ALTER TABLE IF EXISTS ONLY web.invalid_link DROP CONSTRAINT IF EXISTS invalid_link_pkey;
+ALTER TABLE IF EXISTS ONLY web.job DROP CONSTRAINT IF EXISTS job_pkey;
 ALTER TABLE IF EXISTS ONLY web.i18n DROP CONSTRAINT IF EXISTS i18n_pkey;
 ALTER TABLE IF EXISTS ONLY web.i18n DROP CONSTRAINT IF EXISTS i18n_name_language_key;
 ALTER TABLE IF EXISTS ONLY web.hierarchy DROP CONSTRAINT IF EXISTS hierarchy_pkey;
@@ -142,6 +179,7 @@ ALTER TABLE IF EXISTS web.system_log ALTER COLUMN id DROP DEFAULT;
 ALTER TABLE IF EXISTS web.settings ALTER COLUMN id DROP DEFAULT;
 ALTER TABLE IF EXISTS web.reference_system_openatlas_class ALTER COLUMN id DROP DEFAULT;
 ALTER TABLE IF EXISTS web.map_overlay ALTER COLUMN id DROP DEFAULT;
+ALTER TABLE IF EXISTS web.job ALTER COLUMN id DROP DEFAULT;
 ALTER TABLE IF EXISTS web.i18n ALTER COLUMN id DROP DEFAULT;
 ALTER TABLE IF EXISTS web.hierarchy_openatlas_class ALTER COLUMN id DROP DEFAULT;
 ALTER TABLE IF EXISTS web.hierarchy ALTER COLUMN id DROP DEFAULT;
@@ -177,10 +215,17 @@ DROP TABLE IF EXISTS web.settings;
 DROP SEQUENCE IF EXISTS web.reference_system_form_id_seq;
 DROP TABLE IF EXISTS web.reference_system_openatlas_class;
 DROP TABLE IF EXISTS web.reference_system;
+DROP SEQUENCE IF EXISTS web.metadata_version_seq;
 DROP SEQUENCE IF EXISTS web.map_overlay_id_seq;
+DROP TABLE IF EXISTS web.network_change;
 DROP TABLE IF EXISTS web.map_overlay;
 DROP SEQUENCE IF EXISTS web.log_id_seq;
 DROP TABLE IF EXISTS web.system_log;
+DROP SEQUENCE IF EXISTS web.job_id_seq;
+DROP TABLE IF EXISTS web.job;
+DROP TABLE IF EXISTS web.invalid_link;
+DROP TABLE IF EXISTS web.iiif_info;
+DROP TABLE IF EXISTS web.iiif_conversion;
 DROP SEQUENCE IF EXISTS web.i18n_id_seq;
 DROP TABLE IF EXISTS web.i18n;
 DROP SEQUENCE IF EXISTS web.hierarchy_id_seq;
@@ -192,6 +237,10 @@ DROP TABLE IF EXISTS web."group";
 DROP SEQUENCE IF EXISTS web.entity_profile_image_id_seq;
 DROP TABLE IF EXISTS web.entity_profile_image;
 DROP SEQUENCE IF EXISTS model.property_inheritance_id_seq;
+DROP MATERIALIZED VIEW IF EXISTS model.cidoc_valid_link;
+DROP TABLE IF EXISTS model.type_count;
+DROP TABLE IF EXISTS model.property_count;
+DROP TABLE IF EXISTS model.class_count;
 DROP TABLE IF EXISTS model.property_inheritance;
 DROP SEQUENCE IF EXISTS model.property_id_seq;
 DROP SEQUENCE IF EXISTS model.property_i18n_id_seq;
@@ -221,7 +270,17 @@ DROP SEQUENCE IF EXISTS import.project_id_seq;
 DROP TABLE IF EXISTS import.project;
 DROP SEQUENCE IF EXISTS import.entity_id_seq;
 DROP TABLE IF EXISTS import.entity;
+DROP FUNCTION IF EXISTS model.update_type_count();
+DROP FUNCTION IF EXISTS model.update_property_count();
+DROP FUNCTION IF EXISTS model.update_class_count();
+DROP FUNCTION IF EXISTS model.log_network_change();
+DROP FUNCTION IF EXISTS model.update_search_vector();
 DROP FUNCTION IF EXISTS model.update_modified();
+DROP FUNCTION IF EXISTS model.update_metadata_version_link();
+DROP FUNCTION IF EXISTS model.update_metadata_version();
+DROP FUNCTION IF EXISTS model.search_vector(text, text, text, text);
+DROP FUNCTION IF EXISTS model.search_text(text);
+DROP FUNCTION IF EXISTS model.search_config();
 DROP FUNCTION IF EXISTS model.delete_entity_related();
 DROP SCHEMA IF EXISTS web;
 DROP SCHEMA IF EXISTS model;
@@ -305,6 +364,262 @@ CREATE FUNCTION model.delete_entity_related() RETURNS trigger
 
 ALTER FUNCTION model.delete_entity_related() OWNER TO openatlas;
 
+--
+-- Name: search_config(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.search_config() RETURNS regconfig
+    LANGUAGE sql STABLE PARALLEL SAFE
+    AS $$
+   -- Text search configuration for the default language
+   SELECT CASE (SELECT value FROM web.settings WHERE name = 'default_language')
+      WHEN 'de' THEN 'pg_catalog.german'
+      WHEN 'en' THEN 'pg_catalog.english'
+      WHEN 'es' THEN 'pg_catalog.spanish'
+      WHEN 'fr' THEN 'pg_catalog.french'
+      ELSE 'pg_catalog.simple'
+   END::regconfig;
+$$;
+
+
+ALTER FUNCTION model.search_config() OWNER TO openatlas;
+
+--
+-- Name: search_text(text); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.search_text(text) RETURNS text
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $_$
+   -- Immutable (hence indexable) lower case and unaccented text for searches
+   SELECT public.unaccent('public.unaccent'::regdictionary, lower($1));
+$_$;
+
+
+ALTER FUNCTION model.search_text(text) OWNER TO openatlas;
+
+--
+-- Name: search_vector(text, text, text, text); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.search_vector(name text, description text, begin_comment text, end_comment text) RETURNS tsvector
+    LANGUAGE sql STABLE PARALLEL SAFE
+    AS $$
+   -- Names are indexed without stemming, descriptions and comments with the
+   -- text search configuration of the default language
+   SELECT
+      setweight(to_tsvector('pg_catalog.simple', model.search_text(name)), 'A') ||
+      setweight(
+         to_tsvector(
+            model.search_config(),
+            model.search_text(concat_ws(' ', description, begin_comment, end_comment))),
+         'B');
+$$;
+
+
+ALTER FUNCTION model.search_vector(name text, description text, begin_comment text, end_comment text) OWNER TO openatlas;
+
+--
+-- Name: update_metadata_version(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.update_metadata_version() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Signals application processes to reload their cached metadata
+   UPDATE web.settings
+   SET value = nextval('web.metadata_version_seq')::text
+   WHERE name = 'metadata_version';
+
+   RETURN NULL;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.update_metadata_version() OWNER TO openatlas;
+
+--
+-- Name: update_metadata_version_link(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.update_metadata_version_link() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Only links of types (super) and reference systems (precision) matter
+   IF EXISTS (
+         SELECT 1 FROM model.entity
+         WHERE id IN (OLD.domain_id, NEW.domain_id)
+            AND openatlas_class_name IN ('administrative_unit', 'reference_system', 'type', 'type_tools')) THEN
+      UPDATE web.settings
+      SET value = nextval('web.metadata_version_seq')::text
+      WHERE name = 'metadata_version';
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.update_metadata_version_link() OWNER TO openatlas;
+
+--
+-- Name: log_network_change(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.log_network_change() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Logs changed entities of network classes and their links for
+   -- application processes to update their network snapshots
+   IF TG_TABLE_NAME = 'entity' THEN
+      IF EXISTS (
+            SELECT 1
+            FROM model.openatlas_class
+            WHERE layout_color IS NOT NULL
+               AND name IN (NEW.openatlas_class_name, OLD.openatlas_class_name)) THEN
+         INSERT INTO web.network_change (entity_id) VALUES (COALESCE(NEW.id, OLD.id));
+      END IF;
+   ELSIF EXISTS (
+         SELECT 1
+         FROM model.entity e
+         JOIN model.openatlas_class c ON e.openatlas_class_name = c.name
+            AND c.layout_color IS NOT NULL
+         WHERE e.id IN (NEW.domain_id, NEW.range_id, OLD.domain_id, OLD.range_id)) THEN
+      INSERT INTO web.network_change (link_id) VALUES (COALESCE(NEW.id, OLD.id));
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.log_network_change() OWNER TO openatlas;
+
+--
+-- Name: update_search_vector(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.update_search_vector() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   NEW.search_vector = model.search_vector(NEW.name, NEW.description, NEW.begin_comment, NEW.end_comment);
+
+   RETURN NEW;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.update_search_vector() OWNER TO openatlas;
+
+--
+-- Name: update_type_count(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.update_type_count() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Keeps the counts of entities (P2, P89) and links (type_id) for types
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      IF OLD.property_code IN ('P2', 'P89') THEN
+         UPDATE model.type_count SET count = count - 1 WHERE type_id = OLD.range_id;
+      END IF;
+      IF OLD.type_id IS NOT NULL THEN
+         UPDATE model.type_count SET count_property = count_property - 1 WHERE type_id = OLD.type_id;
+      END IF;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      IF NEW.property_code IN ('P2', 'P89') THEN
+         INSERT INTO model.type_count (type_id, count) VALUES (NEW.range_id, 1)
+         ON CONFLICT (type_id) DO UPDATE SET count = model.type_count.count + 1;
+      END IF;
+      IF NEW.type_id IS NOT NULL THEN
+         INSERT INTO model.type_count (type_id, count_property) VALUES (NEW.type_id, 1)
+         ON CONFLICT (type_id) DO UPDATE SET count_property = model.type_count.count_property + 1;
+      END IF;
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.update_type_count() OWNER TO openatlas;
+
+--
+-- Name: update_class_count(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.update_class_count() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Keeps the counts of entities for OpenAtlas and CIDOC classes
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      UPDATE model.class_count SET count = count - 1
+      WHERE openatlas_class_name = OLD.openatlas_class_name AND cidoc_class_code = OLD.cidoc_class_code;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      INSERT INTO model.class_count (openatlas_class_name, cidoc_class_code, count) VALUES (NEW.openatlas_class_name, NEW.cidoc_class_code, 1)
+      ON CONFLICT (openatlas_class_name, cidoc_class_code) DO UPDATE SET count = model.class_count.count + 1;
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.update_class_count() OWNER TO openatlas;
+
+--
+-- Name: update_property_count(); Type: FUNCTION; Schema: model; Owner: openatlas
+--
+
+CREATE FUNCTION model.update_property_count() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Keeps the counts of links for properties
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      UPDATE model.property_count SET count = count - 1 WHERE property_code = OLD.property_code;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      INSERT INTO model.property_count (property_code, count) VALUES (NEW.property_code, 1)
+      ON CONFLICT (property_code) DO UPDATE SET count = model.property_count.count + 1;
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+
+
+ALTER FUNCTION model.update_property_count() OWNER TO openatlas;
+
 --
 -- Name: update_modified(); Type: FUNCTION; Schema: model; Owner: openatlas
 --
@@ -608,12 +923,20 @@ CREATE TABLE model.entity (
     end_to timestamp without time zone,
     end_comment text,
     openatlas_class_name text NOT NULL,
+    search_vector tsvector,
     CONSTRAINT no_empty_name CHECK ((name <> ''::text))
 );
 
 
 ALTER TABLE model.entity OWNER TO openatlas;
 
+--
+-- Name: COLUMN entity.search_vector; Type: COMMENT; Schema: model; Owner: openatlas
+--
+
+COMMENT ON COLUMN model.entity.search_vector IS 'Full text search index of name, description and comments, maintained by the update_search_vector trigger';
+
+
 --
 -- Name: entity_id_seq; Type: SEQUENCE; Schema: model; Owner: openatlas
 --
@@ -932,6 +1255,98 @@ ALTER TABLE model.property_inheritance_id_seq OWNER TO openatlas;
 ALTER SEQUENCE model.property_inheritance_id_seq OWNED BY model.property_inheritance.id;
 
 
+--
+-- Name: type_count; Type: TABLE; Schema: model; Owner: openatlas
+--
+
+CREATE TABLE model.type_count (
+    type_id integer NOT NULL,
+    count integer DEFAULT 0 NOT NULL,
+    count_property integer DEFAULT 0 NOT NULL
+);
+
+
+ALTER TABLE model.type_count OWNER TO openatlas;
+
+--
+-- Name: TABLE type_count; Type: COMMENT; Schema: model; Owner: openatlas
+--
+
+COMMENT ON TABLE model.type_count IS 'Usage counts of types, maintained by the update_type_count triggers of model.link';
+
+
+--
+-- Name: class_count; Type: TABLE; Schema: model; Owner: openatlas
+--
+
+CREATE TABLE model.class_count (
+    openatlas_class_name text NOT NULL,
+    cidoc_class_code text NOT NULL,
+    count integer DEFAULT 0 NOT NULL
+);
+
+
+ALTER TABLE model.class_count OWNER TO openatlas;
+
+--
+-- Name: TABLE class_count; Type: COMMENT; Schema: model; Owner: openatlas
+--
+
+COMMENT ON TABLE model.class_count IS 'Usage counts of OpenAtlas and CIDOC classes, maintained by the update_class_count triggers of model.entity';
+
+
+--
+-- Name: property_count; Type: TABLE; Schema: model; Owner: openatlas
+--
+
+CREATE TABLE model.property_count (
+    property_code text NOT NULL,
+    count integer DEFAULT 0 NOT NULL
+);
+
+
+ALTER TABLE model.property_count OWNER TO openatlas;
+
+--
+-- Name: TABLE property_count; Type: COMMENT; Schema: model; Owner: openatlas
+--
+
+COMMENT ON TABLE model.property_count IS 'Usage counts of properties, maintained by the update_property_count triggers of model.link';
+
+
+--
+-- Name: cidoc_valid_link; Type: MATERIALIZED VIEW; Schema: model; Owner: openatlas
+--
+
+CREATE MATERIALIZED VIEW model.cidoc_valid_link AS
+ WITH RECURSIVE closure(super_code, sub_code) AS (
+         SELECT cidoc_class.code,
+            cidoc_class.code
+           FROM model.cidoc_class
+        UNION
+         SELECT c.super_code,
+            i.sub_code
+           FROM (closure c
+             JOIN model.cidoc_class_inheritance i ON ((i.super_code = c.sub_code)))
+        )
+ SELECT p.code AS property_code,
+    d.sub_code AS domain_class_code,
+    r.sub_code AS range_class_code
+   FROM ((model.property p
+     JOIN closure d ON ((d.super_code = p.domain_class_code)))
+     JOIN closure r ON ((r.super_code = p.range_class_code)))
+  WITH NO DATA;
+
+
+ALTER MATERIALIZED VIEW model.cidoc_valid_link OWNER TO openatlas;
+
+--
+-- Name: MATERIALIZED VIEW cidoc_valid_link; Type: COMMENT; Schema: model; Owner: openatlas
+--
+
+COMMENT ON MATERIALIZED VIEW model.cidoc_valid_link IS 'Valid combinations of property, domain class and range class, including subclasses, used to check links';
+
+
 --
 -- Name: entity_profile_image; Type: TABLE; Schema: web; Owner: openatlas
 --
@@ -1167,6 +1582,139 @@ ALTER TABLE web.log_id_seq OWNER TO openatlas;
 ALTER SEQUENCE web.log_id_seq OWNED BY web.system_log.id;
 
 
+--
+-- Name: iiif_conversion; Type: TABLE; Schema: web; Owner: openatlas
+--
+
+CREATE TABLE web.iiif_conversion (
+    file_id integer NOT NULL,
+    status text NOT NULL,
+    attempts integer DEFAULT 0 NOT NULL,
+    message text,
+    modified timestamp without time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE web.iiif_conversion OWNER TO openatlas;
+
+--
+-- Name: TABLE iiif_conversion; Type: COMMENT; Schema: web; Owner: openatlas
+--
+
+COMMENT ON TABLE web.iiif_conversion IS 'Ledger of IIIF conversions (done or failed) of files, used to resume and retry bulk conversions';
+
+
+--
+-- Name: iiif_info; Type: TABLE; Schema: web; Owner: openatlas
+--
+
+CREATE TABLE web.iiif_info (
+    file_id integer NOT NULL,
+    url text NOT NULL,
+    info jsonb NOT NULL,
+    created timestamp without time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE web.iiif_info OWNER TO openatlas;
+
+--
+-- Name: TABLE iiif_info; Type: COMMENT; Schema: web; Owner: openatlas
+--
+
+COMMENT ON TABLE web.iiif_info IS 'Cached info.json of IIIF images, used for manifests instead of asking the image server each time';
+
+
+--
+-- Name: invalid_link; Type: TABLE; Schema: web; Owner: openatlas
+--
+
+CREATE TABLE web.invalid_link (
+    link_id integer NOT NULL
+);
+
+
+ALTER TABLE web.invalid_link OWNER TO openatlas;
+
+--
+-- Name: TABLE invalid_link; Type: COMMENT; Schema: web; Owner: openatlas
+--
+
+COMMENT ON TABLE web.invalid_link IS 'Links with invalid CIDOC classes found by the last check_links job';
+
+
+--
+-- Name: job; Type: TABLE; Schema: web; Owner: openatlas
+--
+
+CREATE TABLE web.job (
+    id integer NOT NULL,
+    name text NOT NULL,
+    status text DEFAULT 'queued'::text NOT NULL,
+    arguments jsonb,
+    progress integer DEFAULT 0 NOT NULL,
+    total integer,
+    message text,
+    result text,
+    user_id integer,
+    created timestamp without time zone DEFAULT now() NOT NULL,
+    started timestamp without time zone,
+    finished timestamp without time zone
+);
+
+
+ALTER TABLE web.job OWNER TO openatlas;
+
+--
+-- Name: TABLE job; Type: COMMENT; Schema: web; Owner: openatlas
+--
+
+COMMENT ON TABLE web.job IS 'Queue of long running admin tasks, e.g. imports and exports, executed by worker processes';
+
+
+--
+-- Name: job_id_seq; Type: SEQUENCE; Schema: web; Owner: openatlas
+--
+
+CREATE SEQUENCE web.job_id_seq
+    AS integer
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER TABLE web.job_id_seq OWNER TO openatlas;
+
+--
+-- Name: job_id_seq; Type: SEQUENCE OWNED BY; Schema: web; Owner: openatlas
+--
+
+ALTER SEQUENCE web.job_id_seq OWNED BY web.job.id;
+
+
+--
+-- Name: network_change; Type: TABLE; Schema: web; Owner: openatlas
+--
+
+CREATE TABLE web.network_change (
+    entity_id integer,
+    link_id integer,
+    transaction_id xid8 DEFAULT pg_current_xact_id() NOT NULL,
+    created timestamp without time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE web.network_change OWNER TO openatlas;
+
+--
+-- Name: TABLE network_change; Type: COMMENT; Schema: web; Owner: openatlas
+--
+
+COMMENT ON TABLE web.network_change IS 'Changed entities and links of networks, used to update network snapshots of application processes';
+
+
 --
 -- Name: map_overlay; Type: TABLE; Schema: web; Owner: openatlas
 --
@@ -1203,6 +1751,27 @@ ALTER TABLE web.map_overlay_id_seq OWNER TO openatlas;
 ALTER SEQUENCE web.map_overlay_id_seq OWNED BY web.map_overlay.id;
 
 
+--
+-- Name: metadata_version_seq; Type: SEQUENCE; Schema: web; Owner: openatlas
+--
+
+CREATE SEQUENCE web.metadata_version_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER TABLE web.metadata_version_seq OWNER TO openatlas;
+
+--
+-- Name: SEQUENCE metadata_version_seq; Type: COMMENT; Schema: web; Owner: openatlas
+--
+
+COMMENT ON SEQUENCE web.metadata_version_seq IS 'Values for the metadata_version setting';
+
+
 --
 -- Name: reference_system; Type: TABLE; Schema: web; Owner: openatlas
 --
@@ -1680,6 +2249,13 @@ ALTER TABLE ONLY web.reference_system_openatlas_class ALTER COLUMN id SET DEFAUL
 ALTER TABLE ONLY web.settings ALTER COLUMN id SET DEFAULT nextval('web.settings_id_seq'::regclass);
 
 
+--
+-- Name: job id; Type: DEFAULT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.job ALTER COLUMN id SET DEFAULT nextval('web.job_id_seq'::regclass);
+
+
 --
 -- Name: system_log id; Type: DEFAULT; Schema: web; Owner: openatlas
 --
@@ -1929,6 +2505,30 @@ ALTER TABLE ONLY model.property
     ADD CONSTRAINT property_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: type_count type_count_pkey; Type: CONSTRAINT; Schema: model; Owner: openatlas
+--
+
+ALTER TABLE ONLY model.type_count
+    ADD CONSTRAINT type_count_pkey PRIMARY KEY (type_id);
+
+
+--
+-- Name: class_count class_count_pkey; Type: CONSTRAINT; Schema: model; Owner: openatlas
+--
+
+ALTER TABLE ONLY model.class_count
+    ADD CONSTRAINT class_count_pkey PRIMARY KEY (openatlas_class_name, cidoc_class_code);
+
+
+--
+-- Name: property_count property_count_pkey; Type: CONSTRAINT; Schema: model; Owner: openatlas
+--
+
+ALTER TABLE ONLY model.property_count
+    ADD CONSTRAINT property_count_pkey PRIMARY KEY (property_code);
+
+
 --
 -- Name: type_none_selectable entity_id_key; Type: CONSTRAINT; Schema: web; Owner: openatlas
 --
@@ -2017,6 +2617,38 @@ ALTER TABLE ONLY web.i18n
     ADD CONSTRAINT i18n_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: iiif_conversion iiif_conversion_pkey; Type: CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.iiif_conversion
+    ADD CONSTRAINT iiif_conversion_pkey PRIMARY KEY (file_id);
+
+
+--
+-- Name: iiif_info iiif_info_pkey; Type: CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.iiif_info
+    ADD CONSTRAINT iiif_info_pkey PRIMARY KEY (file_id);
+
+
+--
+-- Name: invalid_link invalid_link_pkey; Type: CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.invalid_link
+    ADD CONSTRAINT invalid_link_pkey PRIMARY KEY (link_id);
+
+
+--
+-- Name: job job_pkey; Type: CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.job
+    ADD CONSTRAINT job_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: system_log log_pkey; Type: CONSTRAINT; Schema: web; Owner: openatlas
 --
@@ -2177,6 +2809,55 @@ ALTER TABLE ONLY web."user"
     ADD CONSTRAINT user_username_key UNIQUE (username);
 
 
+--
+-- Name: cidoc_valid_link_idx; Type: INDEX; Schema: model; Owner: openatlas
+--
+
+CREATE UNIQUE INDEX cidoc_valid_link_idx ON model.cidoc_valid_link USING btree (property_code, domain_class_code, range_class_code);
+
+
+--
+-- Name: entity_name_trgm_idx; Type: INDEX; Schema: model; Owner: openatlas
+--
+
+CREATE INDEX entity_name_trgm_idx ON model.entity USING gin (model.search_text(name) public.gin_trgm_ops);
+
+
+--
+-- Name: entity_search_vector_idx; Type: INDEX; Schema: model; Owner: openatlas
+--
+
+CREATE INDEX entity_search_vector_idx ON model.entity USING gin (search_vector);
+
+
+--
+-- Name: gis_geom_linestring_idx; Type: INDEX; Schema: model; Owner: openatlas
+--
+
+CREATE INDEX gis_geom_linestring_idx ON model.gis USING gist (geom_linestring);
+
+
+--
+-- Name: gis_geom_point_idx; Type: INDEX; Schema: model; Owner: openatlas
+--
+
+CREATE INDEX gis_geom_point_idx ON model.gis USING gist (geom_point);
+
+
+--
+-- Name: gis_geom_polygon_idx; Type: INDEX; Schema: model; Owner: openatlas
+--
+
+CREATE INDEX gis_geom_polygon_idx ON model.gis USING gist (geom_polygon);
+
+
+--
+-- Name: network_change_transaction_id_idx; Type: INDEX; Schema: web; Owner: openatlas
+--
+
+CREATE INDEX network_change_transaction_id_idx ON web.network_change USING btree (transaction_id);
+
+
 --
 -- Name: project update_modified; Type: TRIGGER; Schema: import; Owner: openatlas
 --
@@ -2191,6 +2872,76 @@ CREATE TRIGGER update_modified BEFORE UPDATE ON import.project FOR EACH ROW EXEC
 CREATE TRIGGER on_delete_entity BEFORE DELETE ON model.entity FOR EACH ROW EXECUTE FUNCTION model.delete_entity_related();
 
 
+--
+-- Name: entity update_metadata_version; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE ON model.entity FOR EACH ROW WHEN ((new.openatlas_class_name = ANY (ARRAY['administrative_unit'::text, 'reference_system'::text, 'type'::text, 'type_tools'::text]))) EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: entity update_metadata_version_delete; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version_delete AFTER DELETE ON model.entity FOR EACH ROW WHEN ((old.openatlas_class_name = ANY (ARRAY['administrative_unit'::text, 'reference_system'::text, 'type'::text, 'type_tools'::text]))) EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: file_info update_metadata_version; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON model.file_info FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: link update_metadata_version; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE ON model.link FOR EACH ROW WHEN ((new.property_code = ANY (ARRAY['P2'::text, 'P89'::text, 'P127'::text]))) EXECUTE FUNCTION model.update_metadata_version_link();
+
+
+--
+-- Name: link update_metadata_version_delete; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version_delete AFTER DELETE ON model.link FOR EACH ROW WHEN ((old.property_code = ANY (ARRAY['P2'::text, 'P89'::text, 'P127'::text]))) EXECUTE FUNCTION model.update_metadata_version_link();
+
+
+--
+-- Name: entity log_network_change; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER log_network_change AFTER INSERT OR DELETE OR UPDATE OF name, openatlas_class_name ON model.entity FOR EACH ROW EXECUTE FUNCTION model.log_network_change();
+
+
+--
+-- Name: link log_network_change; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER log_network_change AFTER INSERT ON model.link FOR EACH ROW WHEN ((new.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text]))) EXECUTE FUNCTION model.log_network_change();
+
+
+--
+-- Name: link log_network_change_delete; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER log_network_change_delete AFTER DELETE ON model.link FOR EACH ROW WHEN ((old.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text]))) EXECUTE FUNCTION model.log_network_change();
+
+
+--
+-- Name: link log_network_change_update; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER log_network_change_update AFTER UPDATE ON model.link FOR EACH ROW WHEN (((old.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text])) OR (new.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text])))) EXECUTE FUNCTION model.log_network_change();
+
+
+--
+-- Name: openatlas_class update_metadata_version; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON model.openatlas_class FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
 --
 -- Name: annotation_image update_modified; Type: TRIGGER; Schema: model; Owner: openatlas
 --
@@ -2209,7 +2960,14 @@ CREATE TRIGGER update_modified BEFORE UPDATE ON model.annotation_text FOR EACH R
 -- Name: entity update_modified; Type: TRIGGER; Schema: model; Owner: openatlas
 --
 
-CREATE TRIGGER update_modified BEFORE UPDATE ON model.entity FOR EACH ROW EXECUTE FUNCTION model.update_modified();
+CREATE TRIGGER update_modified BEFORE UPDATE ON model.entity FOR EACH ROW WHEN ((old.search_vector IS NOT DISTINCT FROM new.search_vector)) EXECUTE FUNCTION model.update_modified();
+
+
+--
+-- Name: entity update_search_vector; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_search_vector BEFORE INSERT OR UPDATE OF name, description, begin_comment, end_comment ON model.entity FOR EACH ROW EXECUTE FUNCTION model.update_search_vector();
 
 
 --
@@ -2233,6 +2991,83 @@ CREATE TRIGGER update_modified BEFORE UPDATE ON model.gis FOR EACH ROW EXECUTE F
 CREATE TRIGGER update_modified BEFORE UPDATE ON model.link FOR EACH ROW EXECUTE FUNCTION model.update_modified();
 
 
+--
+-- Name: link update_type_count; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_type_count AFTER INSERT OR DELETE ON model.link FOR EACH ROW EXECUTE FUNCTION model.update_type_count();
+
+
+--
+-- Name: link update_type_count_update; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_type_count_update AFTER UPDATE ON model.link FOR EACH ROW WHEN (((old.range_id IS DISTINCT FROM new.range_id) OR (old.property_code IS DISTINCT FROM new.property_code) OR (old.type_id IS DISTINCT FROM new.type_id))) EXECUTE FUNCTION model.update_type_count();
+
+
+--
+-- Name: entity update_class_count; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_class_count AFTER INSERT OR DELETE ON model.entity FOR EACH ROW EXECUTE FUNCTION model.update_class_count();
+
+
+--
+-- Name: entity update_class_count_update; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_class_count_update AFTER UPDATE ON model.entity FOR EACH ROW WHEN (((old.openatlas_class_name IS DISTINCT FROM new.openatlas_class_name) OR (old.cidoc_class_code IS DISTINCT FROM new.cidoc_class_code))) EXECUTE FUNCTION model.update_class_count();
+
+
+--
+-- Name: link update_property_count; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_property_count AFTER INSERT OR DELETE ON model.link FOR EACH ROW EXECUTE FUNCTION model.update_property_count();
+
+
+--
+-- Name: link update_property_count_update; Type: TRIGGER; Schema: model; Owner: openatlas
+--
+
+CREATE TRIGGER update_property_count_update AFTER UPDATE ON model.link FOR EACH ROW WHEN ((old.property_code IS DISTINCT FROM new.property_code)) EXECUTE FUNCTION model.update_property_count();
+
+
+--
+-- Name: hierarchy update_metadata_version; Type: TRIGGER; Schema: web; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON web.hierarchy FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: hierarchy_openatlas_class update_metadata_version; Type: TRIGGER; Schema: web; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON web.hierarchy_openatlas_class FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: reference_system update_metadata_version; Type: TRIGGER; Schema: web; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON web.reference_system FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: reference_system_openatlas_class update_metadata_version; Type: TRIGGER; Schema: web; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON web.reference_system_openatlas_class FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
+--
+-- Name: type_none_selectable update_metadata_version; Type: TRIGGER; Schema: web; Owner: openatlas
+--
+
+CREATE TRIGGER update_metadata_version AFTER INSERT OR DELETE OR UPDATE ON web.type_none_selectable FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+
 --
 -- Name: group update_modified; Type: TRIGGER; Schema: web; Owner: openatlas
 --
@@ -2511,6 +3346,14 @@ ALTER TABLE ONLY model.property
     ADD CONSTRAINT property_range_class_code_fkey FOREIGN KEY (range_class_code) REFERENCES model.cidoc_class(code) ON UPDATE CASCADE ON DELETE CASCADE;
 
 
+--
+-- Name: type_count type_count_type_id_fkey; Type: FK CONSTRAINT; Schema: model; Owner: openatlas
+--
+
+ALTER TABLE ONLY model.type_count
+    ADD CONSTRAINT type_count_type_id_fkey FOREIGN KEY (type_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+
 --
 -- Name: entity_profile_image entity_profile_image_entity_id_fkey; Type: FK CONSTRAINT; Schema: web; Owner: openatlas
 --
@@ -2591,6 +3434,38 @@ ALTER TABLE ONLY web.type_none_selectable
     ADD CONSTRAINT type_none_selectable_entity_id_fkey FOREIGN KEY (entity_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
 
 
+--
+-- Name: iiif_conversion iiif_conversion_file_id_fkey; Type: FK CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.iiif_conversion
+    ADD CONSTRAINT iiif_conversion_file_id_fkey FOREIGN KEY (file_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+
+--
+-- Name: iiif_info iiif_info_file_id_fkey; Type: FK CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.iiif_info
+    ADD CONSTRAINT iiif_info_file_id_fkey FOREIGN KEY (file_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+
+--
+-- Name: invalid_link invalid_link_link_id_fkey; Type: FK CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.invalid_link
+    ADD CONSTRAINT invalid_link_link_id_fkey FOREIGN KEY (link_id) REFERENCES model.link(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+
+--
+-- Name: job job_user_id_fkey; Type: FK CONSTRAINT; Schema: web; Owner: openatlas
+--
+
+ALTER TABLE ONLY web.job
+    ADD CONSTRAINT job_user_id_fkey FOREIGN KEY (user_id) REFERENCES web."user"(id) ON UPDATE CASCADE ON DELETE SET NULL;
+
+
 --
 -- Name: user_bookmarks user_bookmarks_entity_id_fkey; Type: FK CONSTRAINT; Schema: web; Owner: openatlas
 --
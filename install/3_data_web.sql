@@ -46,6 +46,7 @@ INSERT INTO web.settings (name, value) VALUES
   ('map_cluster_max_radius', '50'),
   ('map_zoom_default', '12'),
   ('map_zoom_max', '18'),
+  ('metadata_version', '0'),
   ('minimum_jstree_search', '1'),
   ('minimum_password_length', '12'),
   ('module_map_overlay', 'True'),
@@ -0,0 +1,83 @@
+# Script to measure time and memory needed to create entities and links from
+# database rows and to decode their dates afterward
+#
+# No database changes are made but the configured database is used to load
+# the application data, e.g. classes.
+#
+# To use it, execute from project root:
+# python3 install/benchmark_entities.py --rows 100000
+#
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# pylint: disable=wrong-import-position
+from openatlas import app
+from openatlas.models.entity import Dates, Entity, Link
+
+
+def benchmark(rows: int) -> dict[str, dict[str, float]]:
+    """Time (seconds) and memory (bytes) to create entities and links from
+    rows and to decode their dates afterward."""
+    entity_row = {
+        'id': 0,
+        'name': 'Benchmark',
+        'description': None,
+        'created': None,
+        'modified': None,
+        'cidoc_class_code': 'E21',
+        'openatlas_class_name': 'person',
+        'begin_from': -66008995200,  # 0123-04-05 BC
+        'begin_to': None,
+        'begin_comment': None,
+        'end_from': 1704067200,  # 2024-01-01
+        'end_to': 1735689599,  # 2024-12-31 23:59:59
+        'end_comment': None}
+    link_row = entity_row | {'property_code': 'P11', 'type_id': None}
+    domain = Entity(entity_row)
+    return {
+        'entities': measure(
+            Entity,
+            [entity_row | {'id': i} for i in range(rows)]),
+        'links': measure(
+            lambda row: Link(row, domain, domain),
+            [link_row | {'id': i} for i in range(rows)])}
+
+
+def measure(
+        create: Callable[[dict[str, Any]], Dates],
+        rows: list[dict[str, Any]]) -> dict[str, float]:
+    tracemalloc.start()  # Separate run because tracing slows it down
+    items = [create(row) for row in rows]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    start = time.perf_counter()
+    items = [create(row) for row in rows]
+    seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for item in items:
+        item.decode_dates()
+    return {
+        'seconds': seconds,
+        'memory': memory,
+        'dates': time.perf_counter() - start}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    count = parser.parse_args().rows
+    with app.test_request_context():
+        app.preprocess_request()
+        for name, result in benchmark(count).items():
+            print(
+                f"{count} {name}: {result['seconds']:.2f} s, "
+                f"{result['memory'] / 1024 / 1024:.1f} MB, "
+                f"dates decoded in {result['dates']:.2f} s")
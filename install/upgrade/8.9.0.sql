@@ -2280,4 +2280,384 @@ ALTER TABLE ONLY model.entity ADD CONSTRAINT entity_openatlas_class_name_fkey FO
 ALTER TABLE ONLY model.openatlas_class ADD CONSTRAINT openatlas_class_cidoc_class_code_fkey FOREIGN KEY (cidoc_class_code) REFERENCES model.cidoc_class(code) ON UPDATE CASCADE ON DELETE CASCADE;
 ALTER TABLE ONLY web.reference_system_openatlas_class ADD CONSTRAINT reference_system_openatlas_class_openatlas_class_name_fkey FOREIGN KEY (openatlas_class_name) REFERENCES model.openatlas_class(name) ON UPDATE CASCADE ON DELETE CASCADE;
 
+-- Metadata version, raised by triggers to invalidate cached metadata of application processes
+INSERT INTO web.settings (name, value) VALUES ('metadata_version', '0') ON CONFLICT (name) DO NOTHING;
+CREATE SEQUENCE IF NOT EXISTS web.metadata_version_seq START WITH 1 INCREMENT BY 1 NO MINVALUE NO MAXVALUE CACHE 1;
+ALTER TABLE web.metadata_version_seq OWNER TO openatlas;
+COMMENT ON SEQUENCE web.metadata_version_seq IS 'Values for the metadata_version setting';
+DROP FUNCTION IF EXISTS model.update_metadata_version() CASCADE;
+DROP FUNCTION IF EXISTS model.update_metadata_version_link() CASCADE;
+CREATE FUNCTION model.update_metadata_version() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Signals application processes to reload their cached metadata
+   UPDATE web.settings
+   SET value = nextval('web.metadata_version_seq')::text
+   WHERE name = 'metadata_version';
+
+   RETURN NULL;
+
+END;
+
+$$;
+ALTER FUNCTION model.update_metadata_version() OWNER TO openatlas;
+CREATE FUNCTION model.update_metadata_version_link() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Only links of types (super) and reference systems (precision) matter
+   IF EXISTS (
+         SELECT 1 FROM model.entity
+         WHERE id IN (OLD.domain_id, NEW.domain_id)
+            AND openatlas_class_name IN ('administrative_unit', 'reference_system', 'type', 'type_tools')) THEN
+      UPDATE web.settings
+      SET value = nextval('web.metadata_version_seq')::text
+      WHERE name = 'metadata_version';
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+ALTER FUNCTION model.update_metadata_version_link() OWNER TO openatlas;
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE ON model.entity FOR EACH ROW WHEN (NEW.openatlas_class_name IN ('administrative_unit', 'reference_system', 'type', 'type_tools')) EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version_delete AFTER DELETE ON model.entity FOR EACH ROW WHEN (OLD.openatlas_class_name IN ('administrative_unit', 'reference_system', 'type', 'type_tools')) EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE ON model.link FOR EACH ROW WHEN (NEW.property_code IN ('P2', 'P89', 'P127')) EXECUTE FUNCTION model.update_metadata_version_link();
+CREATE TRIGGER update_metadata_version_delete AFTER DELETE ON model.link FOR EACH ROW WHEN (OLD.property_code IN ('P2', 'P89', 'P127')) EXECUTE FUNCTION model.update_metadata_version_link();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON model.file_info FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON model.openatlas_class FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON web.hierarchy FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON web.hierarchy_openatlas_class FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON web.reference_system FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON web.reference_system_openatlas_class FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+CREATE TRIGGER update_metadata_version AFTER INSERT OR UPDATE OR DELETE ON web.type_none_selectable FOR EACH STATEMENT EXECUTE FUNCTION model.update_metadata_version();
+
+-- Type counts, maintained by triggers instead of aggregating links at every request
+DROP TABLE IF EXISTS model.type_count;
+CREATE TABLE model.type_count (
+    type_id integer NOT NULL,
+    count integer DEFAULT 0 NOT NULL,
+    count_property integer DEFAULT 0 NOT NULL
+);
+ALTER TABLE model.type_count OWNER TO openatlas;
+COMMENT ON TABLE model.type_count IS 'Usage counts of types, maintained by the update_type_count triggers of model.link';
+ALTER TABLE ONLY model.type_count ADD CONSTRAINT type_count_pkey PRIMARY KEY (type_id);
+ALTER TABLE ONLY model.type_count ADD CONSTRAINT type_count_type_id_fkey FOREIGN KEY (type_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
+INSERT INTO model.type_count (type_id, count, count_property)
+SELECT
+    e.id,
+    (SELECT COUNT(*) FROM model.link l WHERE l.range_id = e.id AND l.property_code IN ('P2', 'P89')),
+    (SELECT COUNT(*) FROM model.link l WHERE l.type_id = e.id)
+FROM model.entity e
+WHERE e.openatlas_class_name IN ('administrative_unit', 'type', 'type_tools');
+DROP FUNCTION IF EXISTS model.update_type_count() CASCADE;
+CREATE FUNCTION model.update_type_count() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Keeps the counts of entities (P2, P89) and links (type_id) for types
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      IF OLD.property_code IN ('P2', 'P89') THEN
+         UPDATE model.type_count SET count = count - 1 WHERE type_id = OLD.range_id;
+      END IF;
+      IF OLD.type_id IS NOT NULL THEN
+         UPDATE model.type_count SET count_property = count_property - 1 WHERE type_id = OLD.type_id;
+      END IF;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      IF NEW.property_code IN ('P2', 'P89') THEN
+         INSERT INTO model.type_count (type_id, count) VALUES (NEW.range_id, 1)
+         ON CONFLICT (type_id) DO UPDATE SET count = model.type_count.count + 1;
+      END IF;
+      IF NEW.type_id IS NOT NULL THEN
+         INSERT INTO model.type_count (type_id, count_property) VALUES (NEW.type_id, 1)
+         ON CONFLICT (type_id) DO UPDATE SET count_property = model.type_count.count_property + 1;
+      END IF;
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+ALTER FUNCTION model.update_type_count() OWNER TO openatlas;
+CREATE TRIGGER update_type_count AFTER INSERT OR DELETE ON model.link FOR EACH ROW EXECUTE FUNCTION model.update_type_count();
+CREATE TRIGGER update_type_count_update AFTER UPDATE ON model.link FOR EACH ROW WHEN (((old.range_id IS DISTINCT FROM new.range_id) OR (old.property_code IS DISTINCT FROM new.property_code) OR (old.type_id IS DISTINCT FROM new.type_id))) EXECUTE FUNCTION model.update_type_count();
+
+-- Background jobs for long running admin tasks
+DROP TABLE IF EXISTS web.job;
+CREATE TABLE web.job (
+    id integer NOT NULL,
+    name text NOT NULL,
+    status text DEFAULT 'queued'::text NOT NULL,
+    arguments jsonb,
+    progress integer DEFAULT 0 NOT NULL,
+    total integer,
+    message text,
+    result text,
+    user_id integer,
+    created timestamp without time zone DEFAULT now() NOT NULL,
+    started timestamp without time zone,
+    finished timestamp without time zone
+);
+ALTER TABLE web.job OWNER TO openatlas;
+COMMENT ON TABLE web.job IS 'Queue of long running admin tasks, e.g. imports and exports, executed by worker processes';
+CREATE SEQUENCE web.job_id_seq AS integer START WITH 1 INCREMENT BY 1 NO MINVALUE NO MAXVALUE CACHE 1;
+ALTER TABLE web.job_id_seq OWNER TO openatlas;
+ALTER SEQUENCE web.job_id_seq OWNED BY web.job.id;
+ALTER TABLE ONLY web.job ALTER COLUMN id SET DEFAULT nextval('web.job_id_seq'::regclass);
+ALTER TABLE ONLY web.job ADD CONSTRAINT job_pkey PRIMARY KEY (id);
+ALTER TABLE ONLY web.job ADD CONSTRAINT job_user_id_fkey FOREIGN KEY (user_id) REFERENCES web."user"(id) ON UPDATE CASCADE ON DELETE SET NULL;
+
+-- Spatial indexes for map queries by bounding box
+CREATE INDEX IF NOT EXISTS gis_geom_linestring_idx ON model.gis USING gist (geom_linestring);
+CREATE INDEX IF NOT EXISTS gis_geom_point_idx ON model.gis USING gist (geom_point);
+CREATE INDEX IF NOT EXISTS gis_geom_polygon_idx ON model.gis USING gist (geom_polygon);
+
+-- Search index for names (trigram) and descriptions (full text)
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+CREATE OR REPLACE FUNCTION model.search_config() RETURNS regconfig
+    LANGUAGE sql STABLE PARALLEL SAFE
+    AS $$
+   -- Text search configuration for the default language
+   SELECT CASE (SELECT value FROM web.settings WHERE name = 'default_language')
+      WHEN 'de' THEN 'pg_catalog.german'
+      WHEN 'en' THEN 'pg_catalog.english'
+      WHEN 'es' THEN 'pg_catalog.spanish'
+      WHEN 'fr' THEN 'pg_catalog.french'
+      ELSE 'pg_catalog.simple'
+   END::regconfig;
+$$;
+ALTER FUNCTION model.search_config() OWNER TO openatlas;
+CREATE OR REPLACE FUNCTION model.search_text(text) RETURNS text
+    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE
+    AS $_$
+   -- Immutable (hence indexable) lower case and unaccented text for searches
+   SELECT public.unaccent('public.unaccent'::regdictionary, lower($1));
+$_$;
+ALTER FUNCTION model.search_text(text) OWNER TO openatlas;
+CREATE OR REPLACE FUNCTION model.search_vector(name text, description text, begin_comment text, end_comment text) RETURNS tsvector
+    LANGUAGE sql STABLE PARALLEL SAFE
+    AS $$
+   -- Names are indexed without stemming, descriptions and comments with the
+   -- text search configuration of the default language
+   SELECT
+      setweight(to_tsvector('pg_catalog.simple', model.search_text(name)), 'A') ||
+      setweight(
+         to_tsvector(
+            model.search_config(),
+            model.search_text(concat_ws(' ', description, begin_comment, end_comment))),
+         'B');
+$$;
+ALTER FUNCTION model.search_vector(name text, description text, begin_comment text, end_comment text) OWNER TO openatlas;
+CREATE OR REPLACE FUNCTION model.update_search_vector() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   NEW.search_vector = model.search_vector(NEW.name, NEW.description, NEW.begin_comment, NEW.end_comment);
+
+   RETURN NEW;
+
+END;
+
+$$;
+ALTER FUNCTION model.update_search_vector() OWNER TO openatlas;
+ALTER TABLE model.entity ADD COLUMN IF NOT EXISTS search_vector tsvector;
+COMMENT ON COLUMN model.entity.search_vector IS 'Full text search index of name, description and comments, maintained by the update_search_vector trigger';
+DROP TRIGGER IF EXISTS update_search_vector ON model.entity;
+CREATE TRIGGER update_search_vector BEFORE INSERT OR UPDATE OF name, description, begin_comment, end_comment ON model.entity FOR EACH ROW EXECUTE FUNCTION model.update_search_vector();
+-- Rebuilding search vectors, e.g. after the default language changed, keeps modified dates
+DROP TRIGGER IF EXISTS update_modified ON model.entity;
+CREATE TRIGGER update_modified BEFORE UPDATE ON model.entity FOR EACH ROW WHEN ((old.search_vector IS NOT DISTINCT FROM new.search_vector)) EXECUTE FUNCTION model.update_modified();
+ALTER TABLE model.entity DISABLE TRIGGER update_metadata_version;
+UPDATE model.entity SET search_vector = model.search_vector(name, description, begin_comment, end_comment);
+ALTER TABLE model.entity ENABLE TRIGGER update_metadata_version;
+CREATE INDEX IF NOT EXISTS entity_name_trgm_idx ON model.entity USING gin (model.search_text(name) public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS entity_search_vector_idx ON model.entity USING gin (search_vector);
+
+-- Log of changed network entities and links to update cached network snapshots of application processes
+CREATE TABLE IF NOT EXISTS web.network_change (
+    entity_id integer,
+    link_id integer,
+    transaction_id xid8 DEFAULT pg_current_xact_id() NOT NULL,
+    created timestamp without time zone DEFAULT now() NOT NULL);
+ALTER TABLE web.network_change OWNER TO openatlas;
+COMMENT ON TABLE web.network_change IS 'Changed entities and links of networks, used to update network snapshots of application processes';
+CREATE INDEX IF NOT EXISTS network_change_transaction_id_idx ON web.network_change USING btree (transaction_id);
+CREATE OR REPLACE FUNCTION model.log_network_change() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Logs changed entities of network classes and their links for
+   -- application processes to update their network snapshots
+   IF TG_TABLE_NAME = 'entity' THEN
+      IF EXISTS (
+            SELECT 1
+            FROM model.openatlas_class
+            WHERE layout_color IS NOT NULL
+               AND name IN (NEW.openatlas_class_name, OLD.openatlas_class_name)) THEN
+         INSERT INTO web.network_change (entity_id) VALUES (COALESCE(NEW.id, OLD.id));
+      END IF;
+   ELSIF EXISTS (
+         SELECT 1
+         FROM model.entity e
+         JOIN model.openatlas_class c ON e.openatlas_class_name = c.name
+            AND c.layout_color IS NOT NULL
+         WHERE e.id IN (NEW.domain_id, NEW.range_id, OLD.domain_id, OLD.range_id)) THEN
+      INSERT INTO web.network_change (link_id) VALUES (COALESCE(NEW.id, OLD.id));
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+ALTER FUNCTION model.log_network_change() OWNER TO openatlas;
+DROP TRIGGER IF EXISTS log_network_change ON model.entity;
+CREATE TRIGGER log_network_change AFTER INSERT OR DELETE OR UPDATE OF name, openatlas_class_name ON model.entity FOR EACH ROW EXECUTE FUNCTION model.log_network_change();
+DROP TRIGGER IF EXISTS log_network_change ON model.link;
+CREATE TRIGGER log_network_change AFTER INSERT ON model.link FOR EACH ROW WHEN ((new.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text]))) EXECUTE FUNCTION model.log_network_change();
+DROP TRIGGER IF EXISTS log_network_change_delete ON model.link;
+CREATE TRIGGER log_network_change_delete AFTER DELETE ON model.link FOR EACH ROW WHEN ((old.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text]))) EXECUTE FUNCTION model.log_network_change();
+DROP TRIGGER IF EXISTS log_network_change_update ON model.link;
+CREATE TRIGGER log_network_change_update AFTER UPDATE ON model.link FOR EACH ROW WHEN (((old.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text])) OR (new.property_code = ANY (ARRAY['P7'::text, 'P11'::text, 'P14'::text, 'P22'::text, 'P23'::text, 'P24'::text, 'P25'::text, 'P27'::text, 'P31'::text, 'P52'::text, 'P53'::text, 'P74'::text, 'P107'::text, 'OA7'::text, 'OA8'::text, 'OA9'::text])))) EXECUTE FUNCTION model.log_network_change();
+
+
+-- IIIF conversion ledger for resumable bulk conversions
+DROP TABLE IF EXISTS web.iiif_conversion;
+CREATE TABLE web.iiif_conversion (
+    file_id integer NOT NULL,
+    status text NOT NULL,
+    attempts integer DEFAULT 0 NOT NULL,
+    message text,
+    modified timestamp without time zone DEFAULT now() NOT NULL
+);
+ALTER TABLE web.iiif_conversion OWNER TO openatlas;
+COMMENT ON TABLE web.iiif_conversion IS 'Ledger of IIIF conversions (done or failed) of files, used to resume and retry bulk conversions';
+ALTER TABLE ONLY web.iiif_conversion ADD CONSTRAINT iiif_conversion_pkey PRIMARY KEY (file_id);
+ALTER TABLE ONLY web.iiif_conversion ADD CONSTRAINT iiif_conversion_file_id_fkey FOREIGN KEY (file_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+
+-- Cache of IIIF info.json
+DROP TABLE IF EXISTS web.iiif_info;
+CREATE TABLE web.iiif_info (
+    file_id integer NOT NULL,
+    url text NOT NULL,
+    info jsonb NOT NULL,
+    created timestamp without time zone DEFAULT now() NOT NULL
+);
+ALTER TABLE web.iiif_info OWNER TO openatlas;
+COMMENT ON TABLE web.iiif_info IS 'Cached info.json of IIIF images, used for manifests instead of asking the image server each time';
+ALTER TABLE ONLY web.iiif_info ADD CONSTRAINT iiif_info_pkey PRIMARY KEY (file_id);
+ALTER TABLE ONLY web.iiif_info ADD CONSTRAINT iiif_info_file_id_fkey FOREIGN KEY (file_id) REFERENCES model.entity(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
+-- Class and property counts, maintained by triggers instead of aggregating entities and links
+DROP TABLE IF EXISTS model.class_count;
+CREATE TABLE model.class_count (
+    openatlas_class_name text NOT NULL,
+    cidoc_class_code text NOT NULL,
+    count integer DEFAULT 0 NOT NULL
+);
+ALTER TABLE model.class_count OWNER TO openatlas;
+COMMENT ON TABLE model.class_count IS 'Usage counts of OpenAtlas and CIDOC classes, maintained by the update_class_count triggers of model.entity';
+ALTER TABLE ONLY model.class_count ADD CONSTRAINT class_count_pkey PRIMARY KEY (openatlas_class_name, cidoc_class_code);
+INSERT INTO model.class_count (openatlas_class_name, cidoc_class_code, count)
+SELECT openatlas_class_name, cidoc_class_code, COUNT(*) FROM model.entity GROUP BY openatlas_class_name, cidoc_class_code;
+DROP TABLE IF EXISTS model.property_count;
+CREATE TABLE model.property_count (
+    property_code text NOT NULL,
+    count integer DEFAULT 0 NOT NULL
+);
+ALTER TABLE model.property_count OWNER TO openatlas;
+COMMENT ON TABLE model.property_count IS 'Usage counts of properties, maintained by the update_property_count triggers of model.link';
+ALTER TABLE ONLY model.property_count ADD CONSTRAINT property_count_pkey PRIMARY KEY (property_code);
+INSERT INTO model.property_count (property_code, count)
+SELECT property_code, COUNT(*) FROM model.link GROUP BY property_code;
+DROP FUNCTION IF EXISTS model.update_class_count() CASCADE;
+CREATE FUNCTION model.update_class_count() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Keeps the counts of entities for OpenAtlas and CIDOC classes
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      UPDATE model.class_count SET count = count - 1
+      WHERE openatlas_class_name = OLD.openatlas_class_name AND cidoc_class_code = OLD.cidoc_class_code;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      INSERT INTO model.class_count (openatlas_class_name, cidoc_class_code, count) VALUES (NEW.openatlas_class_name, NEW.cidoc_class_code, 1)
+      ON CONFLICT (openatlas_class_name, cidoc_class_code) DO UPDATE SET count = model.class_count.count + 1;
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+ALTER FUNCTION model.update_class_count() OWNER TO openatlas;
+DROP FUNCTION IF EXISTS model.update_property_count() CASCADE;
+CREATE FUNCTION model.update_property_count() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+
+   -- Keeps the counts of links for properties
+   IF TG_OP IN ('UPDATE', 'DELETE') THEN
+      UPDATE model.property_count SET count = count - 1 WHERE property_code = OLD.property_code;
+   END IF;
+   IF TG_OP IN ('INSERT', 'UPDATE') THEN
+      INSERT INTO model.property_count (property_code, count) VALUES (NEW.property_code, 1)
+      ON CONFLICT (property_code) DO UPDATE SET count = model.property_count.count + 1;
+   END IF;
+
+   RETURN NULL;
+
+END;
+
+$$;
+ALTER FUNCTION model.update_property_count() OWNER TO openatlas;
+CREATE TRIGGER update_class_count AFTER INSERT OR DELETE ON model.entity FOR EACH ROW EXECUTE FUNCTION model.update_class_count();
+CREATE TRIGGER update_class_count_update AFTER UPDATE ON model.entity FOR EACH ROW WHEN (((old.openatlas_class_name IS DISTINCT FROM new.openatlas_class_name) OR (old.cidoc_class_code IS DISTINCT FROM new.cidoc_class_code))) EXECUTE FUNCTION model.update_class_count();
+CREATE TRIGGER update_property_count AFTER INSERT OR DELETE ON model.link FOR EACH ROW EXECUTE FUNCTION model.update_property_count();
+CREATE TRIGGER update_property_count_update AFTER UPDATE ON model.link FOR EACH ROW WHEN ((old.property_code IS DISTINCT FROM new.property_code)) EXECUTE FUNCTION model.update_property_count();
+
+-- Valid CIDOC link combinations for the invalid link check
+DROP MATERIALIZED VIEW IF EXISTS model.cidoc_valid_link;
+CREATE MATERIALIZED VIEW model.cidoc_valid_link AS
+ WITH RECURSIVE closure(super_code, sub_code) AS (
+         SELECT cidoc_class.code,
+            cidoc_class.code
+           FROM model.cidoc_class
+        UNION
+         SELECT c.super_code,
+            i.sub_code
+           FROM (closure c
+             JOIN model.cidoc_class_inheritance i ON ((i.super_code = c.sub_code)))
+        )
+ SELECT p.code AS property_code,
+    d.sub_code AS domain_class_code,
+    r.sub_code AS range_class_code
+   FROM ((model.property p
+     JOIN closure d ON ((d.super_code = p.domain_class_code)))
+     JOIN closure r ON ((r.super_code = p.range_class_code)))
+  WITH DATA;
+ALTER MATERIALIZED VIEW model.cidoc_valid_link OWNER TO openatlas;
+COMMENT ON MATERIALIZED VIEW model.cidoc_valid_link IS 'Valid combinations of property, domain class and range class, including subclasses, used to check links';
+CREATE UNIQUE INDEX cidoc_valid_link_idx ON model.cidoc_valid_link USING btree (property_code, domain_class_code, range_class_code);
+
+-- Results of the invalid link check, links removed in the meantime are removed by the foreign key
+DROP TABLE IF EXISTS web.invalid_link;
+CREATE TABLE web.invalid_link (link_id integer NOT NULL);
+ALTER TABLE web.invalid_link OWNER TO openatlas;
+COMMENT ON TABLE web.invalid_link IS 'Links with invalid CIDOC classes found by the last check_links job';
+ALTER TABLE ONLY web.invalid_link ADD CONSTRAINT invalid_link_pkey PRIMARY KEY (link_id);
+ALTER TABLE ONLY web.invalid_link ADD CONSTRAINT invalid_link_link_id_fkey FOREIGN KEY (link_id) REFERENCES model.link(id) ON UPDATE CASCADE ON DELETE CASCADE;
+
 END;
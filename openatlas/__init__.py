@@ -1,4 +1,5 @@
 import locale
+from pathlib import Path
 from typing import Any, Optional
 
 from flask import Flask, Response, g, request, session
@@ -15,6 +16,12 @@ csrf = CSRFProtect(app)  # Make sure all forms are CSRF protected
 app.config.from_object('config.default')
 app.config.from_object('config.api')
 app.config.from_pyfile('production.py')
+app.config.from_prefixed_env('OPENATLAS')  # E.g. for job workers
+PATH_SETTINGS = [
+    'EXPORT_PATH', 'UPLOAD_PATH', 'TMP_PATH', 'PROCESSED_IMAGE_PATH',
+    'RESIZED_IMAGES']
+app.config.update({  # Values from the environment are strings
+    key: Path(app.config[key]) for key in PATH_SETTINGS})
 app.config['WTF_CSRF_TIME_LIMIT'] = None  # Set CSRF token valid for session
 
 locale.setlocale(locale.LC_ALL, 'en_US.utf-8')
@@ -25,8 +32,8 @@ from openatlas.models.logger import Logger
 from openatlas.api import api
 from openatlas.views import (
     admin, ajax, annotation, arche, changelog, entity, entity_index, error,
-    export, file, hierarchy, index, imports, link, login, model, note, overlay,
-    profile, search, sql, tools, type as type_, user, vocabs)
+    export, file, hierarchy, index, imports, job, link, login, model, note,
+    overlay, profile, search, sql, tools, type as type_, user, vocabs)
 
 
 @babel.localeselector
@@ -42,13 +49,7 @@ def get_locale() -> str:
 
 @app.before_request
 def before_request() -> None:
-    from openatlas.models.openatlas_class import (
-        OpenatlasClass, view_class_mapping)
-    from openatlas.models.cidoc_property import CidocProperty
-    from openatlas.models.cidoc_class import CidocClass
-    from openatlas.models.type import Type
     from openatlas.models.settings import Settings
-    from openatlas.models.reference_system import ReferenceSystem
 
     if request.path.startswith('/static'):
         return  # Avoid files overhead if not using Apache with static alias
@@ -59,15 +60,36 @@ def before_request() -> None:
     g.cursor = g.db.cursor(cursor_factory=extras.DictCursor)
     g.settings = Settings.get_settings()
     session['language'] = get_locale()
+    setup_metadata()
+    g.writable_paths = [
+        app.config['EXPORT_PATH'],
+        app.config['RESIZED_IMAGES'],
+        app.config['UPLOAD_PATH'],
+        app.config['TMP_PATH']]
+    setup_files()
+    setup_api()
+
+
+def setup_metadata() -> None:
+    from openatlas.models.cidoc_class import CidocClass
+    from openatlas.models.cidoc_property import CidocProperty
+    from openatlas.models.entity import Entity
+    from openatlas.models.openatlas_class import (
+        OpenatlasClass, view_class_mapping)
+    from openatlas.models.reference_system import ReferenceSystem
+    from openatlas.models.type import Type
+
+    # Database rows of metadata are cached per process while the
+    # metadata_version, changed by database triggers at relevant changes,
+    # is the same. Objects are built from them for every request, so they
+    # can be changed. Requests with modifications always query the database.
+    g.metadata_version = \
+        g.settings.get('metadata_version') if request.method == 'GET' else None
+    g.file_info = Entity.get_file_info()
     g.cidoc_classes = CidocClass.get_all(session['language'])
     g.properties = CidocProperty.get_all(session['language'])
     g.classes = OpenatlasClass.get_all()
-    with_count = False
-    if (request.path.startswith(('/type', '/api/type_tree/', '/admin/orphans'))
-            or (request.path.startswith('/entity/') and
-                request.path.split('/entity/')[1].isdigit())):
-        with_count = True
-    g.types = Type.get_all(with_count)
+    g.types = Type.get_all()
     g.radiocarbon_type = Type.get_hierarchy('Radiocarbon')
     g.sex_type = Type.get_hierarchy('Features for sexing')
     g.reference_match_type = Type.get_hierarchy('External reference match')
@@ -75,21 +97,11 @@ def before_request() -> None:
     g.view_class_mapping = view_class_mapping
     g.class_view_mapping = OpenatlasClass.get_class_view_mapping()
     g.table_headers = OpenatlasClass.get_table_headers()
-    g.writable_paths = [
-        app.config['EXPORT_PATH'],
-        app.config['RESIZED_IMAGES'],
-        app.config['UPLOAD_PATH'],
-        app.config['TMP_PATH']]
-    setup_files()
-    setup_api()
 
 
 def setup_files() -> None:
-    from openatlas.models.entity import Entity
-    g.files = {}
-    for file_ in app.config['UPLOAD_PATH'].iterdir():
-        if file_.stem.isdigit():
-            g.files[int(file_.stem)] = file_
+    from openatlas.models.file_registry import get_registry
+    g.files = get_registry(app.config['UPLOAD_PATH']).files
     app.config['MAX_CONTENT_LENGTH'] = \
         g.settings['file_upload_max_size'] * 1024 * 1024  # Max upload in MB
     g.display_file_ext = app.config['DISPLAY_FILE_EXT']
@@ -97,7 +109,6 @@ def setup_files() -> None:
         g.display_file_ext += app.config['PROCESSABLE_EXT']
     if g.settings['iiif'] and g.settings['iiif_path']:
         g.writable_paths.append(g.settings['iiif_path'])
-    g.file_info = Entity.get_file_info()
 
 
 def setup_api() -> None:
@@ -1,25 +1,28 @@
 import itertools
+import json
 import zipfile
 from io import BytesIO
-from itertools import groupby
-from typing import Any
+from typing import Any, Iterator, Optional
 
 import pandas as pd
-from flask import Response, jsonify, request
+from flask import Response, jsonify, request, stream_with_context
 from flask_restful import marshal
 
 from openatlas import app
 from openatlas.api.endpoints.parser import Parser
 from openatlas.api.formats.csv import (
-    build_dataframe, build_link_dataframe)
+    build_dataframes, build_link_dataframe)
 from openatlas.api.formats.loud import get_loud_entities
 from openatlas.api.resources.api_entity import ApiEntity
+from openatlas.api.resources.error import (
+    EntityDoesNotExistError, LastEntityError)
 from openatlas.api.resources.resolve_endpoints import (
     download, parse_loud_context)
 from openatlas.api.resources.templates import (
     geojson_collection_template, linked_places_template, loud_template)
 from openatlas.api.resources.util import (
-    get_linked_entities_api, get_location_link, remove_duplicate_entities)
+    get_geometry_ids, get_linked_entities_api, get_location_link,
+    remove_duplicate_entities)
 from openatlas.models.entity import Entity, Link
 
 
@@ -27,23 +30,66 @@ class Endpoint:
     def __init__(
             self,
             entities: Entity | list[Entity],
-            parser: dict[str, Any]) -> None:
+            parser: dict[str, Any],
+            classes: Optional[list[str]] = None,
+            ids: Optional[list[int]] = None) -> None:
         self.entities = entities if isinstance(entities, list) else [entities]
         self.parser = Parser(parser)
+        # If classes or ids are set, filter and paginate in database
+        self.classes = classes
+        self.ids = ids
+        self.entity_ids: Optional[list[int]] = None  # Page, if in database
 
     def resolve_entities(self) -> Response | dict[str, Any]:
+        in_database = self.classes is not None or self.ids is not None
+        if in_database and (self.parser.search or self.parser.export):
+            # Search filters are applied to entity objects and exports need
+            # all entities, so these are loaded completely for them
+            self.entities = remove_duplicate_entities(
+                ApiEntity.get_by_classes(self.classes or [])
+                + ApiEntity.get_by_ids(
+                    self.ids or [],
+                    types=True,
+                    aliases=True))
+            in_database = False
+        if in_database:
+            filters = ApiEntity.get_filters(
+                self.classes or [],
+                self.ids or [],
+                self.parser.type_id or [])
+            if self.parser.count == 'true':
+                return jsonify(ApiEntity.get_count(filters))
+            pagination = self.get_pagination_from_database(filters)
+        else:
+            self.filter_entities()
+            if self.parser.export == 'csvNetwork':
+                return self.export_csv_for_network_analysis()
+            if self.parser.export:
+                return self.export_entities_csv()
+            self.remove_duplicate_entities()
+            self.sorting()
+            pagination = self.get_pagination()
+        if self.parser.stream == 'true' \
+                and self.parser.count != 'true' \
+                and self.parser.format not in app.config['RDF_FORMATS']:
+            return self.get_json_stream(pagination)
+        if self.entity_ids is not None:
+            self.entities = ApiEntity.get_by_ids_in_order(self.entity_ids)
+        return self.get_entities_result(pagination)
+
+    def filter_entities(self) -> None:
         if self.parser.type_id:
             self.entities = self.filter_by_type()
         if self.parser.search:
             self.entities = [
                 e for e in self.entities if self.parser.search_filter(e)]
-        if self.parser.export == 'csv':
-            return self.export_entities_csv()
-        if self.parser.export == 'csvNetwork':
-            return self.export_csv_for_network_analysis()
-        self.remove_duplicate_entities()
-        self.sorting()
-        result = self.get_json_output()
+
+    def get_entities_result(
+            self,
+            pagination: dict[str, Any]) -> Response | dict[str, Any]:
+        result: dict[str, Any] = {
+            "results": self.get_entities_formatted() if self.entities else [],
+            "pagination": pagination}
         if self.parser.format in app.config['RDF_FORMATS']:  # pragma: no cover
             return Response(
                 self.parser.rdf_output(result['results']),
@@ -87,7 +133,10 @@ class Endpoint:
                 entity.id, inverse=True)}
         if self.parser.format == 'loud' \
                 or self.parser.format in app.config['RDF_FORMATS']:
-            return get_loud_entities(entity_dict, parse_loud_context())
+            return get_loud_entities(
+                entity_dict,
+                parse_loud_context(),
+                self.parser.geometries)
         return self.parser.get_linked_places_entity(entity_dict)
 
     def filter_by_type(self) -> list[Entity]:
@@ -99,7 +148,7 @@ class Endpoint:
         return result
 
     def export_entities_csv(self) -> Response:
-        frames = [build_dataframe(e, relations=True) for e in self.entities]
+        frames = build_dataframes(self.entities, relations=True)
         return Response(
             pd.DataFrame(data=frames).to_csv(),
             mimetype='text/csv',
@@ -126,13 +175,12 @@ class Endpoint:
 
     def get_entities_grouped_by_class(self) -> dict[str, Any]:
         self.entities += get_linked_entities_api([e.id for e in self.entities])
-        entities = remove_duplicate_entities(self.entities)
-        grouped_entities = {}
-        for class_, entities_ in groupby(
-                sorted(entities, key=lambda entity: entity.class_.name),
-                key=lambda entity: entity.class_.name):
-            grouped_entities[class_] = \
-                [build_dataframe(entity) for entity in entities_]
+        entities = sorted(
+            remove_duplicate_entities(self.entities),
+            key=lambda entity: entity.class_.name)
+        grouped_entities: dict[str, list[dict[str, Any]]] = {}
+        for entity, frame in zip(entities, build_dataframes(entities)):
+            grouped_entities.setdefault(entity.class_.name, []).append(frame)
         return grouped_entities
 
     def link_parser_check(self, inverse: bool = False) -> list[Link]:
@@ -148,7 +196,10 @@ class Endpoint:
     def sorting(self) -> None:
         if 'latest' in request.path:
             return
-
+        if self.parser.column in \
+                ['begin_from', 'begin_to', 'end_from', 'end_to']:
+            self.entities = self.parser.sort_by_date(self.entities)
+            return
         self.entities = sorted(
             self.entities,
             key=self.parser.get_key,
@@ -160,7 +211,7 @@ class Endpoint:
         self.entities = \
             [e for e in self.entities if not (e.id in seen or seen_add(e.id))]
 
-    def get_json_output(self) -> dict[str, Any]:
+    def get_pagination(self) -> dict[str, Any]:
         total = [e.id for e in self.entities]
         count = len(total)
         if self.parser.limit == 0:
@@ -176,17 +227,83 @@ class Endpoint:
         total = self.parser.get_start_entity(total) \
             if self.parser.last or self.parser.first else total
         j = [i for i, x in enumerate(self.entities) if x.id == total[0]]
-        formatted_entities = []
         if self.entities:
-            self.entities = [e for idx, e in enumerate(self.entities[j[0]:])]
-            formatted_entities = self.get_entities_formatted()
+            self.entities = \
+                self.entities[j[0]:][:int(self.parser.limit)]
+        return {
+            'entitiesPerPage': int(self.parser.limit),
+            'entities': count,
+            'index': index,
+            'totalPages': len(index)}
+
+    def get_pagination_from_database(
+            self,
+            filters: dict[str, tuple[Any, ...]]) -> dict[str, Any]:
+        start_ids, count = ApiEntity.get_page_index(
+            filters,
+            self.parser.column,
+            self.parser.sort == 'desc',
+            int(self.parser.limit))
+        if self.parser.limit == 0:
+            self.parser.limit = count
+        index = [
+            {'page': num + 1, 'startId': id_}
+            for num, id_ in enumerate(start_ids)]
+        if index and self.parser.page:
+            self.parser.first = self.parser.get_by_page(index)
+        self.entity_ids = get_page_ids_from_database(self.parser, filters)
         return {
-            "results": formatted_entities,
-            "pagination": {
-                'entitiesPerPage': int(self.parser.limit),
-                'entities': count,
-                'index': index,
-                'totalPages': len(index)}}
+            'entitiesPerPage': int(self.parser.limit),
+            'entities': count,
+            'index': index,
+            'totalPages': len(index)}
+
+    def get_entity_chunks(self) -> Iterator[list[Entity]]:
+        size = app.config['API_STREAM_CHUNK_SIZE']
+        if self.entity_ids is not None:
+            for i in range(0, len(self.entity_ids), size):
+                yield ApiEntity.get_by_ids_in_order(
+                    self.entity_ids[i:i + size])
+            return
+        for i in range(0, len(self.entities), size):
+            yield self.entities[i:i + size]
+
+    def get_json_stream(self, pagination: dict[str, Any]) -> Response:
+        return Response(
+            stream_with_context(self.stream_json(pagination)),
+            mimetype='application/json',
+            headers={'Content-Disposition': 'attachment;filename=result.json'}
+            if self.parser.download == 'true' else None)
+
+    def stream_json(self, pagination: dict[str, Any]) -> Iterator[str]:
+        template = self.parser.get_entities_template()
+        geojson = self.parser.format in ['geojson', 'geojson-v2']
+        results = {
+            'results': geojson_collection_template()['features']
+            if geojson else template['results']}
+        yield '{"results": ['
+        separator = ''
+        collection = False
+        for entities in self.get_entity_chunks():
+            self.entities = entities
+            if not geojson:
+                items = self.get_entities_formatted()
+            elif self.parser.format == 'geojson':
+                items = self.get_geojson()['features']
+            else:
+                items = self.get_geojson_v2()['features']
+            if geojson and not collection:
+                collection = True
+                yield '{"type": "FeatureCollection", "features": ['
+            for item in marshal({'results': items}, results)['results']:
+                yield separator + json.dumps(item)
+                separator = ', '
+        if collection:
+            yield ']}'
+        pagination = marshal(
+            {'pagination': pagination},
+            {'pagination': template['pagination']})['pagination']
+        yield f'], "pagination": {json.dumps(pagination)}}}'
 
     def get_entities_formatted(self) -> list[dict[str, Any]]:
         self.entities = self.entities[:int(self.parser.limit)]
@@ -206,9 +323,23 @@ class Endpoint:
             entities_dict[link_.range.id]['links_inverse'].append(link_)
         if self.parser.format == 'loud' \
                 or self.parser.format in app.config['RDF_FORMATS']:
+            self.parser.geometries.load_wkt(
+                link_.range.id
+                for item in entities_dict.values()
+                for link_ in item['links'] + item['links_inverse']
+                if link_.property.code == 'P53')
             return [
-                get_loud_entities(item, parse_loud_context())
+                get_loud_entities(
+                    item,
+                    parse_loud_context(),
+                    self.parser.geometries)
                 for item in entities_dict.values()]
+        if 'geometry' in self.parser.show:
+            self.parser.geometries.load(
+                get_geometry_ids(
+                    [item['entity'] for item in entities_dict.values()],
+                    [link_ for item in entities_dict.values()
+                     for link_ in item['links']]))
         return [
             self.parser.get_linked_places_entity(item)
             for item in entities_dict.values()]
@@ -218,14 +349,19 @@ class Endpoint:
         links = Entity.get_links_of_entities(
             [e.id for e in self.entities],
             'P53')
+        locations = {link_.domain.id: link_.range.id for link_ in links}
+        self.parser.geometries.load(get_geometry_ids(self.entities, links))
         for entity in self.entities:
             if entity.class_.view == 'place':
                 entity_links = \
                     [l_ for l_ in links if l_.domain.id == entity.id]
                 entity.types.update(
                     get_location_link(entity_links).range.types)
-            if geoms := [self.parser.get_geojson_dict(entity, geom)
-                         for geom in self.parser.get_geom(entity)]:
+            if geoms := [
+                    self.parser.get_geojson_dict(entity, geom)
+                    for geom in self.parser.get_geom(
+                        entity,
+                        locations.get(entity.id))]:
                 out.extend(geoms)
             else:
                 out.append(self.parser.get_geojson_dict(entity))
@@ -236,6 +372,7 @@ class Endpoint:
         property_codes = ['P53', 'P74', 'OA8', 'OA9', 'P7', 'P26', 'P27']
         link_parser = self.link_parser_check()
         links = [l for l in link_parser if l.property.code in property_codes]
+        self.parser.geometries.load(get_geometry_ids(self.entities, links))
         for entity in self.entities:
             entity_links = [
                 link_ for link_ in links if link_.domain.id == entity.id]
@@ -247,3 +384,24 @@ class Endpoint:
                     [l_.range.id for l_ in entity_links]):
                 out.append(self.parser.get_geojson_dict(entity, geom))
         return {'type': 'FeatureCollection', 'features': out}
+
+
+def get_page_ids_from_database(
+        parser: Parser,
+        filters: dict[str, tuple[Any, ...]]) -> list[int]:
+    start_id = parser.first or parser.last
+    after_last = bool(parser.last and not parser.first)
+    ids = ApiEntity.get_page_ids(
+        filters,
+        parser.column,
+        parser.sort == 'desc',
+        int(parser.limit) + int(after_last),
+        int(start_id) if start_id else None)
+    if start_id:
+        if not ids or ids[0] != int(start_id):
+            raise EntityDoesNotExistError
+        if after_last:
+            ids = ids[1:]
+            if not ids:
+                raise LastEntityError
+    return ids
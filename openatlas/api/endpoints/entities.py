@@ -9,40 +9,46 @@ from openatlas.api.resources.error import (
     InvalidLimitError, NotATypeError, QueryEmptyError)
 from openatlas.api.resources.parser import entity_, properties, query
 from openatlas.api.resources.util import (
-    get_entities_from_type_with_subs, get_entities_linked_to_special_type,
-    get_entities_linked_to_special_type_recursive, get_linked_entities_api)
+    get_entities_linked_to_special_type_recursive,
+    get_entity_ids_from_type_with_subs, get_entity_ids_linked_to_special_type,
+    get_linked_entities_id_api)
+from openatlas.models.entity import Link
 
 
 class GetByCidocClass(Resource):
     @staticmethod
     def get(class_: str) -> tuple[Resource, int] | Response | dict[str, Any]:
         return Endpoint(
-            ApiEntity.get_by_cidoc_classes([class_]),
-            entity_.parse_args()).resolve_entities()
+            [],
+            entity_.parse_args(),
+            ApiEntity.get_cidoc_classes([class_])).resolve_entities()
 
 
 class GetBySystemClass(Resource):
     @staticmethod
     def get(class_: str) -> tuple[Resource, int] | Response | dict[str, Any]:
         return Endpoint(
-            ApiEntity.get_by_system_classes([class_]),
-            entity_.parse_args()).resolve_entities()
+            [],
+            entity_.parse_args(),
+            ApiEntity.get_system_classes([class_])).resolve_entities()
 
 
 class GetByViewClass(Resource):
     @staticmethod
     def get(class_: str) -> tuple[Resource, int] | Response | dict[str, Any]:
         return Endpoint(
-            ApiEntity.get_by_view_classes([class_]),
-            entity_.parse_args()).resolve_entities()
+            [],
+            entity_.parse_args(),
+            ApiEntity.get_view_classes([class_])).resolve_entities()
 
 
 class GetEntitiesLinkedToEntity(Resource):
     @staticmethod
     def get(id_: int) -> tuple[Resource, int] | Response | dict[str, Any]:
         return Endpoint(
-            get_linked_entities_api(id_),
-            entity_.parse_args()).resolve_entities()
+            [],
+            entity_.parse_args(),
+            ids=get_linked_entities_id_api(id_)).resolve_entities()
 
 
 class GetLinkedEntitiesByPropertyRecursive(Resource):
@@ -50,10 +56,11 @@ class GetLinkedEntitiesByPropertyRecursive(Resource):
     def get(id_: int) -> Response | dict[str, Any]:
         parser = properties.parse_args()
         return Endpoint(
-            ApiEntity.get_linked_entities_with_properties(
+            [],
+            parser,
+            ids=ApiEntity.get_linked_entity_ids_with_properties(
                 id_,
-                parser['properties']),
-            parser).resolve_entities()
+                parser['properties'])).resolve_entities()
 
 
 class GetEntity(Resource):
@@ -79,12 +86,9 @@ class GetTypeEntities(Resource):
     def get(id_: int) -> tuple[Resource, int] | Response | dict[str, Any]:
         if id_ not in g.types:
             raise NotATypeError
-        if not (entities := g.types[id_].get_linked_entities(
-                ['P2', 'P89'],
-                inverse=True,
-                types=True)):
-            entities = get_entities_linked_to_special_type(id_)
-        return Endpoint(entities, entity_.parse_args()).resolve_entities()
+        if not (ids := Link.get_entity_ids_by_type_ids([id_])):
+            ids = get_entity_ids_linked_to_special_type(id_)
+        return Endpoint([], entity_.parse_args(), ids=ids).resolve_entities()
 
 
 class GetTypeEntitiesAll(Resource):
@@ -92,12 +96,9 @@ class GetTypeEntitiesAll(Resource):
     def get(id_: int) -> tuple[Resource, int] | Response | dict[str, Any]:
         if id_ not in g.types:
             raise NotATypeError
-        if not (entities := get_entities_from_type_with_subs(id_)):
-            entities = ApiEntity.get_by_ids(
-                get_entities_linked_to_special_type_recursive(id_, []),
-                types=True,
-                aliases=True)
-        return Endpoint(entities, entity_.parse_args()).resolve_entities()
+        if not (ids := get_entity_ids_from_type_with_subs(id_)):
+            ids = get_entities_linked_to_special_type_recursive(id_, [])
+        return Endpoint([], entity_.parse_args(), ids=ids).resolve_entities()
 
 
 class GetQuery(Resource):
@@ -111,22 +112,16 @@ class GetQuery(Resource):
                 parser['system_classes'],
                 parser['linked_entities']]):
             raise QueryEmptyError
-        entities = []
-        if parser['entities']:
-            entities.extend(
-                ApiEntity.get_by_ids(
-                    parser['entities'],
-                    types=True,
-                    aliases=True))
+        classes = []
         if parser['view_classes']:
-            entities.extend(
-                ApiEntity.get_by_view_classes(parser['view_classes']))
+            classes.extend(ApiEntity.get_view_classes(parser['view_classes']))
         if parser['system_classes']:
-            entities.extend(
-                ApiEntity.get_by_system_classes(parser['system_classes']))
+            classes.extend(
+                ApiEntity.get_system_classes(parser['system_classes']))
         if parser['cidoc_classes']:
-            entities.extend(
-                ApiEntity.get_by_cidoc_classes(parser['cidoc_classes']))
+            classes.extend(
+                ApiEntity.get_cidoc_classes(parser['cidoc_classes']))
+        ids = list(parser['entities'] or [])
         if parser['linked_entities']:
-            entities.extend(get_linked_entities_api(parser['linked_entities']))
-        return Endpoint(entities, parser).resolve_entities()
+            ids.extend(get_linked_entities_id_api(parser['linked_entities']))
+        return Endpoint([], parser, classes, ids).resolve_entities()
@@ -3,7 +3,6 @@ from __future__ import annotations
 import mimetypes
 from typing import Any, Tuple
 
-import requests
 import svgwrite
 from flask import Response, g, jsonify, url_for
 from flask_babel import lazy_gettext as _
@@ -14,9 +13,10 @@ from openatlas.api.resources.api_entity import ApiEntity
 from openatlas.api.resources.error import DisplayFileNotFoundError
 from openatlas.api.resources.parser import iiif
 from openatlas.api.resources.util import get_license_name, get_license_url
-from openatlas.display.util import check_iiif_file_exist
+from openatlas.display.util import check_iiif_file_exist, get_iiif_url
 from openatlas.models.annotation import AnnotationImage
 from openatlas.models.entity import Entity
+from openatlas.models.iiif import get_image_info
 
 
 class IIIFSequence(Resource):
@@ -297,11 +297,11 @@ class IIIFManifest(Resource):
 def get_metadata(entity: Entity) -> dict[str, Any]:
     if entity.class_.view != 'file' and not check_iiif_file_exist(entity.id):
         raise DisplayFileNotFoundError
-    ext = '.tiff' if g.settings['iiif_conversion'] else entity.get_file_ext()
-    image_url = f"{g.settings['iiif_url']}{entity.id}{ext}"
-    req = requests.get(f"{image_url}/info.json", timeout=30)
-    image_api = req.json()
-    return {'entity': entity, 'img_url': image_url, 'img_api': image_api}
+    image_url = get_iiif_url(entity.id)
+    return {
+        'entity': entity,
+        'img_url': image_url,
+        'img_api': get_image_info(entity.id, image_url)}
 
 
 def get_logo() -> dict[str, Any]:
@@ -9,7 +9,6 @@ from typing import Any, Optional
 import numpy
 import validators
 from flask import g, url_for
-from numpy import datetime64
 from rdflib import Graph
 
 from openatlas import app
@@ -27,12 +26,13 @@ from openatlas.api.resources.util import (
     flatten_list_and_remove_duplicates, get_geometric_collection,
     get_geoms_dict, get_location_link, get_reference_systems,
     replace_empty_list_values_in_dict_with_none)
-from openatlas.models.entity import Entity, Link
-from openatlas.models.gis import Gis
+from openatlas.models.entity import Dates, Entity, Link
+from openatlas.models.gis import GeometryLoader
 
 
 class Parser:
     download = None
+    stream = None
     count = None
     locale = None
     sort = None
@@ -60,6 +60,7 @@ class Parser:
     exclude_system_classes: list[str]
     linked_to_ids: list[int]
     url: str = ''
+    geometries: GeometryLoader
 
     def __init__(self, parser: dict[str, Any]):
         self.show = []
@@ -68,6 +69,7 @@ class Parser:
         self.search_param = []
         for item in parser:
             setattr(self, item, parser[item])
+        self.geometries = GeometryLoader(bool(self.centroid))
         if self.search:
             self.set_search_param()
         self.is_valid_url()
@@ -141,18 +143,20 @@ class Parser:
                 codes.append('P67')
         return codes
 
-    def get_key(self, entity: Entity) -> datetime64 | str:
+    def get_key(self, entity: Entity) -> str:
         if self.column == 'cidoc_class':
             return entity.cidoc_class.name
         if self.column == 'system_class':
             return entity.class_.name
-        if self.column in ['begin_from', 'begin_to', 'end_from', 'end_to']:
-            if not getattr(entity, self.column):
-                date = ("-" if self.sort == 'desc' else "") \
-                       + '9999999-01-01T00:00:00'
-                return numpy.datetime64(date)
         return getattr(entity, self.column)
 
+    def sort_by_date(self, entities: list[Entity]) -> list[Entity]:
+        # Sorted in one call with entities without the date at the end
+        seconds = Dates.get_epochs(entities, self.column)
+        if self.sort == 'desc':
+            seconds = -seconds
+        return [entities[i] for i in numpy.argsort(seconds, kind='stable')]
+
     def get_by_page(self, index: list[dict[str, Any]]) -> dict[str, Any]:
         page = (
             self.page) if self.page < index[-1]['page'] else index[-1]['page']
@@ -174,20 +178,16 @@ class Parser:
             return out
         raise EntityDoesNotExistError
 
-    def get_geom(self, entity: Entity, ) -> list[Any]:
+    def get_geom(
+            self,
+            entity: Entity,
+            location_id: Optional[int] = None) -> list[Any]:
         if entity.class_.view == 'place' or entity.class_.name == 'artifact':
-            id_ = entity.get_linked_entity_safe('P53').id
-            geoms = Gis.get_by_id(id_)
-            if self.centroid:
-                if centroid_result := Gis.get_centroids_by_id(id_):
-                    geoms.extend(centroid_result)
-            return geoms
+            if not location_id:
+                location_id = entity.get_linked_entity_safe('P53').id
+            return self.geometries.get_with_centroids(location_id)
         if entity.class_.name == 'object_location':
-            geoms = Gis.get_by_id(entity.id)
-            if self.centroid:
-                if centroid_result := Gis.get_centroids_by_id(entity.id):
-                    geoms.extend(centroid_result)
-            return geoms
+            return self.geometries.get_with_centroids(entity.id)
         return []
 
     def get_linked_places_entity(
@@ -266,15 +266,13 @@ class Parser:
             entity: Entity,
             links: list[int]) -> Optional[dict[str, Any]]:
         if entity.class_.name == 'object_location':
-            geoms: list[Any] = Gis.get_by_id(entity.id)
-            if self.centroid:
-                if centroid_result := Gis.get_centroids_by_id(entity.id):
-                    geoms.extend(centroid_result)
-            return get_geoms_dict(geoms)
+            return get_geoms_dict(
+                self.geometries.get_with_centroids(entity.id))
         if links:
-            geoms = [Gis.get_by_id(id_) for id_ in links]
+            geoms = [self.geometries.get_geoms(id_) for id_ in links]
             if self.centroid:
-                geoms.extend([Gis.get_centroids_by_id(id_) for id_ in links])
+                geoms.extend(
+                    [self.geometries.get_centroids(id_) for id_ in links])
             return get_geoms_dict(flatten_list_and_remove_duplicates(geoms))
         return None
 
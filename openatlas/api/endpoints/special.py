@@ -1,8 +1,8 @@
 import json
 from collections import defaultdict
-from typing import Any
+from typing import Any, Iterable, Iterator
 
-from flask import Response, g, jsonify
+from flask import Response, g, jsonify, stream_with_context
 from flask_restful import Resource, marshal
 
 from openatlas.api.endpoints.parser import Parser
@@ -11,8 +11,7 @@ from openatlas.api.formats.subunits import get_subunits_from_id
 from openatlas.api.formats.xml import export_database_xml
 from openatlas.api.resources.database_mapper import (
     get_all_entities_as_dict, get_all_links_as_dict, get_all_links_for_network,
-    get_cidoc_hierarchy,
-    get_classes, get_links_by_id_network, get_properties,
+    get_cidoc_hierarchy, get_classes, get_links_by_id_network, get_properties,
     get_property_hierarchy)
 from openatlas.api.resources.error import NotAPlaceError
 from openatlas.api.resources.api_entity import ApiEntity
@@ -21,7 +20,7 @@ from openatlas.api.resources.resolve_endpoints import (
     download, resolve_subunits)
 from openatlas.api.resources.templates import geometries_template, \
     network_visualisation_template
-from openatlas.api.resources.util import get_geometries
+from openatlas.api.resources.util import count_geometries, get_geometries
 from openatlas.database.entity import get_linked_entities_recursive
 from openatlas.models.export import current_date_for_filename
 
@@ -30,19 +29,35 @@ class GetGeometricEntities(Resource):
     @staticmethod
     def get() -> int | Response | tuple[Any, int]:
         parser = gis.parse_args()
+        if parser['count'] == 'true':
+            return jsonify(count_geometries(parser))
+        if parser['stream'] == 'true':
+            return Response(
+                stream_with_context(
+                    GetGeometricEntities.stream(get_geometries(parser))),
+                mimetype='application/json',
+                headers={
+                    'Content-Disposition': 'attachment;filename=result.json'}
+                if parser['download'] == 'true' else None)
         output: dict[str, Any] = {
             'type': 'FeatureCollection',
-            'features': get_geometries(parser)}
-        if parser['count'] == 'true':
-            return jsonify(len(output['features']))
+            'features': list(get_geometries(parser))}
         if parser['download'] == 'true':
             return download(output, geometries_template())
         return marshal(output, geometries_template()), 200
 
+    @staticmethod
+    def stream(features: Iterable[dict[str, Any]]) -> Iterator[str]:
+        template = geometries_template()['features'].nested
+        yield '{"type": "FeatureCollection", "features": ['
+        for i, feature in enumerate(features):
+            yield (', ' if i else '') + json.dumps(marshal(feature, template))
+        yield ']}'
+
 
 class ExportDatabase(Resource):
     @staticmethod
-    def get(format_: str) -> tuple[Resource, int] | Response:
+    def get(format_: str) -> Response:
         geoms = [
             ExportDatabase.get_geometries_dict(geom)
             for geom in get_geometries({'geometry': 'gisAll'})]
@@ -94,33 +109,6 @@ class GetSubunits(Resource):
 class GetNetworkVisualisation(Resource):
     @staticmethod
     def get() -> tuple[Resource, int] | Response | dict[str, Any]:
-        def overwrite_object_locations_with_place() -> None:
-            locations = {}
-            for l in links:
-                if l['property_code'] == 'P53':
-                    locations[l['range_id']] = {
-                        'range_id': l['domain_id'],
-                        'range_name': l['domain_name'],
-                        'range_system_class': l['domain_system_class']}
-
-            copy = links.copy()
-            for i, l in enumerate(copy):
-                if l['range_id'] in locations:
-                    links[i].update(
-                        range_id=locations[l['range_id']]['range_id'],
-                        range_name=locations[l['range_id']]['range_name'],
-                        range_system_class=locations[
-                            l['range_id']]['range_system_class'])
-                if (l['domain_id'] in locations
-                        and "administrative_unit" not in exclude_):
-                    links[i].update(
-                        domain_id=locations[l['domain_id']]['range_id'],
-                        domain_name=locations[
-                            l['domain_id']]['range_name'],
-                        domain_ystem_class=locations[
-                            l['domain_id']]['range_system_class'])
-
-        system_classes = g.classes
         location_classes = [
             "administrative_unit",
             "artifact",
@@ -132,60 +120,54 @@ class GetNetworkVisualisation(Resource):
         exclude_ = parser.exclude_system_classes or []
         if all(item in location_classes for item in exclude_):
             exclude_ += ['object_location']
-        if exclude_:
-            system_classes = [s for s in system_classes if s not in exclude_]
-
         if linked_to_ids := parser.linked_to_ids:
-            ids = []
+            ids = set(linked_to_ids)
             for id_ in linked_to_ids:
-                ids += get_linked_entities_recursive(
+                ids.update(get_linked_entities_recursive(
                     id_,
                     list(g.properties),
-                    True)
-                ids += get_linked_entities_recursive(
+                    True))
+                ids.update(get_linked_entities_recursive(
                     id_,
                     list(g.properties),
-                    False)
-            all_ = get_links_by_id_network(ids + linked_to_ids)
-            links = []
-            if exclude_:
-                for link_ in all_:
-                    if (link_['domain_system_class'] not in exclude_
-                            or link_['range_system_class'] not in exclude_):
-                        links.append(link_)
+                    False))
+            rows = [
+                row for row in get_links_by_id_network(ids)
+                if row['domain_class'] not in exclude_
+                or row['range_class'] not in exclude_]
         else:
-            links = get_all_links_for_network(system_classes)
-
-        overwrite_object_locations_with_place()
-        link_dict = GetNetworkVisualisation.get_link_dictionary(links)
+            rows = get_all_links_for_network(
+                [name for name in g.classes if name not in exclude_])
+        entities = {}
+        links = []
+        for row in rows:
+            entities[row['domain_id']] = \
+                row['domain_name'], row['domain_class']
+            entities[row['range_id']] = row['range_name'], row['range_class']
+            links.append(
+                (row['domain_id'], row['range_id'], row['property_code']))
+
+        # Overwrite object locations with their places
+        locations = {
+            range_id: domain_id
+            for domain_id, range_id, code in links if code == 'P53'}
+        relations: dict[int, set[int]] = defaultdict(set)
+        for domain_id, range_id, _code in links:
+            range_id = locations.get(range_id, range_id)
+            if "administrative_unit" not in exclude_:
+                domain_id = locations.get(domain_id, domain_id)
+            relations[domain_id].add(range_id)
+            relations[range_id].add(domain_id)
 
         results: dict[str, Any] = {'results': []}
-        for id_, dict_ in link_dict.items():
-            if linked_to_ids:
-                if not set(linked_to_ids) & set(dict_['relations']):
-                    continue
-            dict_['id'] = id_
-            results['results'].append(dict_)
+        for id_, related in relations.items():
+            if linked_to_ids and not set(linked_to_ids) & related:
+                continue
+            results['results'].append({
+                'id': id_,
+                'label': entities[id_][0],
+                'systemClass': entities[id_][1],
+                'relations': related})
         if parser.download:
             return download(results, network_visualisation_template())
         return marshal(results, network_visualisation_template()), 200
-
-    @staticmethod
-    def get_link_dictionary(links: list[dict[str, Any]]) -> dict[int, Any]:
-        output: dict[int, Any] = defaultdict(set)
-        for item in links:
-            if output.get(item['domain_id']):
-                output[item['domain_id']]['relations'].add(item['range_id'])
-            else:
-                output[item['domain_id']] = {
-                    'label': item['domain_name'],
-                    'systemClass': item['domain_system_class'],
-                    'relations': {item['range_id']}}
-            if output.get(item['range_id']):
-                output[item['range_id']]['relations'].add(item['domain_id'])
-            else:
-                output[item['range_id']] = {
-                    'label': item['range_name'],
-                    'systemClass': item['range_system_class'],
-                    'relations': {item['domain_id']}}
-        return output
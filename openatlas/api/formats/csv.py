@@ -2,7 +2,7 @@ import zipfile
 from collections import defaultdict
 from io import BytesIO
 from itertools import groupby
-from typing import Any
+from typing import Any, Optional
 
 import pandas as pd
 from flask import Response, g
@@ -11,10 +11,45 @@ from openatlas.models.entity import Entity, Link
 from openatlas.models.gis import Gis
 
 
+def build_dataframes(
+        entities: list[Entity],
+        relations: bool = False) -> list[dict[str, Any]]:
+    ids = [entity.id for entity in entities]
+    links: dict[int, list[Link]] = defaultdict(list)
+    links_inverse: dict[int, list[Link]] = defaultdict(list)
+    if ids:  # Links and geometries are fetched for all entities at once
+        for link_ in Entity.get_links_of_entities(
+                ids,
+                None if relations else 'P53'):
+            links[link_.domain.id].append(link_)
+        if relations:
+            for link_ in Entity.get_links_of_entities(ids, inverse=True):
+                links_inverse[link_.range.id].append(link_)
+    locations = {
+        entity.id: get_csv_location(entity, links[entity.id])
+        for entity in entities}
+    location_ids = [
+        location.id for location in locations.values()
+        if location and location.cidoc_class.code == 'E53']
+    geoms = Gis.get_by_ids(location_ids) if location_ids else {}
+    frames = []
+    for entity in entities:
+        location = locations[entity.id]
+        frames.append(
+            build_dataframe(
+                entity,
+                geoms.get(location.id, []) if location else [],
+                links[entity.id] if relations else None,
+                links_inverse[entity.id]))
+    return frames
+
+
 def build_dataframe(
         entity: Entity,
-        relations: bool = False) -> dict[str, Any]:
-    geom = get_csv_geom_entry(entity)
+        geoms: list[dict[str, Any]],
+        links: Optional[list[Link]] = None,
+        links_inverse: Optional[list[Link]] = None) -> dict[str, Any]:
+    geom = get_csv_geometry(geoms)
     data = {
         'id': str(entity.id),
         'name': entity.name,
@@ -29,10 +64,10 @@ def build_dataframe(
         'system_class': entity.class_.name,
         'geom_type': geom['type'],
         'coordinates': geom['coordinates']}
-    if relations:
-        for key, value in get_csv_links(entity).items():
+    if links is not None:
+        for key, value in get_csv_links(links, links_inverse or []).items():
             data[key] = ' | '.join(list(map(str, value)))
-        for key, value in get_csv_types(entity).items():
+        for key, value in get_csv_types(entity, links).items():
             data[key] = ' | '.join(list(map(str, value)))
     return data
 
@@ -53,12 +88,14 @@ def build_link_dataframe(link: Link) -> dict[str, Any]:
         'end_comment': link.end_comment}
 
 
-def get_csv_types(entity: Entity) -> dict[Any, list[Any]]:
+def get_csv_types(
+        entity: Entity,
+        links: list[Link]) -> dict[Any, list[Any]]:
     types: dict[str, Any] = defaultdict(list)
     for type_ in entity.types:
         hierarchy = [g.types[root].name for root in type_.root]
         value = ''
-        for link in Entity.get_links_of_entities(entity.id):
+        for link in links:
             if link.range.id == type_.id and link.description:
                 value += link.description
                 if link.range.id == type_.id and type_.description:
@@ -68,36 +105,39 @@ def get_csv_types(entity: Entity) -> dict[Any, list[Any]]:
     return types
 
 
-def get_csv_links(entity: Entity) -> dict[str, Any]:
-    links: dict[str, Any] = defaultdict(list)
-    for link in Entity.get_links_of_entities(entity.id):
+def get_csv_links(
+        links: list[Link],
+        links_inverse: list[Link]) -> dict[str, Any]:
+    result: dict[str, Any] = defaultdict(list)
+    for link in links:
         key = f"{link.property.i18n['en'].replace(' ', '_')}_" \
               f"{link.range.class_.name}"
-        links[key].append(link.range.name)
-    for link in Entity.get_links_of_entities(entity.id, inverse=True):
+        result[key].append(link.range.name)
+    for link in links_inverse:
         key = f"{link.property.i18n['en'].replace(' ', '_')}_" \
               f"{link.range.class_.name}"
         if link.property.i18n_inverse['en']:
             key = link.property.i18n_inverse['en'].replace(' ', '_')
             key += '_' + link.domain.class_.name
-        links[key].append(link.domain.name)
-    links.pop('has_type_type', None)
-    return links
+        result[key].append(link.domain.name)
+    result.pop('has_type_type', None)
+    return result
 
 
-def get_csv_geom_entry(entity: Entity) -> dict[str, None]:
-    geom = {'type': None, 'coordinates': None}
+def get_csv_location(entity: Entity, links: list[Link]) -> Optional[Entity]:
     if entity.class_.view == 'place' or entity.class_.name == 'artifact':
-        geom = get_csv_geometry(entity.get_linked_entity_safe('P53'))
-    elif entity.class_.name == 'object_location':
-        geom = get_csv_geometry(entity)
-    return geom
+        for link in links:
+            if link.property.code == 'P53':
+                return link.range
+        return entity.get_linked_entity_safe('P53')  # pragma: no cover
+    if entity.class_.name == 'object_location':
+        return entity
+    return None
 
 
-def get_csv_geometry(entity: Entity) -> dict[str, Any]:
+def get_csv_geometry(geoms: list[dict[str, Any]]) -> dict[str, Any]:
     dict_: dict[str, Any] = {'type': None, 'coordinates': None}
-    if (geoms := Gis.get_by_id(entity.id)) \
-            and entity.cidoc_class.code == 'E53':
+    if geoms:
         dict_ = {key: [geom[key] for geom in geoms] for key in geoms[0]}
     return dict_
 
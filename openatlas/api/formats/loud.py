@@ -9,11 +9,14 @@ from openatlas.api.resources.util import (
     remove_spaces_dashes, date_to_str, get_crm_relation, get_crm_code)
 from openatlas.display.util import get_file_path
 from openatlas.models.entity import Entity
-from openatlas.models.gis import Gis
+from openatlas.models.gis import GeometryLoader
 from openatlas.models.type import Type
 
 
-def get_loud_entities(data: dict[str, Any], loud: dict[str, str]) -> Any:
+def get_loud_entities(
+        data: dict[str, Any],
+        loud: dict[str, str],
+        geometries: GeometryLoader) -> Any:
     def base_entity_dict() -> dict[str, Any]:
         return {
             'id': url_for('api.entity', id_=data['entity'].id, _external=True),
@@ -50,7 +53,7 @@ def get_loud_entities(data: dict[str, Any], loud: dict[str, str]) -> Any:
         else:
             property_name = loud[get_crm_relation(link_).replace(' ', '_')]
         if link_.property.code == 'P53':
-            for geom in Gis.get_wkt_by_id(link_.range.id):
+            for geom in geometries.get_wkt(link_.range.id):
                 base_property = get_range_links() | geom
                 properties_set[property_name].append(base_property)
         else:
@@ -68,7 +71,7 @@ def get_loud_entities(data: dict[str, Any], loud: dict[str, str]) -> Any:
                 loud[get_crm_relation(link_, True).replace(' ', '_')]
 
         if link_.property.code == 'P53':
-            for geom in Gis.get_wkt_by_id(link_.range.id):
+            for geom in geometries.get_wkt(link_.range.id):
                 base_property = get_domain_links() | geom
                 properties_set[property_name].append(base_property)
         else:
@@ -9,6 +9,7 @@ from openatlas.api.import_scripts.util import (
     request_arche_metadata)
 from openatlas.database import reference_system as db
 from openatlas.models.entity import Entity
+from openatlas.models.file_registry import get_registry
 from openatlas.models.reference_system import ReferenceSystem
 from openatlas.models.type import Type
 
@@ -115,6 +116,8 @@ def import_arche_data() -> int:
             timeout=60).content
         with open(str(app.config['UPLOAD_PATH'] / filename), "wb") as file_:
             file_.write(thumb_req)
+        get_registry(app.config['UPLOAD_PATH']).add(
+            app.config['UPLOAD_PATH'] / filename)
         file.link('P67', artifact)
         creator = get_or_create_person(
             exif['Creator'],
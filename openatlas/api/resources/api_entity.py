@@ -1,8 +1,11 @@
+from typing import Any, Optional
+
 from flask import g
 
 from openatlas.api.resources.error import (
     EntityDoesNotExistError, InvalidCidocClassCodeError,
     InvalidSystemClassError, InvalidViewClassError)
+from openatlas.database import entity as db
 from openatlas.models.entity import Entity
 
 
@@ -20,39 +23,97 @@ class ApiEntity(Entity):
 
     @staticmethod
     def get_by_cidoc_classes(codes: list[str]) -> list[Entity]:
+        return ApiEntity.get_by_classes(ApiEntity.get_cidoc_classes(codes))
+
+    @staticmethod
+    def get_by_system_classes(classes: list[str]) -> list[Entity]:
+        return ApiEntity.get_by_classes(ApiEntity.get_system_classes(classes))
+
+    @staticmethod
+    def get_by_classes(classes: list[str]) -> list[Entity]:
+        if not classes:
+            return []
+        return Entity.get_by_class(classes, types=True, aliases=True)
+
+    @staticmethod
+    def get_cidoc_classes(codes: list[str]) -> list[str]:
         if 'all' in codes:
             codes = list(g.cidoc_classes)
         elif not set(codes).issubset(g.cidoc_classes):
             raise InvalidCidocClassCodeError
-        return Entity.get_by_cidoc_class(codes, types=True, aliases=True)
+        return [
+            name for name, class_ in g.classes.items()
+            if class_.cidoc_class and class_.cidoc_class.code in codes]
 
     @staticmethod
-    def get_by_view_classes(codes: list[str]) -> list[Entity]:
+    def get_view_classes(codes: list[str]) -> list[str]:
         codes = list(g.view_class_mapping) if 'all' in codes else codes
         if not all(c in g.view_class_mapping for c in codes):
             raise InvalidViewClassError
-        return Entity.get_by_class(
-            sum([g.view_class_mapping[i] for i in codes], []),
-            types=True,
-            aliases=True)
+        return sum([g.view_class_mapping[i] for i in codes], [])
 
     @staticmethod
-    def get_by_system_classes(classes: list[str]) -> list[Entity]:
+    def get_system_classes(classes: list[str]) -> list[str]:
         classes = list(g.classes) if 'all' in classes else classes
         if not all(sc in g.classes for sc in classes):
             raise InvalidSystemClassError
-        return Entity.get_by_class(classes, types=True, aliases=True)
+        return classes
+
+    @staticmethod
+    def get_filters(
+            classes: list[str],
+            ids: list[int],
+            type_ids: list[int]) -> dict[str, tuple[Any, ...]]:
+        return {
+            'classes': tuple(classes),
+            'ids': tuple(ids),
+            'type_ids': tuple(type_ids)}
+
+    @staticmethod
+    def get_count(filters: dict[str, tuple[Any, ...]]) -> int:
+        if not filters['classes'] and not filters['ids']:
+            return 0
+        return db.get_api_count(filters)
+
+    @staticmethod
+    def get_page_index(
+            filters: dict[str, tuple[Any, ...]],
+            column: str,
+            desc: bool,
+            limit: int) -> tuple[list[int], int]:
+        if not filters['classes'] and not filters['ids']:
+            return [], 0
+        return db.get_api_page_index(filters, column, desc, limit)
+
+    @staticmethod
+    def get_page_ids(
+            filters: dict[str, tuple[Any, ...]],
+            column: str,
+            desc: bool,
+            limit: int,
+            start_id: Optional[int] = None) -> list[int]:
+        if not filters['classes'] and not filters['ids']:
+            return []
+        return db.get_api_page_ids(filters, column, desc, limit, start_id)
+
+    @staticmethod
+    def get_linked_entity_ids(ids: list[int]) -> list[int]:
+        return db.get_linked_entity_ids(ids) if ids else []
+
+    @staticmethod
+    def get_by_ids_in_order(ids: list[int]) -> list[Entity]:
+        entities = {
+            row['id']: Entity(row)
+            for row in db.get_by_ids(ids, types=True, aliases=True)}
+        return [entities[id_] for id_ in ids]
 
     @staticmethod
-    def get_linked_entities_with_properties(
+    def get_linked_entity_ids_with_properties(
             id_: int,
-            properties: list[str]) -> list[Entity]:
+            properties: list[str]) -> list[int]:
         if 'all' in properties:
             properties = list(g.properties)
-        entity = ApiEntity.get_by_id(id_, types=True)
-        return ([entity]
-                + entity.get_linked_entities_recursive(properties, types=True)
-                + entity.get_linked_entities_recursive(
-                    properties,
-                    inverse=True,
-                    types=True))
+        entity = ApiEntity.get_by_id(id_)
+        return ([entity.id]
+                + db.get_linked_entities_recursive(id_, properties, False)
+                + db.get_linked_entities_recursive(id_, properties, True))
@@ -4,7 +4,8 @@ from openatlas.database import (
     cidoc_class as db_class,
     cidoc_property as db_property,
     entity as db_entity,
-    link as db_link)
+    link as db_link,
+    network as db_network)
 
 
 def get_all_entities_as_dict() -> list[dict[str, Any]]:
@@ -33,8 +34,8 @@ def get_cidoc_hierarchy() -> list[dict[str, Any]]:
 
 def get_all_links_for_network(
         system_classes: list[str]) -> list[dict[str, Any]]:
-    return db_link.get_all_links_for_network(system_classes)
+    return db_network.get_all_links(system_classes)
 
 
-def get_links_by_id_network(ids: list[int])-> list[dict[str, Any]]:
-    return db_link.get_links_by_id_network(ids)
+def get_links_by_id_network(ids: set[int]) -> list[dict[str, Any]]:
+    return db_network.get_all_links_by_ids(ids)
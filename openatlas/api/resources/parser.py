@@ -31,6 +31,14 @@ locale.add_argument(
     location='args')
 
 entity_ = default.copy()
+entity_.add_argument(
+    'stream',
+    type=str,
+    help='{error_msg}',
+    case_sensitive=False,
+    default=False,
+    choices=('true', 'false'),
+    location='args')
 entity_.add_argument(
     'sort',
     choices=('desc', 'asc'),
@@ -206,6 +214,14 @@ query.add_argument(
     location='args')
 
 gis = default.copy()
+gis.add_argument(
+    'stream',
+    type=str,
+    help='{error_msg}',
+    case_sensitive=False,
+    default=False,
+    choices=('true', 'false'),
+    location='args')
 gis.add_argument(
     'geometry',
     type=str,
@@ -1,6 +1,6 @@
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
-from flask import g, json
+from flask import g
 
 from openatlas.api.resources.api_entity import ApiEntity
 from openatlas.models.entity import Entity, Link
@@ -48,24 +48,16 @@ def get_linked_entities_api(id_: int | list[int]) -> list[Entity]:
     return [*range_, *domain]
 
 
-def get_linked_entities_id_api(id_: int) -> list[Entity]:
-    domain_ids = [
-        link_.range.id for link_ in Entity.get_links_of_entities(id_)]
-    range_ids = [
-        link_.domain.id for link_ in
-        Entity.get_links_of_entities(id_, inverse=True)]
-    return [*range_ids, *domain_ids]
+def get_linked_entities_id_api(id_: int | list[int]) -> list[int]:
+    return ApiEntity.get_linked_entity_ids(
+        id_ if isinstance(id_, list) else [id_])
 
 
-def get_entities_linked_to_special_type(id_: int) -> list[Entity]:
-    domain_ids = [
-        link_['domain_id'] for link_ in Link.get_links_by_type(g.types[id_])]
-    range_ids = [
-        link_['range_id'] for link_ in Link.get_links_by_type(g.types[id_])]
-    return ApiEntity.get_by_ids(
-        range_ids + domain_ids,
-        types=True,
-        aliases=True)
+def get_entity_ids_linked_to_special_type(id_: int) -> list[int]:
+    return [
+        entity_id
+        for link_ in Link.get_links_by_type(g.types[id_])
+        for entity_id in (link_['range_id'], link_['domain_id'])]
 
 
 def get_entities_linked_to_special_type_recursive(
@@ -88,13 +80,11 @@ def get_entities_linked_to_type_recursive_(
     return data
 
 
-def get_entities_from_type_with_subs(id_: int) -> list[Entity]:
+def get_entity_ids_from_type_with_subs(id_: int) -> list[int]:
     type_ids = get_entities_linked_to_type_recursive_(id_, [id_])
-    entity_ids = Link.get_entity_ids_by_type_ids(type_ids)
-    return ApiEntity.get_by_ids(
-        [link_ for link_ in entity_ids if link_ not in type_ids],
-        types=True,
-        aliases=True)
+    return [
+        entity_id for entity_id in Link.get_entity_ids_by_type_ids(type_ids)
+        if entity_id not in type_ids]
 
 
 def remove_duplicate_entities(entities: list[Entity]) -> list[Entity]:
@@ -130,19 +120,18 @@ def get_geometric_collection(
         parser: Any) -> Optional[dict[str, Any]]:
     match entity.class_.view:
         case 'place' | 'artifact':
-            return get_geoms_by_entity(
-                get_location_id(links),
-                parser.centroid)
+            return get_geoms_by_entity(get_location_id(links), parser)
         case 'actor':
             geoms = [
-                Gis.get_by_id(link_.range.id) for link_ in links
+                parser.geometries.get_geoms(link_.range.id) for link_ in links
                 if link_.property.code in ['P74', 'OA8', 'OA9']]
             if parser.centroid:
                 centroids = []
                 for link_ in links:  # pragma: no cover
                     if link_.property.code in ['P7', 'P26', 'P27']:
                         if centroid_result := (
-                                Gis.get_centroids_by_id(link_.range.id)):
+                                parser.geometries.get_centroids(
+                                    link_.range.id)):
                             centroids.append(centroid_result)
                 if centroids:
                     geoms.extend(centroids)  # pragma: no cover
@@ -151,14 +140,15 @@ def get_geometric_collection(
                 'geometries': [geom for sublist in geoms for geom in sublist]}
         case 'event':
             geoms = [
-                Gis.get_by_id(link_.range.id) for link_ in links
+                parser.geometries.get_geoms(link_.range.id) for link_ in links
                 if link_.property.code in ['P7', 'P26', 'P27']]
             if parser.centroid:
                 centroids = []
                 for link_ in links:
                     if link_.property.code in ['P7', 'P26', 'P27']:
                         if centroid_result := (
-                                Gis.get_centroids_by_id(link_.range.id)):
+                                parser.geometries.get_centroids(
+                                    link_.range.id)):
                             centroids.append(centroid_result)
                 if centroids:
                     geoms.extend(centroids)
@@ -166,10 +156,20 @@ def get_geometric_collection(
                 'type': 'GeometryCollection',
                 'geometries': [geom for sublist in geoms for geom in sublist]}
         case _ if entity.class_.name == 'object_location':
-            return get_geoms_by_entity(entity.id, parser.centroid)
+            return get_geoms_by_entity(entity.id, parser)
     return None
 
 
+def get_geometry_ids(entities: list[Entity], links: list[Link]) -> set[int]:
+    """Ids of locations with geometries needed for the entities to load
+    them at once with the parser's GeometryLoader."""
+    ids = {e.id for e in entities if e.class_.name == 'object_location'}
+    ids.update(
+        link_.range.id for link_ in links if link_.property.code in
+        ['P53', 'P74', 'OA8', 'OA9', 'P7', 'P26', 'P27'])
+    return ids
+
+
 def get_location_id(links: list[Link]) -> int:
     return [l_.range.id for l_ in links if l_.property.code == 'P53'][0]
 
@@ -182,13 +182,8 @@ def get_location_link(links: list[Link]) -> Link:
     return [l_ for l_ in links if l_.property.code == 'P53'][0]
 
 
-def get_geoms_by_entity(
-        location_id: int,
-        centroid: Optional[bool] = False) -> dict[str, Any]:
-    geoms = Gis.get_by_id(location_id)
-    if centroid:
-        if centroid_result := Gis.get_centroids_by_id(location_id):
-            geoms.extend(centroid_result)
+def get_geoms_by_entity(location_id: int, parser: Any) -> dict[str, Any]:
+    geoms = parser.geometries.get_with_centroids(location_id)
     if len(geoms) == 1:
         return geoms[0]
     return {'type': 'GeometryCollection', 'geometries': geoms}
@@ -200,17 +195,21 @@ def get_geojson_geometries(geoms: list[dict[str, Any]]) -> dict[str, Any]:
     return {'type': 'GeometryCollection', 'geometries': geoms}
 
 
-def get_geometries(parser: dict[str, Any]) -> list[dict[str, Any]]:
-    choices = [
-        'gisPointAll', 'gisPointSupers', 'gisPointSubs',
-        'gisPointSibling', 'gisLineAll', 'gisPolygonAll']
-    all_geoms = Gis.get_all()
-    out = []
-    for item in choices \
-            if 'gisAll' in parser['geometry'] else parser['geometry']:
-        for geom in json.loads(all_geoms[item]):
-            out.append(geom)
-    return out
+def get_geometry_shapes(parser: dict[str, Any]) -> list[str]:
+    shapes = {
+        'gisPointAll': 'point',
+        'gisLineAll': 'linestring',
+        'gisPolygonAll': 'polygon'}
+    choices = shapes if 'gisAll' in parser['geometry'] else parser['geometry']
+    return [shapes[choice] for choice in choices if choice in shapes]
+
+
+def get_geometries(parser: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    return Gis.get_all_features(get_geometry_shapes(parser))
+
+
+def count_geometries(parser: dict[str, Any]) -> int:
+    return Gis.count_features(get_geometry_shapes(parser))
 
 
 def date_to_str(date: Any) -> Optional[str]:
@@ -0,0 +1,30 @@
+from functools import wraps
+from typing import Any, Callable, TypeVar, cast
+
+from flask import g
+
+Query = TypeVar('Query', bound=Callable[..., Any])
+
+# Results of metadata queries, shared by all threads of a process, so they
+# mustn't be changed. Keys are function and arguments, values are the
+# metadata_version they were queried at and the result.
+results: dict[str, tuple[str, Any]] = {}
+
+
+def metadata_rows(function: Query) -> Query:
+    """Cache the result of a metadata query, e.g. of all types, while the
+    metadata_version setting of the request (g.metadata_version) is the
+    same. Without version, e.g. for modifying requests, the database is
+    queried always."""
+
+    @wraps(function)
+    def wrapper(*args: Any) -> Any:
+        if not (version := g.get('metadata_version')):
+            return function(*args)
+        key = f'{function.__module__}.{function.__name__}{args}'
+        if (cached := results.get(key)) and cached[0] == version:
+            return cached[1]
+        result = function(*args)
+        results[key] = (version, result)
+        return result
+    return cast(Query, wrapper)
@@ -51,37 +51,102 @@ def get_circular() -> list[dict[str, Any]]:
     return list(g.cursor)
 
 
-def get_cidoc_links() -> list[dict[str, Any]]:
+def refresh_valid_links() -> None:
+    g.cursor.execute('REFRESH MATERIALIZED VIEW model.cidoc_valid_link;')
+
+
+def set_invalid_links() -> int:
     g.cursor.execute(
         """
-        SELECT DISTINCT
-            l.property_code,
-            d.cidoc_class_code AS domain_code,
-            r.cidoc_class_code AS range_code
+        DELETE FROM web.invalid_link;
+        INSERT INTO web.invalid_link (link_id)
+        SELECT l.id
         FROM model.link l
         JOIN model.entity d ON l.domain_id = d.id
-        JOIN model.entity r ON l.range_id = r.id;
+        JOIN model.entity r ON l.range_id = r.id
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM model.cidoc_valid_link v
+            WHERE v.property_code = l.property_code
+                AND v.domain_class_code = d.cidoc_class_code
+                AND v.range_class_code = r.cidoc_class_code);
         """)
-    return list(g.cursor)
+    return g.cursor.rowcount
 
 
-def get_invalid_links(data: dict[str, Any]) -> list[dict[str, int]]:
+def get_invalid_links(after: int, limit: int) -> list[dict[str, Any]]:
     g.cursor.execute(
         """
         SELECT
             l.id,
             l.property_code,
             l.domain_id,
+            d.name AS domain_name,
+            d.cidoc_class_code AS domain_code,
             l.range_id,
-            l.description,
-            l.created,
-            l.modified
-        FROM model.link l
+            r.name AS range_name,
+            r.cidoc_class_code AS range_code
+        FROM web.invalid_link i
+        JOIN model.link l ON i.link_id = l.id
         JOIN model.entity d ON l.domain_id = d.id
         JOIN model.entity r ON l.range_id = r.id
-        WHERE l.property_code = %(property_code)s
-            AND d.cidoc_class_code = %(domain_code)s
-            AND r.cidoc_class_code = %(range_code)s;
+        WHERE i.link_id > %(after)s
+        ORDER BY i.link_id
+        LIMIT %(limit)s;
         """,
-        data)
+        {'after': after, 'limit': limit})
+    return [dict(row) for row in g.cursor]
+
+
+def get_similar_name_candidates(
+        class_: str,
+        threshold: float) -> list[dict[str, Any]]:
+    g.cursor.execute(
+        """
+        SELECT set_config(
+            'pg_trgm.similarity_threshold', %(threshold)s, true);
+        SELECT e.id, e.name, s.id AS similar_id, s.name AS similar_name
+        FROM model.entity e
+        JOIN model.entity s
+            ON model.search_text(e.name) %% model.search_text(s.name)
+            AND e.id < s.id
+        WHERE e.openatlas_class_name = %(class_)s
+            AND s.openatlas_class_name = %(class_)s;
+        """,
+        {'class_': class_, 'threshold': str(threshold)})
     return list(g.cursor)
+
+
+def recount() -> None:
+    g.cursor.execute(
+        """
+        LOCK TABLE model.class_count, model.property_count, model.type_count
+            IN EXCLUSIVE MODE;
+        DELETE FROM model.class_count;
+        INSERT INTO model.class_count
+            (openatlas_class_name, cidoc_class_code, count)
+        SELECT openatlas_class_name, cidoc_class_code, COUNT(*)
+        FROM model.entity
+        GROUP BY openatlas_class_name, cidoc_class_code;
+        DELETE FROM model.property_count;
+        INSERT INTO model.property_count (property_code, count)
+        SELECT property_code, COUNT(*)
+        FROM model.link
+        GROUP BY property_code;
+        DELETE FROM model.type_count;
+        INSERT INTO model.type_count (type_id, count, count_property)
+        SELECT e.id, COALESCE(c.count, 0), COALESCE(p.count, 0)
+        FROM model.entity e
+        LEFT JOIN (
+            SELECT range_id, COUNT(*) AS count
+            FROM model.link
+            WHERE property_code IN ('P2', 'P89')
+            GROUP BY range_id) c ON c.range_id = e.id
+        LEFT JOIN (
+            SELECT type_id, COUNT(*) AS count
+            FROM model.link
+            WHERE type_id IS NOT NULL
+            GROUP BY type_id) p ON p.type_id = e.id
+        WHERE e.openatlas_class_name
+            IN ('administrative_unit', 'type', 'type_tools');
+        """)
@@ -2,24 +2,37 @@ from typing import Any
 
 from flask import g
 
+from openatlas.database.cache import metadata_rows
 
+
+@metadata_rows
 def get_classes() -> list[dict[str, Any]]:
     g.cursor.execute(
         """
-        SELECT c.code, c.name, comment, COUNT(e.id) AS count
-        FROM model.cidoc_class c
-        LEFT JOIN model.entity e ON c.code = e.cidoc_class_code
-        GROUP BY (c.code, c.name, c.comment);
+        SELECT c.code, c.name, comment
+        FROM model.cidoc_class c;
         """)
     return list(g.cursor)
 
 
+def get_counts() -> dict[str, int]:
+    g.cursor.execute(
+        """
+        SELECT cidoc_class_code AS code, SUM(count) AS count
+        FROM model.class_count
+        GROUP BY cidoc_class_code;
+        """)
+    return {row['code']: row['count'] for row in list(g.cursor)}
+
+
+@metadata_rows
 def get_hierarchy() -> list[dict[str, Any]]:
     g.cursor.execute(
         'SELECT super_code, sub_code FROM model.cidoc_class_inheritance;')
     return list(g.cursor)
 
 
+@metadata_rows
 def get_translations(language_codes: list[str]) -> list[dict[str, Any]]:
     g.cursor.execute(
         """
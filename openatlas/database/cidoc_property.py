@@ -2,7 +2,10 @@ from typing import Any
 
 from flask import g
 
+from openatlas.database.cache import metadata_rows
 
+
+@metadata_rows
 def get_properties() -> list[dict[str, Any]]:
     g.cursor.execute(
         """
@@ -12,27 +15,29 @@ def get_properties() -> list[dict[str, Any]]:
             p.domain_class_code,
             p.range_class_code,
             p.name,
-            p.name_inverse,
-            COUNT(l.id) AS count
-        FROM model.property p
-        LEFT JOIN model.link l ON p.code = l.property_code
-        GROUP BY (
-            p.code,
-            p.comment,
-            p.domain_class_code,
-            p.range_class_code,
-            p.name,
-            p.name_inverse);
+            p.name_inverse
+        FROM model.property p;
         """)
     return list(g.cursor)
 
 
+def get_counts() -> dict[str, int]:
+    g.cursor.execute(
+        """
+        SELECT property_code AS code, count
+        FROM model.property_count;
+        """)
+    return {row['code']: row['count'] for row in list(g.cursor)}
+
+
+@metadata_rows
 def get_hierarchy() -> list[dict[str, Any]]:
     g.cursor.execute(
         'SELECT super_code, sub_code FROM model.property_inheritance;')
     return list(g.cursor)
 
 
+@metadata_rows
 def get_translations(language_codes: list[str]) -> list[dict[str, Any]]:
     g.cursor.execute(
         """
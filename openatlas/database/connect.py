@@ -1,22 +1,169 @@
-from typing import Any
+import os
+import time
+from threading import Lock
+from typing import Any, Optional
 
 from flask import g
-from psycopg2 import connect
-from psycopg2.extensions import connection
+from psycopg2 import InterfaceError, OperationalError, connect
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+
+class PoolState:
+    """Connection pool of the current worker process with own bookkeeping
+    of its connections for statistics and health checks."""
+
+    def __init__(self) -> None:
+        self.pool: Optional[ThreadedConnectionPool] = None
+        self.pid: Optional[int] = None
+        self.lock = Lock()  # For creating the pool
+        self.inherited: list[ThreadedConnectionPool] = []
+        self.stats_lock = Lock()  # For stats and the connection data below
+        self.stats = {'checkouts': 0, 'overflow': 0, 'discarded': 0}
+        self.open: dict[int, float] = {}  # Connection id: last put back
+        self.used: set[int] = set()  # Ids of checked out connections
+
+    def is_current(self) -> bool:
+        return bool(self.pool) and self.pid == os.getpid()
+
+    def count(self, stat: str) -> None:
+        with self.stats_lock:
+            self.stats[stat] += 1
+
+
+state = PoolState()
+
+
+def get_connection_parameters(config: dict[str, Any]) -> dict[str, Any]:
+    return {
+        'database': config['DATABASE_NAME'],
+        'user': config['DATABASE_USER'],
+        'password': config['DATABASE_PASS'],
+        'port': config['DATABASE_PORT'],
+        'host': config['DATABASE_HOST']}
+
+
+def get_pool(config: dict[str, Any]) -> ThreadedConnectionPool:
+    with state.lock:
+        if not state.pool or not state.is_current():  # One for each worker
+            if state.pool:  # Keep the pool of a forked parent, closing it
+                state.inherited.append(state.pool)  # would close the parent's
+            pool = ThreadedConnectionPool(
+                config['DATABASE_POOL_MIN'],
+                config['DATABASE_POOL_MAX'],
+                **get_connection_parameters(config))
+            # Check out the connections opened with the pool to track them
+            connections = [
+                pool.getconn() for _ in range(config['DATABASE_POOL_MIN'])]
+            for connection_ in connections:
+                pool.putconn(connection_)
+            with state.stats_lock:
+                state.open = {
+                    id(c): time.monotonic() for c in connections
+                    if not c.closed}
+                state.used = set()
+                state.stats = dict.fromkeys(state.stats, 0)
+            state.pool = pool
+            state.pid = os.getpid()
+        return state.pool
+
+
+def put_connection(
+        pool: ThreadedConnectionPool,
+        connection_: connection,
+        close: bool = False) -> None:
+    with state.stats_lock:
+        state.used.discard(id(connection_))
+    try:
+        pool.putconn(connection_, close=close)
+    finally:
+        with state.stats_lock:
+            if connection_.closed:  # Closed by the pool if above its minimum
+                state.open.pop(id(connection_), None)
+            else:
+                state.open[id(connection_)] = time.monotonic()
+
+
+def is_healthy(
+        connection_: connection,
+        idle_since: Optional[float],
+        config: dict[str, Any]) -> bool:
+    # Only connections which look broken, are new or were idle for a while
+    # are checked with a query, e.g. for ones closed by a server restart
+    if not connection_.closed \
+            and connection_.get_transaction_status() \
+            == TRANSACTION_STATUS_IDLE \
+            and idle_since \
+            and time.monotonic() - idle_since \
+            < config['DATABASE_POOL_CHECK_IDLE']:
+        return True
+    try:
+        connection_.autocommit = True
+        with connection_.cursor() as cursor:
+            cursor.execute('SELECT 1;')
+        return True
+    except (InterfaceError, OperationalError):
+        return False
 
 
 def open_connection(config: dict[str, Any]) -> connection:
-    return connect(
-        database=config['DATABASE_NAME'],
-        user=config['DATABASE_USER'],
-        password=config['DATABASE_PASS'],
-        port=config['DATABASE_PORT'],
-        host=config['DATABASE_HOST'])
+    if not config['DATABASE_POOL_MAX']:
+        return connect(**get_connection_parameters(config))
+    pool = get_pool(config)
+    for _attempt in range(2):
+        try:
+            connection_ = pool.getconn()
+        except PoolError:  # All in use, use a temporary connection instead
+            state.count('overflow')
+            return connect(**get_connection_parameters(config))
+        with state.stats_lock:
+            idle_since = state.open.get(id(connection_))
+        if not is_healthy(connection_, idle_since, config):
+            state.count('discarded')
+            put_connection(pool, connection_, close=True)
+            continue
+        connection_.autocommit = True
+        with state.stats_lock:
+            state.open[id(connection_)] = idle_since or time.monotonic()
+            state.used.add(id(connection_))
+            state.stats['checkouts'] += 1
+        return connection_
+    return connect(**get_connection_parameters(config))
 
 
 def close_connection() -> None:
-    if hasattr(g, 'db'):
+    if not hasattr(g, 'db'):
+        return
+    with state.stats_lock:
+        pooled = id(g.db) in state.used
+    if not state.pool or not state.is_current() or not pooled:
+        g.db.close()  # Not pooled, e.g. overflow or pooling deactivated
+        return
+    try:
+        if not g.db.closed \
+                and g.db.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            with g.db.cursor() as cursor:  # E.g. left open by an exception
+                cursor.execute('ROLLBACK;')
+        put_connection(state.pool, g.db, close=bool(g.db.closed))
+    except (InterfaceError, OperationalError, PoolError):
+        state.count('discarded')
         g.db.close()
+        with state.stats_lock:
+            state.open.pop(id(g.db), None)
+
+
+def get_pool_stats() -> dict[str, Any]:
+    if not state.pool or not state.is_current():
+        return {}
+    with state.stats_lock:
+        return {
+            'process': state.pid,
+            'minimum': state.pool.minconn,
+            'maximum': state.pool.maxconn,
+            'open': len(state.open),
+            'in use': len(state.used),
+            'idle': len(state.open.keys() - state.used),
+            **state.stats}
 
 
 class Transaction:
@@ -1,7 +1,10 @@
+import re
 from typing import Any, Iterable, Optional
 
 from flask import g
 
+from openatlas.database.cache import metadata_rows
+
 
 def get_by_id(
         id_: int,
@@ -77,10 +80,11 @@ def get_by_cidoc_class(
 def get_overview_counts(classes: list[str]) -> dict[str, int]:
     g.cursor.execute(
         """
-        SELECT openatlas_class_name AS name, COUNT(openatlas_class_name)
-        FROM model.entity
+        SELECT openatlas_class_name AS name, SUM(count) AS count
+        FROM model.class_count
         WHERE openatlas_class_name IN %(classes)s
-        GROUP BY openatlas_class_name;
+        GROUP BY openatlas_class_name
+        HAVING SUM(count) > 0;
         """,
         {'classes': tuple(classes)})
     return {row['name']: row['count'] for row in list(g.cursor)}
@@ -114,6 +118,180 @@ def get_latest(classes: list[str], limit: int) -> list[dict[str, Any]]:
     return list(g.cursor)
 
 
+TABLE_ORDER = {
+    'name': 'lower(e.name)',
+    'class': 'e.openatlas_class_name',
+    'begin': 'e.begin_from',
+    'end': 'COALESCE(e.end_to, e.end_from)',
+    'description': 'lower(e.description)'}
+
+
+def table_filter_sql(filters: dict[str, Any]) -> str:
+    sql = """
+        FROM model.entity e
+        WHERE e.openatlas_class_name IN %(classes)s"""
+    if filters.get('exclude_ids'):
+        sql += ' AND e.id NOT IN %(exclude_ids)s'
+    if filters.get('term'):
+        description = """
+                OR model.search_text(e.description)
+                    LIKE model.search_text(%(term)s)"""
+        sql += f"""
+            AND (
+                model.search_text(e.name) LIKE model.search_text(%(term)s)
+                {description if filters.get('descriptions', True) else ''}
+                OR EXISTS (
+                    SELECT 1
+                    FROM model.link la
+                    JOIN model.entity alias ON la.range_id = alias.id
+                    WHERE la.domain_id = e.id
+                        AND la.property_code = 'P1'
+                        AND model.search_text(alias.name)
+                            LIKE model.search_text(%(term)s)))"""
+    return sql
+
+
+def table_filter_arguments(filters: dict[str, Any]) -> dict[str, Any]:
+    term = filters.get('term', '')
+    for char in ['\\', '%', '_']:  # Match them literally with LIKE
+        term = term.replace(char, f'\\{char}')
+    return {
+        'classes': tuple(filters['classes']),
+        'term': f'%{term}%',
+        'exclude_ids': tuple(filters.get('exclude_ids') or [])}
+
+
+def get_table_count(filters: dict[str, Any]) -> int:
+    g.cursor.execute(
+        f'SELECT COUNT(*) AS count {table_filter_sql(filters)};',
+        table_filter_arguments(filters))
+    return g.cursor.fetchone()['count']
+
+
+def get_table_ids(
+        filters: dict[str, Any],
+        column: str,
+        desc: bool,
+        offset: int,
+        limit: Optional[int],
+        type_ids: list[int]) -> list[int]:
+    order = TABLE_ORDER.get(column, TABLE_ORDER['name'])
+    if column == 'type' and type_ids:
+        order = """(
+            SELECT lower(t.name)
+            FROM model.link l
+            JOIN model.entity t ON l.range_id = t.id
+            WHERE l.domain_id = e.id
+                AND l.property_code = 'P2'
+                AND t.id IN %(type_ids)s
+            LIMIT 1)"""
+    g.cursor.execute(
+        f"""
+        SELECT e.id {table_filter_sql(filters)}
+        ORDER BY {order} {'DESC' if desc else 'ASC'} NULLS LAST, e.id
+        LIMIT %(limit)s OFFSET %(offset)s;
+        """,
+        table_filter_arguments(filters) | {
+            'type_ids': tuple(type_ids),
+            'limit': limit,
+            'offset': offset})
+    return [row['id'] for row in list(g.cursor)]
+
+
+API_ORDER = {  # Collation "C" to sort like Python does
+    'id': 'e.id',
+    'name': 'e.name COLLATE "C"',
+    'cidoc_class': 'c.name COLLATE "C"',
+    'system_class': 'e.openatlas_class_name COLLATE "C"',
+    'begin_from': 'e.begin_from',
+    'begin_to': 'e.begin_to',
+    'end_from': 'e.end_from',
+    'end_to': 'e.end_to'}
+
+
+def api_filter_sql(filters: dict[str, tuple[Any, ...]]) -> str:
+    # Filters are tuples of classes, ids and type_ids, classes or ids needed
+    sql = ' OR '.join(
+        condition for key, condition in [
+            ('classes', 'e.openatlas_class_name IN %(classes)s'),
+            ('ids', 'e.id IN %(ids)s')]
+        if filters[key])
+    sql = f"""
+        FROM model.entity e
+        JOIN model.cidoc_class c ON e.cidoc_class_code = c.code
+        WHERE ({sql})"""
+    if filters['type_ids']:
+        sql += """
+            AND EXISTS (
+                SELECT 1 FROM model.link t
+                WHERE t.domain_id = e.id
+                    AND t.property_code IN ('P2', 'P89')
+                    AND t.range_id IN %(type_ids)s)"""
+    return sql
+
+
+def api_order_sql(column: str, desc: bool) -> str:
+    return f"{API_ORDER[column]} {'DESC' if desc else 'ASC'} NULLS LAST, e.id"
+
+
+def get_api_count(filters: dict[str, tuple[Any, ...]]) -> int:
+    g.cursor.execute(
+        f'SELECT COUNT(*) AS count {api_filter_sql(filters)};',
+        filters)
+    return g.cursor.fetchone()['count']
+
+
+def get_api_page_index(
+        filters: dict[str, tuple[Any, ...]],
+        column: str,
+        desc: bool,
+        limit: int) -> tuple[list[int], int]:
+    # Ids starting a page (all on one page if limit is 0) and the total
+    g.cursor.execute(
+        f"""
+        SELECT id, total FROM (
+            SELECT
+                e.id,
+                row_number() OVER (ORDER BY {api_order_sql(column, desc)})
+                    AS number,
+                count(*) OVER () AS total
+            {api_filter_sql(filters)}) AS ordered
+        WHERE CASE WHEN %(limit)s > 0
+            THEN (number - 1) %% %(limit)s = 0 ELSE number = 1 END
+        ORDER BY number;
+        """,
+        filters | {'limit': limit})
+    rows = list(g.cursor)
+    return [row['id'] for row in rows], rows[0]['total'] if rows else 0
+
+
+def get_api_page_ids(
+        filters: dict[str, tuple[Any, ...]],
+        column: str,
+        desc: bool,
+        limit: int,
+        start_id: Optional[int] = None) -> list[int]:
+    key = API_ORDER[column]
+    sql = f'SELECT e.id {api_filter_sql(filters)}'
+    if start_id:  # Keyset pagination, start entity included
+        sql = f"""
+            WITH start AS (
+                SELECT {key} AS key, e.id
+                FROM model.entity e
+                JOIN model.cidoc_class c ON e.cidoc_class_code = c.code
+                WHERE e.id = %(start_id)s)
+            {sql}
+                AND ({key} {'<' if desc else '>'} (SELECT key FROM start)
+                    OR ({key} IS NULL
+                        AND (SELECT key FROM start) IS NOT NULL)
+                    OR ({key} IS NOT DISTINCT FROM (SELECT key FROM start)
+                        AND e.id >= (SELECT id FROM start)))"""
+    g.cursor.execute(
+        f'{sql} ORDER BY {api_order_sql(column, desc)} LIMIT %(limit)s;',
+        filters | {'limit': limit, 'start_id': start_id})
+    return [row['id'] for row in list(g.cursor)]
+
+
 def get_all_entities() -> list[dict[str, Any]]:
     g.cursor.execute(
         """
@@ -212,16 +390,12 @@ def select_sql(types: bool = False, aliases: bool = False) -> str:
             e.created,
             e.modified,
             e.openatlas_class_name,
-            COALESCE(to_char(e.begin_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_from,
+            EXTRACT(EPOCH FROM e.begin_from)::bigint AS begin_from,
             e.begin_comment,
-            COALESCE(to_char(e.begin_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_to,
-            COALESCE(to_char(e.end_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_from,
+            EXTRACT(EPOCH FROM e.begin_to)::bigint AS begin_to,
+            EXTRACT(EPOCH FROM e.end_from)::bigint AS end_from,
             e.end_comment,
-            COALESCE(to_char(e.end_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_to"""
+            EXTRACT(EPOCH FROM e.end_to)::bigint AS end_to"""
     if types:
         sql += """
             ,array_to_json(
@@ -252,26 +426,65 @@ def search(
         desc: bool = False,
         own: bool = False,
         user_id: Optional[int] = None) -> list[dict[str, Any]]:
-    description_clause = """
-        OR UNACCENT(lower(e.description)) LIKE UNACCENT(lower(%(term)s))
-        OR UNACCENT(lower(e.begin_comment)) LIKE UNACCENT(lower(%(term)s))
-        OR UNACCENT(lower(e.end_comment)) LIKE UNACCENT(lower(%(term)s))"""
+    words = re.findall(r'\w+', term) if desc else []
+    match = 'model.search_text({0}.name) LIKE model.search_text(%(term)s)'
+    rank = 'similarity(model.search_text({0}.name), query.text)'
+    tsquery = ''
+    if words:
+        tsquery = """,
+            to_tsquery(
+                model.search_config(),
+                model.search_text(%(words)s))
+            || to_tsquery(
+                'pg_catalog.simple',
+                model.search_text(%(words)s)) AS tsquery"""
+        match += ' OR {0}.search_vector @@ query.tsquery'
+        rank += ' + ts_rank({0}.search_vector, query.tsquery)'
     g.cursor.execute(
-        select_sql() +
         f"""
-        {'LEFT JOIN web.user_log ul ON e.id = ul.entity_id' if own else ''}
+        WITH query AS (
+            SELECT model.search_text(%(text)s) AS text{tsquery}),
+        matches AS (
+            SELECT e.id, {rank.format('e')} AS rank
+            FROM model.entity e, query
+            WHERE e.openatlas_class_name IN %(classes)s
+                AND ({match.format('e')})
+            UNION ALL
+            SELECT l.domain_id, {rank.format('a')} AS rank
+            FROM model.entity a
+            JOIN model.link l ON a.id = l.range_id AND l.property_code = 'P1'
+            CROSS JOIN query
+            WHERE a.openatlas_class_name = 'appellation'
+                AND ({match.format('a')}))
+        {select_sql()}
+        JOIN (SELECT id, max(rank) AS rank FROM matches GROUP BY id) m
+            ON e.id = m.id
         WHERE e.openatlas_class_name IN %(classes)s
-            {'AND ul.user_id = %(user_id)s' if own else ''}
-            AND (
-                UNACCENT(LOWER(e.name)) LIKE UNACCENT(LOWER(%(term)s))
-                {description_clause if desc else ''})
-        GROUP BY e.id
-        ORDER BY e.name;
+            {'AND e.id IN (SELECT entity_id FROM web.user_log '
+             'WHERE user_id = %(user_id)s)' if own else ''}
+        ORDER BY m.rank DESC, e.name;
         """,
-        {'term': f'%{term}%', 'user_id': user_id, 'classes': tuple(classes)})
+        {
+            'term': f'%{term}%',
+            'text': term,
+            'words': ' & '.join(f'{word}:*' for word in words),
+            'user_id': user_id,
+            'classes': tuple(classes)})
     return list(g.cursor)
 
 
+def update_search_vectors() -> int:
+    g.cursor.execute(
+        """
+        UPDATE model.entity
+        SET search_vector = model.search_vector(
+            name, description, begin_comment, end_comment)
+        WHERE search_vector IS DISTINCT FROM model.search_vector(
+            name, description, begin_comment, end_comment);
+        """)
+    return g.cursor.rowcount
+
+
 def link(data: dict[str, Any]) -> int:
     g.cursor.execute(
         """
@@ -307,6 +520,7 @@ def update_file_info(data: dict[str, Any]) -> None:
         data)
 
 
+@metadata_rows
 def get_file_info() -> dict[int, dict[str, Any]]:
     g.cursor.execute(
         """
@@ -421,14 +635,12 @@ def get_links_of_entities(
             l.modified,
             e.name,
             l.type_id,
-            COALESCE(to_char(l.begin_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_from, l.begin_comment,
-            COALESCE(to_char(l.begin_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_to,
-            COALESCE(to_char(l.end_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_from, l.end_comment,
-            COALESCE(to_char(l.end_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_to
+            EXTRACT(EPOCH FROM l.begin_from)::bigint AS begin_from,
+            l.begin_comment,
+            EXTRACT(EPOCH FROM l.begin_to)::bigint AS begin_to,
+            EXTRACT(EPOCH FROM l.end_from)::bigint AS end_from,
+            l.end_comment,
+            EXTRACT(EPOCH FROM l.end_to)::bigint AS end_to
         FROM model.link l
         JOIN model.entity e
             ON l.{'domain' if inverse else 'range'}_id = e.id """
@@ -446,6 +658,17 @@ def get_links_of_entities(
     return list(g.cursor)
 
 
+def get_linked_entity_ids(ids: list[int]) -> list[int]:
+    g.cursor.execute(
+        """
+        SELECT range_id AS id FROM model.link WHERE domain_id IN %(ids)s
+        UNION
+        SELECT domain_id AS id FROM model.link WHERE range_id IN %(ids)s;
+        """,
+        {'ids': tuple(ids)})
+    return [row['id'] for row in list(g.cursor)]
+
+
 def delete_reference_system_links(entity_id: int) -> None:
     g.cursor.execute(
         """
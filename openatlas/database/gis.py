@@ -1,29 +1,10 @@
 import ast
 from collections import defaultdict
-from typing import Any
+from typing import Any, Optional
 
 from flask import g
 
 
-def get_by_id(id_: int) -> list[dict[str, Any]]:
-    g.cursor.execute(
-        """
-        SELECT
-            g.id,
-            g.name,
-            g.description,
-            g.type,
-            public.ST_AsGeoJSON(geom_point) AS point,
-            public.ST_AsGeoJSON(geom_linestring) AS linestring,
-            public.ST_AsGeoJSON(geom_polygon) AS polygon
-        FROM model.entity place
-        JOIN model.gis g ON place.id = g.entity_id
-        WHERE place.id = %(id_)s;
-        """,
-        {'id_': id_})
-    return [get_geometry_dict(row) for row in list(g.cursor)]
-
-
 def get_by_ids(ids: list[int]) -> defaultdict[int, list[dict[str, Any]]]:
     g.cursor.execute(
         """
@@ -63,32 +44,6 @@ def get_geometry_dict(row: dict[str, Any]) -> dict[str, Any]:
     return geometry
 
 
-def get_centroids_by_id(id_: int) -> list[dict[str, Any]]:
-    g.cursor.execute(
-        """
-        SELECT
-            g.id,
-            g.name,
-            g.description,
-            g.type,
-            CASE WHEN geom_linestring IS NULL THEN NULL ELSE
-                public.ST_AsGeoJSON(public.ST_PointOnSurface(geom_linestring))
-                END AS linestring_point,
-            CASE WHEN geom_polygon IS NULL THEN NULL ELSE
-                public.ST_AsGeoJSON(public.ST_PointOnSurface(geom_polygon))
-                END AS polygon_point
-        FROM model.entity place
-        JOIN model.gis g ON place.id = g.entity_id
-        WHERE place.id = %(id_)s;
-        """,
-        {'id_': id_})
-    geometries = []
-    for row in list(g.cursor):
-        if data := get_centroid_dict(row):
-            geometries.append(data)
-    return geometries
-
-
 def get_centroids_by_ids(ids: list[int]) -> defaultdict[int, list[Any]]:
     g.cursor.execute(
         """
@@ -131,11 +86,12 @@ def get_centroid_dict(row: dict[str, Any]) -> dict[str, Any]:
     return geometry
 
 
-def get_wkt_by_id(id_: int) -> list[dict[str, Any]]:
+def get_wkt_by_ids(ids: list[int]) -> defaultdict[int, list[dict[str, Any]]]:
     g.cursor.execute(
         """
         SELECT
             g.id,
+            g.entity_id,
             g.name,
             g.description,
             g.type,
@@ -144,29 +100,35 @@ def get_wkt_by_id(id_: int) -> list[dict[str, Any]]:
             public.ST_AsText(geom_polygon) AS polygon
         FROM model.entity place
         JOIN model.gis g ON place.id = g.entity_id
-        WHERE place.id = %(id_)s;
+        WHERE place.id IN %(ids)s;
         """,
-        {'id_': id_})
-    geometries = []
+        {'ids': tuple(ids)})
+    locations = defaultdict(list)
     for row in list(g.cursor):
-        geometry = {}
-        if row['point']:
-            geometry['defined_by'] = row['point']
-        elif row['linestring']:
-            geometry['defined_by'] = row['linestring']
-        else:
-            geometry['defined_by'] = row['polygon']
-        geometry['content'] = row['description'].replace('"', '\"') \
-            if row['description'] else ''
-        geometry['shape_type'] = row['type'].replace('"', '\"') \
-            if row['type'] else ''
-        geometries.append(geometry)
-    return geometries
-
-
-def get_all(extra_ids: list[int]) -> list[dict[str, Any]]:
+        locations[row['entity_id']].append(get_wkt_dict(row))
+    return locations
+
+
+def get_wkt_dict(row: dict[str, Any]) -> dict[str, Any]:
+    geometry = {}
+    if row['point']:
+        geometry['defined_by'] = row['point']
+    elif row['linestring']:
+        geometry['defined_by'] = row['linestring']
+    else:
+        geometry['defined_by'] = row['polygon']
+    geometry['content'] = row['description'].replace('"', '\"') \
+        if row['description'] else ''
+    geometry['shape_type'] = row['type'].replace('"', '\"') \
+        if row['type'] else ''
+    return geometry
+
+
+def get_all(
+        extra_ids: list[int],
+        places: bool = True) -> list[dict[str, Any]]:
     g.cursor.execute(
-        """
+        f"""
         SELECT
             object.id AS object_id,
             g.entity_id AS location_id,
@@ -191,14 +153,139 @@ def get_all(extra_ids: list[int]) -> list[dict[str, Any]]:
             AND t.property_code = 'P2'
         WHERE place.cidoc_class_code = 'E53'
             AND l.property_code = 'P53'
-            AND (object.openatlas_class_name = 'place'
-                OR object.id IN %(extra_ids)s)
+            AND ({"object.openatlas_class_name = 'place' OR" if places else ''}
+                object.id IN %(extra_ids)s)
         GROUP BY object.id, g.id;
         """,
         {'extra_ids': tuple(extra_ids)})
     return list(g.cursor)
 
 
+def get_places(shape: str, after_id: int, limit: int) -> list[dict[str, Any]]:
+    g.cursor.execute(
+        f"""
+        SELECT
+            object.id AS object_id,
+            g.entity_id AS location_id,
+            g.id,
+            g.name,
+            g.description,
+            g.type,
+            public.ST_AsGeoJSON(geom_point) AS point,
+            public.ST_AsGeoJSON(geom_linestring) AS linestring,
+            public.ST_AsGeoJSON(geom_polygon) AS polygon,
+            CASE WHEN geom_polygon IS NULL THEN NULL ELSE
+                public.ST_AsGeoJSON(public.ST_PointOnSurface(geom_polygon))
+                END AS polygon_point,
+            object.name AS object_name,
+            object.description AS object_desc,
+            (SELECT string_agg(CAST(t.range_id AS text), ',')
+                FROM model.link t
+                WHERE t.domain_id = object.id AND t.property_code = 'P2'
+            ) AS types
+        FROM model.gis g
+        JOIN model.link l ON g.entity_id = l.range_id
+            AND l.property_code = 'P53'
+        JOIN model.entity object ON l.domain_id = object.id
+            AND object.openatlas_class_name = 'place'
+        WHERE g.geom_{shape} IS NOT NULL AND g.id > %(after_id)s
+        ORDER BY g.id
+        LIMIT %(limit)s;
+        """,
+        {'after_id': after_id, 'limit': limit})
+    return list(g.cursor)
+
+
+def get_places_count(shape: str) -> int:
+    g.cursor.execute(
+        f"""
+        SELECT COUNT(*) AS count
+        FROM model.gis g
+        JOIN model.link l ON g.entity_id = l.range_id
+            AND l.property_code = 'P53'
+        JOIN model.entity object ON l.domain_id = object.id
+            AND object.openatlas_class_name = 'place'
+        WHERE g.geom_{shape} IS NOT NULL;
+        """)
+    return g.cursor.fetchone()['count']
+
+
+def get_places_extent() -> Optional[dict[str, float]]:
+    g.cursor.execute(
+        """
+        SELECT
+            public.ST_XMin(extent) AS west,
+            public.ST_YMin(extent) AS south,
+            public.ST_XMax(extent) AS east,
+            public.ST_YMax(extent) AS north
+        FROM (
+            SELECT public.ST_Extent(
+                COALESCE(g.geom_point, g.geom_linestring, g.geom_polygon))
+                AS extent
+            FROM model.gis g
+            JOIN model.link l ON g.entity_id = l.range_id
+                AND l.property_code = 'P53'
+            JOIN model.entity object ON l.domain_id = object.id
+                AND object.openatlas_class_name = 'place') AS places;
+        """)
+    row = g.cursor.fetchone()
+    return dict(row) if row and row['west'] is not None else None
+
+
+def get_places_by_bbox(
+        bbox: list[float],
+        tolerance: float,
+        exclude_ids: list[int],
+        limit: int) -> list[dict[str, Any]]:
+    envelope = \
+        'public.ST_MakeEnvelope(' \
+        '%(west)s, %(south)s, %(east)s, %(north)s, 4326)'
+    g.cursor.execute(
+        f"""
+        SELECT
+            object.id AS object_id,
+            g.entity_id AS location_id,
+            g.id,
+            g.name,
+            g.description,
+            g.type,
+            public.ST_AsGeoJSON(geom_point) AS point,
+            public.ST_AsGeoJSON(public.ST_SimplifyPreserveTopology(
+                geom_linestring, %(tolerance)s)) AS linestring,
+            public.ST_AsGeoJSON(public.ST_SimplifyPreserveTopology(
+                geom_polygon, %(tolerance)s)) AS polygon,
+            CASE WHEN geom_polygon IS NULL THEN NULL ELSE
+                public.ST_AsGeoJSON(public.ST_PointOnSurface(geom_polygon))
+                END AS polygon_point,
+            object.name AS object_name,
+            object.description AS object_desc,
+            (SELECT string_agg(CAST(t.range_id AS text), ',')
+                FROM model.link t
+                WHERE t.domain_id = object.id AND t.property_code = 'P2'
+            ) AS types
+        FROM model.gis g
+        JOIN model.link l ON g.entity_id = l.range_id
+            AND l.property_code = 'P53'
+        JOIN model.entity object ON l.domain_id = object.id
+            AND object.openatlas_class_name = 'place'
+        WHERE (
+                g.geom_point && {envelope}
+                OR g.geom_linestring && {envelope}
+                OR g.geom_polygon && {envelope})
+            AND object.id NOT IN %(exclude_ids)s
+        ORDER BY g.id
+        LIMIT %(limit)s;
+        """, {
+            'west': bbox[0],
+            'south': bbox[1],
+            'east': bbox[2],
+            'north': bbox[3],
+            'tolerance': tolerance,
+            'exclude_ids': tuple(exclude_ids or [0]),
+            'limit': limit})
+    return list(g.cursor)
+
+
 def test_geom(geometry: str) -> bool:
     g.cursor.execute(
         """
@@ -222,18 +309,6 @@ def insert(data: dict[str, Any], shape: str) -> None:
         data)
 
 
-def insert_wkt(data: dict[str, Any], shape: str) -> None:
-    g.cursor.execute(
-        f"""
-        INSERT INTO model.gis (
-            entity_id, name, description, type, geom_{shape}
-        ) VALUES (
-            %(entity_id)s, '', %(description)s, %(type)s,
-            public.ST_SetSRID(public.ST_GeomFromText(%(wkt)s),4326));
-        """,
-        data)
-
-
 def delete_by_entity_id(id_: int) -> None:
     g.cursor.execute(
         'DELETE FROM model.gis WHERE entity_id = %(id)s;',
@@ -0,0 +1,84 @@
+from typing import Any, Optional
+
+from flask import g
+from psycopg2.extras import Json
+
+
+def get_all() -> list[dict[str, Any]]:
+    g.cursor.execute(
+        """
+        SELECT file_id, status, attempts, message, modified
+        FROM web.iiif_conversion
+        ORDER BY modified DESC;
+        """)
+    return list(g.cursor)
+
+
+def get_failed_ids(attempts: int) -> list[int]:
+    g.cursor.execute(
+        """
+        SELECT file_id
+        FROM web.iiif_conversion
+        WHERE status = 'failed' AND attempts >= %(attempts)s;
+        """,
+        {'attempts': attempts})
+    return [row['file_id'] for row in g.cursor]
+
+
+def get_attempts(id_: int) -> int:
+    g.cursor.execute(
+        "SELECT attempts FROM web.iiif_conversion WHERE file_id = %(id)s;",
+        {'id': id_})
+    row = g.cursor.fetchone()
+    return row['attempts'] if row else 0
+
+
+def log(id_: int, status: str, message: Optional[str]) -> None:
+    g.cursor.execute(
+        """
+        INSERT INTO web.iiif_conversion (file_id, status, attempts, message)
+        VALUES (%(id)s, %(status)s, 1, %(message)s)
+        ON CONFLICT (file_id) DO UPDATE SET
+            status = EXCLUDED.status,
+            attempts = web.iiif_conversion.attempts + 1,
+            message = EXCLUDED.message,
+            modified = now();
+        """,
+        {'id': id_, 'status': status, 'message': message})
+
+
+def delete(id_: int) -> None:
+    g.cursor.execute(
+        "DELETE FROM web.iiif_conversion WHERE file_id = %(id)s;",
+        {'id': id_})
+
+
+def delete_failed() -> None:
+    g.cursor.execute(
+        "DELETE FROM web.iiif_conversion WHERE status = 'failed';")
+
+
+def get_info(id_: int) -> Optional[dict[str, Any]]:
+    g.cursor.execute(
+        "SELECT url, info FROM web.iiif_info WHERE file_id = %(id)s;",
+        {'id': id_})
+    return g.cursor.fetchone()
+
+
+def set_info(id_: int, url: str, info: dict[str, Any]) -> None:
+    g.cursor.execute(
+        """
+        INSERT INTO web.iiif_info (file_id, url, info)
+        VALUES (%(id)s, %(url)s, %(info)s)
+        ON CONFLICT (file_id) DO UPDATE SET
+            url = EXCLUDED.url,
+            info = EXCLUDED.info,
+            created = now();
+        """,
+        {'id': id_, 'url': url, 'info': Json(info)})
+
+
+def delete_info(id_: int) -> None:
+    g.cursor.execute(
+        "DELETE FROM web.iiif_info WHERE file_id = %(id)s;",
+        {'id': id_})
@@ -1,7 +1,21 @@
+import io
 from typing import Any, Optional
 
 from flask import g
 
+# Column order of rows for copy_rows(), None is copied as NULL
+COPY_COLUMNS = {
+    'model.entity': [
+        'id', 'openatlas_class_name', 'cidoc_class_code', 'name',
+        'description', 'begin_from', 'begin_to', 'begin_comment', 'end_from',
+        'end_to', 'end_comment'],
+    'import.entity': ['project_id', 'origin_id', 'entity_id', 'user_id'],
+    'model.link': [
+        'property_code', 'domain_id', 'range_id', 'description', 'type_id'],
+    'model.gis': [
+        'entity_id', 'name', 'description', 'type', 'geom_point',
+        'geom_linestring', 'geom_polygon']}
+
 SQL = """
     SELECT
         p.id,
@@ -89,19 +103,46 @@ def update_project(id_: int, name: str, description: Optional[str]) -> None:
         {'id': id_, 'name': name, 'description': description})
 
 
-def import_data(
+def get_ids_from_origin_ids(
         project_id: int,
-        entity_id: int,
-        user_id: int,
-        origin_id: Optional[int]) -> None:
+        origin_ids: list[str]) -> dict[str, int]:
+    if not origin_ids:
+        return {}
     g.cursor.execute(
         """
-        INSERT INTO import.entity (
-            project_id, origin_id, entity_id, user_id
-        ) VALUES (
-            %(project_id)s, %(origin_id)s, %(entity_id)s, %(user_id)s);
-        """, {
-            'project_id': project_id,
-            'origin_id': origin_id,
-            'entity_id': entity_id,
-            'user_id': user_id})
+        SELECT origin_id, entity_id FROM import.entity
+        WHERE project_id = %(project_id)s AND origin_id IN %(ids)s;
+        """,
+        {'project_id': project_id, 'ids': tuple(set(origin_ids))})
+    return {row['origin_id']: row['entity_id'] for row in g.cursor}
+
+
+def get_entity_ids(count: int) -> list[int]:
+    g.cursor.execute(
+        """
+        SELECT nextval('model.entity_id_seq') AS id
+        FROM generate_series(1, %(count)s);
+        """,
+        {'count': count})
+    return [row['id'] for row in g.cursor]
+
+
+def copy_rows(table: str, rows: list[tuple[Any, ...]]) -> None:
+    if not rows:
+        return
+    file = io.StringIO()
+    for row in rows:
+        file.write(','.join(copy_value(value) for value in row) + '\n')
+    file.seek(0)
+    g.cursor.copy_expert(
+        f"COPY {table} ({', '.join(COPY_COLUMNS[table])}) "
+        "FROM STDIN WITH (FORMAT csv);",
+        file)
+
+
+def copy_value(value: Any) -> str:
+    if value is None:  # An unquoted empty value is NULL in CSV format
+        return ''
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
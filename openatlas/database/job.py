@@ -0,0 +1,144 @@
+from typing import Any, Optional
+
+from flask import g
+from psycopg2.extras import Json
+
+# Advisory locks are held by workers (id 0) and for running jobs (job id) as
+# long as their database session lasts, also if the worker process is killed
+LOCK = "'web.job'::regclass::oid::integer"
+SQL = """
+    SELECT
+        id, name, status, arguments, progress, total, message, result,
+        user_id, created, started, finished
+    FROM web.job """
+
+
+def insert(
+        name: str,
+        arguments: dict[str, Any],
+        user_id: Optional[int]) -> int:
+    g.cursor.execute(
+        """
+        INSERT INTO web.job (name, arguments, user_id)
+        VALUES (%(name)s, %(arguments)s, %(user_id)s)
+        RETURNING id;
+        """,
+        {'name': name, 'arguments': Json(arguments), 'user_id': user_id})
+    return g.cursor.fetchone()['id']
+
+
+def get_by_id(id_: int) -> dict[str, Any]:
+    g.cursor.execute(f'{SQL} WHERE id = %(id)s;', {'id': id_})
+    return g.cursor.fetchone()
+
+
+def get_all(limit: int) -> list[dict[str, Any]]:
+    g.cursor.execute(
+        f'{SQL} ORDER BY created DESC, id DESC LIMIT %(limit)s;',
+        {'limit': limit})
+    return list(g.cursor)
+
+
+def get_latest(name: str) -> Optional[dict[str, Any]]:
+    g.cursor.execute(
+        f'{SQL} WHERE name = %(name)s ORDER BY id DESC LIMIT 1;',
+        {'name': name})
+    return g.cursor.fetchone()
+
+
+def claim() -> Optional[int]:
+    g.cursor.execute(
+        f"""
+        UPDATE web.job SET (status, started) = ('running', now())
+        WHERE id = (
+            SELECT id FROM web.job
+            WHERE status = 'queued'
+            ORDER BY id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED)
+        RETURNING id, pg_advisory_lock({LOCK}, id);
+        """)
+    row = g.cursor.fetchone()
+    return row['id'] if row else None
+
+
+def start(id_: int) -> None:
+    g.cursor.execute(
+        f"""
+        UPDATE web.job SET (status, started) = ('running', now())
+        WHERE id = %(id)s
+        RETURNING pg_advisory_lock({LOCK}, id);
+        """,
+        {'id': id_})
+
+
+def unlock(id_: int) -> None:
+    g.cursor.execute(
+        f"SELECT pg_advisory_unlock({LOCK}, %(id)s);",
+        {'id': id_})
+
+
+def lock_worker() -> bool:
+    g.cursor.execute(f"SELECT pg_try_advisory_lock({LOCK}, 0) AS locked;")
+    return g.cursor.fetchone()['locked']
+
+
+def unlock_worker() -> None:
+    g.cursor.execute(f"SELECT pg_advisory_unlock({LOCK}, 0);")
+
+
+def worker_running() -> bool:
+    g.cursor.execute(
+        f"""
+        SELECT CASE WHEN pg_try_advisory_lock({LOCK}, 0)
+            THEN NOT pg_advisory_unlock({LOCK}, 0)
+            ELSE true END AS running;
+        """)
+    return g.cursor.fetchone()['running']
+
+
+def has_queued() -> bool:
+    g.cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM web.job WHERE status = 'queued');")
+    return g.cursor.fetchone()['exists']
+
+
+def fail_stale(message: str) -> int:
+    # Running jobs without a lock lost their worker, e.g. at a restart
+    g.cursor.execute(
+        f"""
+        UPDATE web.job
+        SET (status, message, finished) = ('failed', %(message)s, now())
+        WHERE status = 'running' AND pg_try_advisory_xact_lock({LOCK}, id);
+        """,
+        {'message': message})
+    return g.cursor.rowcount
+
+
+def update_progress(id_: int, progress: int, total: Optional[int]) -> None:
+    g.cursor.execute(
+        """
+        UPDATE web.job SET (progress, total) = (%(progress)s, %(total)s)
+        WHERE id = %(id)s;
+        """,
+        {'id': id_, 'progress': progress, 'total': total})
+
+
+def finish(
+        id_: int,
+        status: str,
+        message: Optional[str],
+        result: Optional[str]) -> None:
+    g.cursor.execute(
+        """
+        UPDATE web.job
+        SET (status, message, result, finished) =
+            (%(status)s, %(message)s, %(result)s, now())
+        WHERE id = %(id)s;
+        """,
+        {'id': id_, 'status': status, 'message': message, 'result': result})
+
+
+def delete_finished() -> None:
+    g.cursor.execute(
+        "DELETE FROM web.job WHERE status IN ('finished', 'failed');")
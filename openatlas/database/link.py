@@ -39,14 +39,12 @@ def get_by_id(id_: int) -> dict[str, Any]:
             l.created,
             l.modified,
             l.type_id,
-            COALESCE(to_char(l.begin_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_from, l.begin_comment,
-            COALESCE(to_char(l.begin_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_to,
-            COALESCE(to_char(l.end_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_from, l.end_comment,
-            COALESCE(to_char(l.end_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_to
+            EXTRACT(EPOCH FROM l.begin_from)::bigint AS begin_from,
+            l.begin_comment,
+            EXTRACT(EPOCH FROM l.begin_to)::bigint AS begin_to,
+            EXTRACT(EPOCH FROM l.end_from)::bigint AS end_from,
+            l.end_comment,
+            EXTRACT(EPOCH FROM l.end_to)::bigint AS end_to
         FROM model.link l
         WHERE l.id = %(id)s;
         """,
@@ -154,51 +152,3 @@ def delete_link_duplicates() -> int:
                 FROM model.link) AS temp_table);
         """)
     return g.cursor.rowcount
-
-
-def get_all_links_for_network(
-        system_classes: list[str]) -> list[dict[str, Any]]:
-    g.cursor.execute(
-        """
-        SELECT
-            l.id,
-            l.property_code,
-            l.domain_id,
-            de.name AS domain_name,
-            de.openatlas_class_name AS domain_system_class,
-            l.range_id,
-            re.name AS range_name,
-            re.openatlas_class_name AS range_system_class,
-            l.description,
-            l.type_id
-        FROM model.link l
-        JOIN model.entity de ON l.domain_id = de.id
-        JOIN model.entity re ON l.range_id = re.id
-        WHERE de.openatlas_class_name IN %(system_classes)s
-            AND re.openatlas_class_name IN %(system_classes)s;
-        """,
-        {'system_classes': tuple(system_classes)})
-    return [dict(row) for row in g.cursor.fetchall()]
-
-
-def get_links_by_id_network(ids: list[int]) -> list[dict[str, Any]]:
-    g.cursor.execute(
-        """
-        SELECT
-            l.id,
-            l.property_code,
-            l.domain_id,
-            de.name AS domain_name,
-            de.openatlas_class_name AS domain_system_class,
-            l.range_id,
-            re.name AS range_name,
-            re.openatlas_class_name AS range_system_class,
-            l.description,
-            l.type_id
-        FROM model.link l
-        JOIN model.entity de ON l.domain_id = de.id
-        JOIN model.entity re ON l.range_id = re.id
-        WHERE l.range_id IN %(ids)s OR l.domain_id IN %(ids)s;
-        """,
-        {'ids': tuple(ids)})
-    return [dict(row) for row in g.cursor.fetchall()]
@@ -14,41 +14,123 @@ def get_ego_network(ids: set[int]) -> list[dict[str, Any]]:
     return list(g.cursor)
 
 
-def get_edges(
-        classes: list[str],
-        properties: list[str]) -> list[dict[Any, int]]:
+def get_entities_by_ids(ids: set[int]) -> list[dict[str, Any]]:
     g.cursor.execute(
         """
-        SELECT l.id, l.domain_id, l.range_id
+        SELECT id, name, openatlas_class_name
+        FROM model.entity
+        WHERE id IN %(ids)s;
+        """,
+        {'ids': tuple(ids)})
+    return list(g.cursor)
+
+
+def get_entities(
+        classes: list[str],
+        ids: tuple[int, ...] = ()) -> list[dict[str, Any]]:
+    g.cursor.execute(
+        f"""
+        SELECT id, name, openatlas_class_name
+        FROM model.entity
+        WHERE openatlas_class_name IN %(classes)s
+            {'AND id IN %(ids)s' if ids else ''};
+        """,
+        {'classes': tuple(classes), 'ids': ids})
+    return list(g.cursor)
+
+
+def get_links(
+        classes: list[str],
+        properties: list[str],
+        ids: tuple[int, ...] = (),
+        entity_ids: tuple[int, ...] = ()) -> list[dict[str, Any]]:
+    clause = ''
+    if ids or entity_ids:
+        clause = """
+            AND (
+                l.id IN %(ids)s
+                OR l.domain_id IN %(entity_ids)s
+                OR l.range_id IN %(entity_ids)s)"""
+    g.cursor.execute(
+        f"""
+        SELECT l.id, l.domain_id, l.property_code, l.range_id
         FROM model.link l
-        JOIN model.entity e ON l.domain_id = e.id
-            AND e.openatlas_class_name IN %(classes)s
-        JOIN model.entity e2 ON l.range_id = e2.id
-            AND e2.openatlas_class_name IN %(classes)s
-        WHERE property_code IN %(properties)s;
+        JOIN model.entity d ON l.domain_id = d.id
+            AND d.openatlas_class_name IN %(classes)s
+        JOIN model.entity r ON l.range_id = r.id
+            AND r.openatlas_class_name IN %(classes)s
+        WHERE l.property_code IN %(properties)s {clause};
+        """,
+        {
+            'classes': tuple(classes),
+            'properties': tuple(properties),
+            'ids': ids or (0,),
+            'entity_ids': entity_ids or (0,)})
+    return list(g.cursor)
+
+
+def get_horizon() -> str:
+    # Transactions with a lower id are finished, changes of them are visible
+    g.cursor.execute(
+        "SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS horizon;")
+    return g.cursor.fetchone()['horizon']
+
+
+def get_changes(horizon: str) -> list[dict[str, Any]]:
+    g.cursor.execute(
+        """
+        SELECT DISTINCT entity_id, link_id
+        FROM web.network_change
+        WHERE transaction_id >= %(horizon)s::xid8;
         """,
-        {'classes': tuple(classes), 'properties': tuple(properties)})
+        {'horizon': horizon})
     return list(g.cursor)
 
 
-def get_entities(classes: list[str]) -> list[dict[str, Any]]:
+def delete_changes() -> None:
     g.cursor.execute(
         """
-        SELECT e.id, e.name, e.openatlas_class_name
-        FROM model.entity e
-        WHERE openatlas_class_name IN %(classes)s;
+        DELETE FROM web.network_change
+        WHERE created < now() - interval '1 day';
+        """)
+
+
+def get_all_links(classes: list[str]) -> list[dict[str, Any]]:
+    g.cursor.execute(
+        """
+        SELECT
+            l.domain_id,
+            d.name AS domain_name,
+            d.openatlas_class_name AS domain_class,
+            l.property_code,
+            l.range_id,
+            r.name AS range_name,
+            r.openatlas_class_name AS range_class
+        FROM model.link l
+        JOIN model.entity d ON l.domain_id = d.id
+            AND d.openatlas_class_name IN %(classes)s
+        JOIN model.entity r ON l.range_id = r.id
+            AND r.openatlas_class_name IN %(classes)s;
         """,
         {'classes': tuple(classes)})
     return list(g.cursor)
 
 
-def get_object_mapping() -> dict[int, int]:
+def get_all_links_by_ids(ids: set[int]) -> list[dict[str, Any]]:
     g.cursor.execute(
         """
-        SELECT e.id, l.range_id
-        FROM model.entity e
-        JOIN model.link l ON e.id = l.domain_id AND l.property_code = 'P53'
-        JOIN model.entity e2 ON l.range_id = e2.id
-            AND e.openatlas_class_name = 'place';
-        """)
-    return {row['range_id']: row['id'] for row in list(g.cursor)}
+        SELECT
+            l.domain_id,
+            d.name AS domain_name,
+            d.openatlas_class_name AS domain_class,
+            l.property_code,
+            l.range_id,
+            r.name AS range_name,
+            r.openatlas_class_name AS range_class
+        FROM model.link l
+        JOIN model.entity d ON l.domain_id = d.id
+        JOIN model.entity r ON l.range_id = r.id
+        WHERE l.domain_id IN %(ids)s OR l.range_id IN %(ids)s;
+        """,
+        {'ids': tuple(ids)})
+    return list(g.cursor)
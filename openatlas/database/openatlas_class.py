@@ -2,18 +2,21 @@ from typing import Any
 
 from flask import g
 
+from openatlas.database.cache import metadata_rows
+
 
 def get_class_count() -> dict[str, int]:
     g.cursor.execute(
         """
-        SELECT oc.name, COUNT(e.id) AS count
+        SELECT oc.name, COALESCE(SUM(c.count), 0) AS count
         FROM model.openatlas_class oc
-        LEFT JOIN model.entity e ON oc.name = e.openatlas_class_name
+        LEFT JOIN model.class_count c ON oc.name = c.openatlas_class_name
         GROUP BY oc.name;
         """)
     return {row['name']: row['count'] for row in list(g.cursor)}
 
 
+@metadata_rows
 def get_classes() -> list[dict[str, Any]]:
     g.cursor.execute(
         """
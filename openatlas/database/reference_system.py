@@ -2,7 +2,10 @@ from typing import Any
 
 from flask import g
 
+from openatlas.database.cache import metadata_rows
 
+
+@metadata_rows
 def get_all() -> list[dict[str, Any]]:
     g.cursor.execute(
         """
@@ -17,15 +20,12 @@ def get_all() -> list[dict[str, Any]]:
             rs.resolver_url,
             rs.identifier_example,
             rs.system,
-            COUNT(l.id) AS count,
             array_to_json(
                 array_agg((t.range_id, t.description))
                     FILTER (WHERE t.range_id IS NOT NULL)
             ) AS types
         FROM model.entity e
         JOIN web.reference_system rs ON e.id = rs.entity_id
-        LEFT JOIN model.link l ON e.id = l.domain_id
-            AND l.property_code = 'P67'
         LEFT JOIN model.link t ON e.id = t.domain_id
             AND t.property_code = 'P2'
         GROUP BY
@@ -45,6 +45,18 @@ def get_all() -> list[dict[str, Any]]:
     return list(g.cursor)
 
 
+def get_counts() -> dict[int, int]:
+    g.cursor.execute(
+        """
+        SELECT l.domain_id AS id, COUNT(*) AS count
+        FROM model.link l
+        JOIN web.reference_system rs ON l.domain_id = rs.entity_id
+            AND l.property_code = 'P67'
+        GROUP BY l.domain_id;
+        """)
+    return {row['id']: row['count'] for row in list(g.cursor)}
+
+
 def add_classes(entity_id: int, class_names: list[str]) -> None:
     for name in class_names:
         g.cursor.execute(
@@ -2,9 +2,13 @@ from typing import Any
 
 from flask import g
 
+from openatlas.database.cache import metadata_rows
 
-def get_types(with_count: bool) -> list[dict[str, Any]]:
-    sql = f"""
+
+@metadata_rows
+def get_types() -> list[dict[str, Any]]:
+    g.cursor.execute(
+        """
         SELECT
             e.id,
             e.name,
@@ -14,16 +18,10 @@ def get_types(with_count: bool) -> list[dict[str, Any]]:
             e.created,
             e.modified,
             es.id AS super_id,
-            {'COUNT(l2.id)' if with_count else '0'} AS count,
-            {'COUNT(l3.id)' if with_count else '0'} AS count_property,
-            COALESCE(to_char(e.begin_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_from,
-            COALESCE(to_char(e.begin_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS begin_to,
-            COALESCE(to_char(e.end_from, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_from,
-            COALESCE(to_char(e.end_to, 'yyyy-mm-dd hh24:mi:ss BC'), '')
-                AS end_to,
+            EXTRACT(EPOCH FROM e.begin_from)::bigint AS begin_from,
+            EXTRACT(EPOCH FROM e.begin_to)::bigint AS begin_to,
+            EXTRACT(EPOCH FROM e.end_from)::bigint AS end_from,
+            EXTRACT(EPOCH FROM e.end_to)::bigint AS end_to,
             e.begin_comment,
             e.end_comment,
             tns.entity_id AS non_selectable
@@ -37,24 +35,22 @@ def get_types(with_count: bool) -> list[dict[str, Any]]:
         LEFT JOIN model.link l ON e.id = l.domain_id
             AND l.property_code IN ('P127', 'P89')
         LEFT JOIN model.entity es ON l.range_id = es.id
-        """
-    if with_count:
-        sql += """
-            -- Get count
-            LEFT JOIN model.link l2 ON e.id = l2.range_id
-                AND l2.property_code IN ('P2', 'P89')
-            LEFT JOIN model.link l3 ON e.id = l3.type_id
-            """
-    sql += """
         WHERE e.openatlas_class_name
             IN ('administrative_unit', 'type', 'type_tools')
-        GROUP BY e.id, es.id, tns.entity_id
         ORDER BY e.name;
-        """
-    g.cursor.execute(sql)
+        """)
     return list(g.cursor)
 
 
+def get_counts() -> dict[int, int]:
+    g.cursor.execute(
+        'SELECT type_id, count, count_property FROM model.type_count;')
+    return {
+        row['type_id']: row['count'] or row['count_property']
+        for row in list(g.cursor)}
+
+
+@metadata_rows
 def get_hierarchies() -> list[dict[str, Any]]:
     g.cursor.execute(
         """
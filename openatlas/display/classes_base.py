@@ -46,7 +46,7 @@ class BaseDisplay:
         self.add_crumbs()
         self.add_buttons()
         if self.linked_places:
-            self.gis_data = Gis.get_all(self.linked_places)
+            self.gis_data = Gis.get_all(self.linked_places, places=False)
         self.add_info_tab_content()  # Call later because of profile image
 
     def add_tabs(self) -> None:
@@ -452,7 +452,10 @@ class PlaceBaseDisplay(BaseDisplay):
                 name = 'artifact' if item.class_.view == 'artifact' \
                     else item.class_.name
                 self.tabs[name].table.rows.append(get_base_table_data(item))
-        self.gis_data = Gis.get_all([entity], self.structure)
+        self.gis_data = Gis.get_all(
+            [entity],
+            self.structure,
+            places=False)
         if self.gis_data['gisPointSelected'] == '[]' \
                 and self.gis_data['gisPolygonSelected'] == '[]' \
                 and self.gis_data['gisLineSelected'] == '[]' \
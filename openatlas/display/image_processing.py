@@ -1,26 +1,45 @@
+import multiprocessing
+import time
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Iterable, Optional
 
 from flask import g
 from wand.image import Image
 
 from openatlas import app
 from openatlas.models.entity import Entity
+from openatlas.models.file_registry import get_registry
+from openatlas.models.job import Job, task
+
+RESIZE_PARALLEL_MIN = 20  # Resize images in parallel from this count on
 
 
 def resize_image(filename: str) -> None:
     file_format = '.' + filename.split('.', 1)[1].lower()
     if file_format in g.display_file_ext:
-        for size in app.config['IMAGE_SIZE'].values():
-            safe_resize_image(
-                filename.rsplit('.', 1)[0].lower(),
-                file_format, size)
+        safe_resize_image(
+            filename.rsplit('.', 1)[0].lower(),
+            file_format,
+            list(app.config['IMAGE_SIZE'].values()))
 
 
-def safe_resize_image(name: str, file_format: str, size: str) -> bool:
+def safe_resize_image(
+        name: str,
+        file_format: str,
+        size: str | list[str]) -> bool:
+    sizes = [size] if isinstance(size, str) else size
     try:
-        if check_if_folder_exist(size, app.config['RESIZED_IMAGES']):
-            return image_resizing(name, file_format, size)
-        return False  # pragma: no cover
+        for size_ in sizes:
+            if not check_if_folder_exist(size_, app.config['RESIZED_IMAGES']):
+                return False  # pragma: no cover
+        for path in image_resizing(
+                Path(app.config['UPLOAD_PATH']) / f'{name}{file_format}',
+                Path(app.config['RESIZED_IMAGES']),
+                sizes,
+                get_resized_ext(file_format)):
+            get_registry(path.parent).add(path)
+        return True
     except OSError as e:  # pragma: no cover
         g.logger.log(
             'info',
@@ -30,18 +49,55 @@ def safe_resize_image(name: str, file_format: str, size: str) -> bool:
         return False
 
 
-def image_resizing(name: str, format_: str, size: str) -> bool:
-    filename = Path(app.config['UPLOAD_PATH']) / f"{name}{format_}[0]"
-    with Image(filename=filename) as src:
-        if format_ in app.config['PROCESSABLE_EXT']:
-            format_ = app.config['PROCESSED_EXT']  # pragma: no cover
-        with src.convert(format_.replace('.', '')) as img:
-            img.transform(resize=f"{size}x{size}>")
-            img.compression_quality = 75
-            img.save(
-                filename=Path(
-                    app.config['RESIZED_IMAGES']) / size / f"{name}{format_}")
-            return True
+def image_resizing(
+        source: Path,
+        target: Path,
+        sizes: list[str],
+        ext: str) -> list[Path]:
+    """Save versions of an image for all sizes in their target folders and
+    return the paths of them. The source is read and decoded only once and
+    versions newer than it are skipped. Doesn't use the request context so
+    it can be run in worker processes too."""
+    mtime = source.stat().st_mtime
+    todo = [
+        (size, target / size / f'{source.stem}{ext}') for size in sizes
+        if not is_up_to_date(target / size / f'{source.stem}{ext}', mtime)]
+    if not todo:
+        return []
+    with Image(filename=f'{source}[0]') as src:
+        for size, path in todo:
+            with src.convert(ext.replace('.', '')) as img:
+                img.transform(resize=f"{size}x{size}>")
+                img.compression_quality = 75
+                img.save(filename=path)
+    return [path for _size, path in todo]
+
+
+def resize_worker(
+        arguments: tuple[Path, Path, list[str], str]) -> list[Path] | str:
+    try:
+        return image_resizing(*arguments)
+    except OSError as e:  # pragma: no cover
+        return f'{arguments[0].name}: {e}'
+
+
+def is_up_to_date(path: Path, mtime: float) -> bool:
+    try:
+        return path.stat().st_mtime >= mtime
+    except OSError:
+        return False
+
+
+def get_resized_ext(file_format: str) -> str:
+    if file_format in app.config['PROCESSABLE_EXT']:
+        return app.config['PROCESSED_EXT']  # pragma: no cover
+    return file_format
+
+
+def get_image_size(path: Path) -> tuple[int, int]:
+    with Image() as img:
+        img.ping(filename=f'{path}[0]')  # Reads only the header
+        return img.width, img.height
 
 
 def check_processed_image(filename: str) -> bool:
@@ -61,15 +117,13 @@ def check_processed_image(filename: str) -> bool:
 
 
 def loop_through_processed_folders(name: str, file_format: str) -> bool:
-    ext = file_format
-    if file_format in app.config['PROCESSABLE_EXT']:
-        ext = app.config['PROCESSED_EXT']  # pragma: no cover
+    ext = get_resized_ext(file_format)
+    missing = []
     for size in app.config['IMAGE_SIZE'].values():
-        path = Path(app.config['RESIZED_IMAGES']) / size / f"{name}{ext}"
-        if not path.is_file() \
-                and not safe_resize_image(name, file_format, size):
-            return False  # pragma: no cover
-    return True
+        path = Path(app.config['RESIZED_IMAGES']) / size
+        if get_registry(path).files.get(int(name)) != path / f"{name}{ext}":
+            missing.append(size)
+    return not missing or safe_resize_image(name, file_format, missing)
 
 
 def check_if_folder_exist(folder: str, path: str) -> bool:
@@ -95,7 +149,44 @@ def delete_orphaned_resized_images() -> None:
                 file.unlink()  # pragma: no cover
 
 
-def create_resized_images() -> None:
-    for e in Entity.get_by_class('file'):
-        if e.id in g.files and e.get_file_ext() in g.display_file_ext:
-            resize_image(f"{e.id}{e.get_file_ext()}")
+@task('resize_images')
+def create_resized_images(job: Optional[Job] = None) -> None:
+    sizes = list(app.config['IMAGE_SIZE'].values())
+    for size in sizes:
+        check_if_folder_exist(size, app.config['RESIZED_IMAGES'])
+    arguments = [
+        (
+            Path(app.config['UPLOAD_PATH']) / f'{e.id}{e.get_file_ext()}',
+            Path(app.config['RESIZED_IMAGES']),
+            sizes,
+            get_resized_ext(e.get_file_ext()))
+        for e in Entity.get_by_class('file')
+        if e.id in g.files and e.get_file_ext() in g.display_file_ext]
+    start = time.time()
+    count = 0
+    results: Iterable[list[Path] | str]
+    with ExitStack() as stack:
+        if len(arguments) >= RESIZE_PARALLEL_MIN:  # pragma: no cover
+            pool = stack.enter_context(
+                multiprocessing.get_context('fork').Pool())
+            results = pool.imap_unordered(resize_worker, arguments)
+        else:
+            results = map(resize_worker, arguments)
+        for i, result in enumerate(results, 1):
+            if isinstance(result, str):  # pragma: no cover
+                g.logger.log(
+                    'info',
+                    'image processing',
+                    'failed to save resized image',
+                    result)
+            else:
+                for path in result:
+                    get_registry(path.parent).add(path)
+                count += len(result)
+            if job:
+                job.set_progress(i, len(arguments))
+    if job:
+        seconds = time.time() - start
+        job.result = \
+            f'{count} images in {seconds:.1f}s' \
+            f' ({count / seconds if seconds else count:.1f}/s)'
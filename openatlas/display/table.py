@@ -22,29 +22,38 @@ class Table:
             rows: Optional[list[Any]] = None,
             order: Optional[list[list[int | str]]] = None,
             defs: Optional[list[dict[str, Any]]] = None,
-            paging: bool = True) -> None:
+            paging: bool = True,
+            ajax: Optional[str] = None) -> None:
         self.header = header or []
         self.rows = rows or []
         self.paging = paging
         self.order = order or ''
         self.defs = defs or []
+        self.ajax = ajax  # URL for server side processing, rows not used
 
     def display(self, name: str = 'default') -> str:
-        if not self.rows:
+        if not self.rows and not self.ajax:
             return '<p class="uc-first">' + _('no entries') + '</p>'
         data = {
-            'data': self.rows,
             'stateSave': 'true',
             'columns': [{
                     'title': uc_first(_(name)) if name else '',
                     'className': 'dt-body-right'
                     if name in ['count', 'size'] else ''}
-                for name in self.header] + [
-                {'title': '', 'className': ''}
-                for _item in range(len(self.rows[0]) - len(self.header))],
+                for name in self.header],
             'paging': self.paging,
             'pageLength': current_user.settings['table_rows'],
             'autoWidth': 'false'}
+        if self.ajax:
+            data['serverSide'] = True
+            data['processing'] = True
+            data['searchDelay'] = 500
+            data['ajax'] = self.ajax
+        else:
+            data['data'] = self.rows
+            data['columns'] += [
+                {'title': '', 'className': ''}
+                for _item in range(len(self.rows[0]) - len(self.header))]
         if self.order:
             data['order'] = self.order
         if self.defs:
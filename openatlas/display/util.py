@@ -19,7 +19,8 @@ from werkzeug.utils import redirect
 from werkzeug.wrappers import Response
 
 from openatlas import app
-from openatlas.display.image_processing import check_processed_image
+from openatlas.display.image_processing import (
+    check_processed_image, get_image_size)
 from openatlas.display.util2 import (
     format_date, is_authorized, sanitize, uc_first)
 from openatlas.models.annotation import AnnotationText
@@ -27,6 +28,9 @@ from openatlas.models.cidoc_class import CidocClass
 from openatlas.models.cidoc_property import CidocProperty
 from openatlas.models.content import get_translation
 from openatlas.models.entity import Entity, Link
+from openatlas.models.file_registry import get_registry
+from openatlas.models.iiif import (
+    IiifConversion, delete_image_info, set_image_info)
 from openatlas.models.imports import Project
 from openatlas.models.user import User
 
@@ -458,7 +462,8 @@ def get_file_path(
         if ext in app.config['PROCESSABLE_EXT']:
             ext = app.config['PROCESSED_EXT']  # pragma: no cover
         path = app.config['RESIZED_IMAGES'] / size / f"{id_}{ext}"
-        return path if os.path.exists(path) else None
+        registry = get_registry(app.config['RESIZED_IMAGES'] / size)
+        return path if registry.files.get(id_) == path else None
     return app.config['UPLOAD_PATH'] / f"{id_}{ext}"
 
 
@@ -611,7 +616,8 @@ def check_iiif_activation() -> bool:
 
 def check_iiif_file_exist(id_: int) -> bool:
     if g.settings['iiif_conversion']:
-        return get_iiif_file_path(id_).is_file()
+        path = get_iiif_file_path(id_)
+        return get_registry(path.parent).files.get(id_) == path
     return bool(get_file_path(id_))  # pragma: no cover
 
 
@@ -620,30 +626,79 @@ def get_iiif_file_path(id_: int) -> Path:
     return Path(g.settings['iiif_path']) / f'{id_}{ext}'
 
 
+def get_iiif_url(id_: int) -> str:
+    ext = '.tiff' if g.settings['iiif_conversion'] else g.files[id_].suffix
+    return f"{g.settings['iiif_url']}{id_}{ext}"
+
+
 def delete_iiif_image(id_: int) -> None:
-    get_iiif_file_path(id_).unlink(missing_ok=True)
+    path = get_iiif_file_path(id_)
+    path.unlink(missing_ok=True)
+    get_registry(path.parent).remove(id_)
+    IiifConversion.delete(id_)
+    delete_image_info(id_)
+
+
+def update_iiif_info(id_: int) -> None:
+    # Cached image info is outdated after a conversion. With
+    # IIIF_INFO_FROM_FILE it is taken from the converted file instead of
+    # asking the image server later.
+    delete_image_info(id_)
+    if app.config['IIIF_INFO_FROM_FILE']:
+        set_image_info(
+            id_,
+            get_iiif_url(id_),
+            *get_image_size(get_iiif_file_path(id_)))
 
 
 def convert_image_to_iiif(id_: int, path: Optional[Path] = None) -> bool:
-    command: list[Any] = ["vips" if os.name == 'posix' else "vips.exe"]
-    command.extend([
-        'tiffsave',
+    target = get_iiif_file_path(id_)
+    error = run_iiif_conversion(
         path or get_file_path(id_),
-        get_iiif_file_path(id_),
+        target,
+        g.settings['iiif_conversion'])
+    IiifConversion.log(id_, error)
+    if error:  # pragma: no cover
+        g.logger.log('info', 'file', f'IIIF conversion failed: {id_}', error)
+        return False
+    get_registry(target.parent).add(target)
+    update_iiif_info(id_)
+    return True
+
+
+def run_iiif_conversion(
+        source: Optional[Path],
+        target: Path,
+        compression: str) -> Optional[str]:
+    """Convert an image to a tiled pyramid TIFF with vips and return an
+    error message if it failed. It is written to a temporary file first so
+    that an interrupted conversion leaves no broken target. Doesn't use the
+    request context so it can be run in threads."""
+    part = target.with_name(f'{target.stem}.part{target.suffix}')
+    command: list[Any] = [
+        "vips" if os.name == 'posix' else "vips.exe",
+        'tiffsave',
+        source,
+        part,
         '--tile',
         '--pyramid',
         '--compression',
-        g.settings['iiif_conversion'],
+        compression,
         '--tile-width',
         '128',
         '--tile-height',
-        '128'])
+        '128']
     try:
-        with subprocess.Popen(command) as sub_process:
-            sub_process.wait()
-    except Exception:  # pragma: no cover
-        return False
-    return True
+        result = subprocess.run(command, capture_output=True, check=False)
+    except (OSError, subprocess.SubprocessError) as e:  # pragma: no cover
+        part.unlink(missing_ok=True)
+        return str(e)
+    if result.returncode:
+        part.unlink(missing_ok=True)
+        return result.stderr.decode(errors='replace').strip() \
+            or f'vips exit code {result.returncode}'
+    os.replace(part, target)
+    return None
 
 
 def display_annotation_text_links(source: Entity) -> str:
@@ -6,13 +6,14 @@ import re
 from datetime import datetime, timedelta
 from html.parser import HTMLParser
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 
 import numpy
 from flask import g
 from flask_babel import lazy_gettext as _
 from flask_login import current_user
 from jinja2 import pass_context
+from numpy.typing import NDArray
 
 from openatlas import app
 
@@ -56,15 +57,11 @@ def convert_size(size_bytes: int) -> str:
 
 
 def format_date_part(date: numpy.datetime64, part: str) -> str:
-    string = str(date).split(' ', maxsplit=1)[0]
-    bc = False
-    if string.startswith('-') or string.startswith('0000'):
-        bc = True
-        string = string[1:]
-    string = string.replace('T', '-').replace(':', '-')
-    parts = string.split('-')
-    if part == 'year':  # If it's a negative year, add one year
-        return f'-{int(parts[0]) + 1}' if bc else f'{int(parts[0])}'
+    if part == 'year':  # Astronomical year 0 is displayed as 1 BC
+        year = int(date.astype('datetime64[Y]').astype(numpy.int64)) + 1970
+        return str(year) if year > 0 else str(year - 1)
+    string = str(date).split(' ', maxsplit=1)[0].lstrip('-')
+    parts = string.replace('T', '-').replace(':', '-').split('-')
     if part == 'month':
         return parts[1]
     if part == 'hour':
@@ -76,15 +73,32 @@ def format_date_part(date: numpy.datetime64, part: str) -> str:
     return parts[2]
 
 
-def timestamp_to_datetime64(string: str) -> Optional[numpy.datetime64]:
-    if not string:
-        return None
-    string_list = string.split(' ')
-    if 'BC' in string_list:
-        parts = string_list[0].split('-')
-        date = f'-{int(parts[0]) - 1}-{parts[1]}-{parts[2]}T{string_list[1]}'
-        return numpy.datetime64(date)
-    return numpy.datetime64(f'{string_list[0]}T{string_list[1]}')
+def epoch_to_datetime64(
+        seconds: Iterable[Optional[int]]) -> list[Optional[numpy.datetime64]]:
+    """Convert a column of seconds since 1970, as selected with
+    EXTRACT(EPOCH FROM ...), in one call. PostgreSQL and NumPy both count
+    years astronomically (1 BC is year 0) so no BC offset is needed here."""
+    seconds = list(seconds)
+    if len(seconds) < 64:  # Setting up arrays costs more for a few dates
+        return [
+            None if value is None else numpy.datetime64(value, 's')
+            for value in seconds]
+    values = numpy.array(seconds, dtype=numpy.float64)  # None -> nan
+    missing = numpy.isnan(values)
+    dates = numpy.where(missing, 0, values).astype(numpy.int64) \
+        .astype('datetime64[s]')
+    return [None if empty else date for date, empty in zip(dates, missing)]
+
+
+def datetime64_to_epoch(
+        dates: Iterable[Optional[numpy.datetime64]]) -> NDArray[numpy.float64]:
+    """Seconds since 1970 as float array with nan for missing dates"""
+    values = numpy.array(
+        [numpy.datetime64('NaT') if date is None else date for date in dates],
+        dtype='datetime64[s]')
+    result = values.astype(numpy.int64).astype(numpy.float64)
+    result[numpy.isnat(values)] = numpy.nan
+    return result
 
 
 def datetime64_to_timestamp(date: Optional[numpy.datetime64]) -> Optional[str]:
@@ -3,8 +3,9 @@ from __future__ import annotations
 import ast
 from typing import Any, Optional
 
-from flask import g, render_template, request
+from flask import g, render_template, request, url_for
 from flask_babel import lazy_gettext as _
+from flask_login import current_user
 from flask_wtf import FlaskForm
 from markupsafe import Markup
 from wtforms import (
@@ -19,6 +20,7 @@ from openatlas.display.util import get_base_table_data
 from openatlas.display.util2 import is_authorized
 from openatlas.forms.util import string_to_entity_list
 from openatlas.models.entity import Entity
+from openatlas.models.openatlas_class import OpenatlasClass
 from openatlas.models.type import Type
 
 
@@ -159,10 +161,17 @@ class TableMultiSelect(HiddenInput):
         if field.selection:
             field.data = [e.id for e in field.selection]
             field.data_list = sorted([e.name for e in field.selection])
-        field.table = table_multi(
-            field.entities,
-            field.selection,
-            field.filter_ids)
+        if field.classes and is_server_side(field.classes):
+            field.table = Table(
+                [''] + g.table_headers[g.classes[field.classes[0]].view],
+                order=[[1, 'asc']],
+                defs=[{'orderable': False, 'targets': 0}],
+                ajax=get_ajax_url(field, True))
+        else:
+            field.table = table_multi(
+                field.entities or get_table_entities(field.classes),
+                field.selection,
+                field.filter_ids)
         return super().__call__(field, **kwargs) + Markup(
             render_template('forms/table_multi_select.html', field=field))
 
@@ -172,13 +181,15 @@ class TableMultiField(HiddenField):
 
     def __init__(
             self,
-            entities: list[Entity],
+            entities: Optional[list[Entity]] = None,
             selection: Optional[list[Entity]] = None,
             filter_ids: Optional[list[int]] = None,
             description: Optional[str] = None,
+            classes: Optional[list[str]] = None,
             **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.entities = entities
+        self.entities = entities or []
+        self.classes = classes or []  # Entities are loaded when rendered
         self.selection = selection or []
         self.filter_ids = filter_ids or []
         self.description = description
@@ -196,15 +207,48 @@ def table_multi(
         order=[[0, 'desc'], [1, 'asc']],
         defs=[{'orderDataType': 'dom-checkbox', 'targets': 0}])
     for e in [e for e in entities if e.id not in filter_ids]:
-        row = get_base_table_data(e, show_links=False)
-        row.insert(
-            0,
-            f'<input type="checkbox" value="{e.name}" id="{e.id}" '
-            f'{" checked" if e.id in selection_ids else ""}>')
-        table_.rows.append(row)
+        table_.rows.append(table_multi_row(e, e.id in selection_ids))
     return table_
 
 
+def table_multi_row(entity: Entity, checked: bool = False) -> list[Any]:
+    row = get_base_table_data(entity, show_links=False)
+    row.insert(
+        0,
+        f'<input type="checkbox" value="{entity.name}" id="{entity.id}" '
+        f'{" checked" if checked else ""}>')
+    return row
+
+
+def is_server_side(classes: list[str]) -> bool:
+    return bool(
+        app.config['TABLE_SERVER_SIDE_ROWS']
+        and OpenatlasClass.get_entity_count(classes)
+        > app.config['TABLE_SERVER_SIDE_ROWS'])
+
+
+def get_ajax_url(field: TableField | TableMultiField, multiple: bool) -> str:
+    return url_for(
+        'ajax_table',
+        field_id=field.id,
+        classes=','.join(field.classes),
+        exclude=','.join(str(id_) for id_ in field.filter_ids),
+        multiple=int(multiple))
+
+
+def get_table_entities(classes: list[str]) -> list[Entity]:
+    """Entities of classes for form tables, loaded once per request, e.g. for
+    the place fields of actor forms."""
+    key = ','.join(classes)
+    entities = g.setdefault('table_entities', {'': []})
+    if key not in entities:
+        entities[key] = Entity.get_by_class(
+            classes,
+            types=True,
+            aliases=current_user.settings['table_show_aliases'])
+    return entities[key]
+
+
 class ValueFloatField(FloatField):
     pass
 
@@ -276,8 +320,15 @@ class TableSelect(HiddenInput):
             field.data_string = field.selection.name
         if field.id == 'entity':
             field.table = table_annotation(field.entities)
+        elif field.classes and is_server_side(field.classes):
+            field.table = Table(
+                g.table_headers[field.classes[0]],
+                ajax=get_ajax_url(field, False))
         else:
-            field.table = table(field.id, field.entities, field.filter_ids)
+            field.table = table(
+                field.id,
+                field.entities or get_table_entities(field.classes),
+                field.filter_ids)
         return super().__call__(field, **kwargs) + Markup(
             render_template('forms/table_select.html', field=field))
 
@@ -287,14 +338,16 @@ class TableField(HiddenField):
 
     def __init__(
             self,
-            entities: list[Entity],
+            entities: Optional[list[Entity]] = None,
             selection: Optional[Entity] = None,
             filter_ids: Optional[list[int]] = None,
             validators: Optional[Any] = None,
             add_dynamic: Optional[list[str]] = None,
+            classes: Optional[list[str]] = None,
             **kwargs: Any) -> None:
         super().__init__(validators=validators, **kwargs)
-        self.entities = entities
+        self.entities = entities or []
+        self.classes = classes or []  # Entities are loaded when rendered
         self.selection = selection
         self.filter_ids = filter_ids or []
         self.add_dynamical = \
@@ -333,12 +386,16 @@ def table(
     table_ = Table(
         g.table_headers[entities[0].class_.name if entities else 'place'])
     for e in [e for e in entities if not filter_ids or e.id not in filter_ids]:
-        data = get_base_table_data(e, show_links=False)
-        data[0] = format_name_and_aliases(e, table_id)
-        table_.rows.append(data)
+        table_.rows.append(table_row(e, table_id))
     return table_
 
 
+def table_row(entity: Entity, field_id: str) -> list[Any]:
+    data = get_base_table_data(entity, show_links=False)
+    data[0] = format_name_and_aliases(entity, field_id)
+    return data
+
+
 def table_annotation(entities: list[Entity]) -> Table:
     table_ = Table(['name', 'class', 'description'])
     for item in entities:
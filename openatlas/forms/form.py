@@ -4,7 +4,6 @@ from typing import Any, Optional, TYPE_CHECKING
 
 from flask import g, render_template, request
 from flask_babel import lazy_gettext as _
-from flask_login import current_user
 from flask_wtf import FlaskForm
 from wtforms import HiddenField, SelectMultipleField, StringField, widgets
 from wtforms.fields.simple import TextAreaField
@@ -51,11 +50,8 @@ def get_add_reference_form(class_: str) -> Any:
         Form,
         class_,
         TableMultiField(
-            Entity.get_by_view(
-                class_,
-                types=True,
-                aliases=current_user.settings['table_show_aliases']),
-            validators=[InputRequired()]))
+            validators=[InputRequired()],
+            classes=g.view_class_mapping[class_]))
     setattr(Form, 'page', StringField(_('page')))
     setattr(Form, 'save', SubmitField(_('insert')))
     return Form()
@@ -32,11 +32,11 @@ class AcquisitionManager(EventBaseManager):
                     else 'place'].append(entity)
         fields = super().additional_fields()
         fields['given_place'] = TableMultiField(
-            self.table_items['place'],
-            data['place'])
+            selection=data['place'],
+            classes=['place'])
         fields['given_artifact'] = TableMultiField(
-            Entity.get_by_class('artifact', True),
-            data['artifact'])
+            selection=data['artifact'],
+            classes=['artifact'])
         return fields
 
     def process_form(self) -> None:
@@ -54,17 +54,17 @@ class ActorFunctionManager(BaseManager):
             return {}
         if 'membership' in request.url:
             field_name = 'group'
-            entities = Entity.get_by_class('group', aliases=self.aliases)
+            classes = ['group']
         else:
             field_name = 'actor'
-            entities = Entity.get_by_view('actor', aliases=self.aliases)
+            classes = g.view_class_mapping['actor']
         return {
             'member_origin_id': HiddenField(),
             field_name:
                 TableMultiField(
-                    entities,
                     filter_ids=[self.origin.id],
-                    validators=[InputRequired()])}
+                    validators=[InputRequired()],
+                    classes=classes)}
 
     def populate_insert(self) -> None:
         self.form.member_origin_id.data = self.origin.id
@@ -97,9 +97,9 @@ class ActorRelationManager(BaseManager):
         fields = {}
         if not self.link_:
             fields['actor'] = TableMultiField(
-                Entity.get_by_class('person', aliases=self.aliases),
                 filter_ids=[self.origin.id],
-                validators=[InputRequired()])
+                validators=[InputRequired()],
+                classes=['person'])
             fields['relation_origin_id'] = HiddenField()
         return fields
 
@@ -164,13 +164,10 @@ class ArtifactManager(ArtifactBaseManager):
             selection = self.entity.get_linked_entity('P46', inverse=True)
         return super().additional_fields() | {
             'super': TableField(
-                Entity.get_by_class(
-                    g.view_class_mapping['place'] + ['artifact'],
-                    types=True,
-                    aliases=self.aliases),
-                selection,
-                filter_ids,
-                add_dynamic=['place'])}
+                selection=selection,
+                filter_ids=filter_ids,
+                add_dynamic=['place'],
+                classes=g.view_class_mapping['place'] + ['artifact'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -192,7 +189,7 @@ class CreationManager(EventBaseManager):
             selection = self.entity.get_linked_entities('P94', sort=True)
         return super().additional_fields() | {
             'document':
-                TableMultiField(Entity.get_by_class('file'), selection)}
+                TableMultiField(selection=selection, classes=['file'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -242,10 +239,10 @@ class FeatureManager(PlaceBaseManager):
         return super().additional_fields() | {
             'super':
                 TableField(
-                    Entity.get_by_class('place', True, self.aliases),
-                    selection,
+                    selection=selection,
                     validators=[InputRequired()],
-                    add_dynamic=['place'])}
+                    add_dynamic=['place'],
+                    classes=['place'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -297,13 +294,10 @@ class HumanRemainsManager(ArtifactBaseManager):
             selection = self.entity.get_linked_entity('P46', inverse=True)
         return super().additional_fields() | {
             'super': TableField(
-                Entity.get_by_class(
-                    g.view_class_mapping['place'] + ['human remains'],
-                    types=True,
-                    aliases=self.aliases),
-                selection,
-                filter_ids,
-                add_dynamic=['place'])}
+                selection=selection,
+                filter_ids=filter_ids,
+                add_dynamic=['place'],
+                classes=g.view_class_mapping['place'] + ['human remains'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -336,8 +330,8 @@ class InvolvementManager(BaseManager):
         if self.insert and self.origin:
             class_ = 'actor' if self.origin.class_.view == 'event' else 'event'
             fields[class_] = TableMultiField(
-                Entity.get_by_view(class_, True, self.aliases),
-                validators=[InputRequired()])
+                validators=[InputRequired()],
+                classes=g.view_class_mapping[class_])
         choices = [('P11', g.properties['P11'].name)]
         if event_class_name in [
                 'acquisition', 'activity', 'creation', 'modification',
@@ -398,11 +392,11 @@ class ModificationManager(EventBaseManager):
                     places.append(item)
         return super().additional_fields() | {
             'artifact': TableMultiField(
-                Entity.get_by_class('artifact', True),
-                artifacts),
+                selection=artifacts,
+                classes=['artifact']),
             'modified_place': TableMultiField(
-                self.table_items['place'],
-                places)}
+                selection=places,
+                classes=['place'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -439,19 +433,19 @@ class MoveManager(EventBaseManager):
                 place_from = self.origin
         return super().additional_fields() | {
             'place_from': TableField(
-                self.table_items['place'],
-                place_from,
-                add_dynamic=['place']),
+                selection=place_from,
+                add_dynamic=['place'],
+                classes=['place']),
             'place_to': TableField(
-                self.table_items['place'],
-                place_to,
-                add_dynamic=['place']),
+                selection=place_to,
+                add_dynamic=['place'],
+                classes=['place']),
             'moved_artifact': TableMultiField(
-                Entity.get_by_class('artifact', True),
-                data['artifact']),
+                selection=data['artifact'],
+                classes=['artifact']),
             'moved_person': TableMultiField(
-                Entity.get_by_class('person', aliases=self.aliases),
-                data['person'])}
+                selection=data['person'],
+                classes=['person'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -502,8 +496,8 @@ class ProductionManager(EventBaseManager):
             selection = self.entity.get_linked_entities('P108', sort=True)
         return super().additional_fields() | {
             'artifact': TableMultiField(
-                Entity.get_by_class('artifact', True),
-                selection)}
+                selection=selection,
+                classes=['artifact'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -587,10 +581,10 @@ class SourceManager(SourceBaseManager):
             selection = [self.origin]
         return super().additional_fields() | {
             'artifact': TableMultiField(
-                Entity.get_by_class('artifact', True),
-                selection,
+                selection=selection,
                 description=
-                _('Link artifacts as the information carrier of the source'))}
+                _('Link artifacts as the information carrier of the source'),
+                classes=['artifact'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -650,9 +644,9 @@ class StratigraphicUnitManager(PlaceBaseManager):
             selection = self.origin
         return super().additional_fields() | {
             'super': TableField(
-                Entity.get_by_class('feature', True),
-                selection,
-                validators=[InputRequired()])}
+                selection=selection,
+                validators=[InputRequired()],
+                classes=['feature'])}
 
     def process_form(self) -> None:
         super().process_form()
@@ -53,8 +53,6 @@ class BaseManager:
         self.crumbs: list[Any] = []
         self.insert = bool(not self.entity and not self.link_)
         self.place_info: dict[str, Any] = {}
-        self.aliases = current_user.settings['table_show_aliases']
-        self.table_items: dict[str, list[Entity]] = {}
 
         if self.insert:
             self.get_place_info_for_insert()
@@ -246,8 +244,6 @@ class ActorBaseManager(BaseManager):
         residence = None
         begins_in = None
         ends_in = None
-        self.table_items['place'] = \
-            Entity.get_by_class('place', types=True, aliases=self.aliases)
         if not self.insert:
             if residence := self.entity.get_linked_entity('P74'):
                 residence = residence.get_linked_entity_safe('P53', True)
@@ -257,17 +253,17 @@ class ActorBaseManager(BaseManager):
                 ends_in = last.get_linked_entity_safe('P53', True)
         return {
             'residence': TableField(
-                self.table_items['place'],
-                residence,
-                add_dynamic=['place']),
+                selection=residence,
+                add_dynamic=['place'],
+                classes=['place']),
             'begins_in': TableField(
-                self.table_items['place'],
-                begins_in,
-                add_dynamic=['place']),
+                selection=begins_in,
+                add_dynamic=['place'],
+                classes=['place']),
             'ends_in': TableField(
-                self.table_items['place'],
-                ends_in,
-                add_dynamic=['place'])}
+                selection=ends_in,
+                add_dynamic=['place'],
+                classes=['place'])}
 
     def populate_insert(self) -> None:
         self.form.alias.append_entry('')
@@ -313,11 +309,14 @@ class PlaceBaseManager(BaseManager):
     def get_place_info_for_insert(self) -> None:
         super().get_place_info_for_insert()
         if not self.origin:
-            self.place_info['gis_data'] = Gis.get_all()
+            self.place_info['gis_data'] = Gis.get_all(places=False)
             return
         structure = self.origin.get_structure_for_insert()
         self.place_info['structure'] = structure
-        self.place_info['gis_data'] = Gis.get_all([self.origin], structure)
+        self.place_info['gis_data'] = Gis.get_all(
+            [self.origin],
+            structure,
+            places=False)
         if current_user.settings['module_map_overlay'] \
                 and self.origin.class_.view == 'place':
             self.place_info['overlay'] = Overlay.get_by_object(self.origin)
@@ -326,7 +325,10 @@ class PlaceBaseManager(BaseManager):
         super().get_place_info_for_update()
         structure = self.entity.get_structure()
         self.place_info['structure'] = structure
-        self.place_info['gis_data'] = Gis.get_all([self.entity], structure)
+        self.place_info['gis_data'] = Gis.get_all(
+            [self.entity],
+            structure,
+            places=False)
         if current_user.settings['module_map_overlay']:
             self.place_info['overlays'] = Overlay.get_by_object(self.entity)
         self.place_info['location'] = \
@@ -342,14 +344,12 @@ class ArtifactBaseManager(PlaceBaseManager):
                 and self.origin.class_.view == 'actor' else None
         else:
             owner = self.entity.get_linked_entity('P52')
-        self.table_items['actor'] = \
-            Entity.get_by_view('actor', aliases=self.aliases)
         return {
             'owned_by':
                 TableField(
-                    self.table_items['actor'],
-                    owner,
-                    add_dynamic=['person', 'group'])}
+                    selection=owner,
+                    add_dynamic=['person', 'group'],
+                    classes=g.view_class_mapping['actor'])}
 
     def get_crumbs(self) -> list[Any]:
         crumbs = super().get_crumbs()
@@ -385,28 +385,24 @@ class EventBaseManager(BaseManager):
             if self.class_.name != 'move' \
                     and (place_ := self.entity.get_linked_entity('P7')):
                 place = place_.get_linked_entity_safe('P53', True)
-        self.table_items = {
-            'event_view': Entity.get_by_view('event', True, self.aliases),
-            'place': Entity.get_by_class('place', True, self.aliases)}
-        self.table_items['event_preceding'] = [
-            e for e in self.table_items['event_view']
-            if e.class_.name != 'event']
         fields = {
             'sub_event_of':
                 TableField(
-                    self.table_items['event_view'],
-                    super_event,
-                    filter_ids)}
+                    selection=super_event,
+                    filter_ids=filter_ids,
+                    classes=g.view_class_mapping['event'])}
         if self.class_.name != 'event':
             fields['event_preceding'] = TableField(
-                self.table_items['event_preceding'],
-                event_preceding,
-                filter_ids)
+                selection=event_preceding,
+                filter_ids=filter_ids,
+                classes=[
+                    name for name in g.view_class_mapping['event']
+                    if name != 'event'])
         if self.class_.name != 'move':
             fields['location'] = TableField(
-                self.table_items['place'],
-                place,
-                add_dynamic=['place'])
+                selection=place,
+                add_dynamic=['place'],
+                classes=['place'])
         return fields
 
     def populate_insert(self) -> None:
@@ -128,6 +128,10 @@ class SimilarForm(FlaskForm):
     save = SubmitField(_('search'))
 
 
+class CheckLinksForm(FlaskForm):
+    save = SubmitField(_('check'))
+
+
 class ProfileForm(FlaskForm):
     name = StringField(_('full name'), description=_('tooltip full name'))
     email = StringField(
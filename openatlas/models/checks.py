@@ -1,10 +1,18 @@
+import json
+import multiprocessing
+from collections import defaultdict
 from typing import Any
 
 from flask import g
 from fuzzywuzzy import fuzz
 
 from openatlas.database import checks as db, date
+from openatlas.database.connect import Transaction
 from openatlas.models.entity import Entity
+from openatlas.models.job import Job, task
+
+INVALID_LINKS_PAGE = 1000  # Invalid links shown at once
+SIMILAR_PARALLEL_MIN = 50000  # Compare names in parallel from this count on
 
 
 def single_type_duplicates() -> list[dict[str, Any]]:
@@ -43,36 +51,73 @@ def entities_linked_to_itself() -> list[Entity]:
     return [Entity.get_by_id(row['domain_id']) for row in db.get_circular()]
 
 
-def invalid_cidoc_links() -> list[dict[str, Any]]:
-    invalid_linking = []
-    for row in db.get_cidoc_links():
-        valid_domain = g.properties[row['property_code']].find_object(
-            'domain_class_code',
-            row['domain_code'])
-        valid_range = g.properties[row['property_code']].find_object(
-            'range_class_code',
-            row['range_code'])
-        if not valid_domain or not valid_range:
-            invalid_linking.append(row)
-    invalid_links = []
-    for item in invalid_linking:
-        for row in db.get_invalid_links(item):
-            invalid_links.append({
-                'domain': Entity.get_by_id(row['domain_id']),
-                'property': g.properties[row['property_code']],
-                'range': Entity.get_by_id(row['range_id'])})
-    return invalid_links
-
-
-def similar_named(class_: str, ratio: int) -> dict[int, Any]:
-    similar: dict[int, Any] = {}
+def invalid_cidoc_links(after: int = 0) -> list[dict[str, Any]]:
+    """A page of links found invalid by the last check_links job, ordered
+    by id and starting after the given link id."""
+    return db.get_invalid_links(after, INVALID_LINKS_PAGE)
+
+
+@task('check_links')
+def check_links(job: Job) -> None:
+    """Store links with a domain or range class not valid for their
+    property in web.invalid_link, the count is the job result."""
+    db.refresh_valid_links()
+    count = db.set_invalid_links()
+    job.result = str(count)
+    job.set_progress(count, count)
+
+
+def similar_named(class_: str, ratio: int) -> dict[int, list[int]]:
+    """Group entities with similar names (fuzz.ratio >= ratio)."""
+    matches: dict[int, set[int]] = defaultdict(set)
+    for id_, similar_id in similar_name_pairs(class_, ratio):
+        matches[id_].add(similar_id)
+        matches[similar_id].add(id_)
+    similar: dict[int, list[int]] = {}
     already_added: set[int] = set()
-    entities = Entity.get_by_class(class_)
-    for sample in [e for e in entities if e.id not in already_added]:
-        similar[sample.id] = {'entity': sample, 'entities': []}
-        for e in entities:
-            if e.id != sample.id and fuzz.ratio(sample.name, e.name) >= ratio:
-                already_added.add(sample.id)
-                already_added.add(e.id)
-                similar[sample.id]['entities'].append(e)
-    return {item: data for item, data in similar.items() if data['entities']}
+    for id_ in sorted(matches):
+        if id_ not in already_added:
+            similar[id_] = sorted(matches[id_])
+            already_added.update(matches[id_] | {id_})
+    return similar
+
+
+def similar_name_pairs(class_: str, ratio: int) -> list[tuple[int, int]]:
+    """Id pairs of entities with fuzz.ratio of names >= ratio. Candidate
+    pairs are found with the trigram index of names, only these are compared
+    (in parallel worker processes if there are many)."""
+    # The trigram threshold is lower than the ratio but blocking can still
+    # miss pairs, e.g. "ab" and "ba" or names of punctuation only, which
+    # share no trigrams.
+    candidates = db.get_similar_name_candidates(class_, max(0.1, ratio / 250))
+    pairs = [(row['name'], row['similar_name']) for row in candidates]
+    if len(pairs) > SIMILAR_PARALLEL_MIN:  # pragma: no cover
+        with multiprocessing.get_context('fork').Pool() as pool:
+            ratios = pool.starmap(fuzz.ratio, pairs, chunksize=1000)
+    else:
+        ratios = [fuzz.ratio(*pair) for pair in pairs]
+    return [
+        (row['id'], row['similar_id'])
+        for row, ratio_ in zip(candidates, ratios) if ratio_ >= ratio]
+
+
+@task('check_similar')
+def check_similar_names(job: Job, class_: str, ratio: int) -> None:
+    similar = similar_named(class_, ratio)
+    job.result = json.dumps(similar)
+    job.set_progress(len(similar), len(similar))
+
+
+@task('recount')
+def recount(job: Job) -> None:
+    """Rebuild the class, property and type counts which are otherwise kept
+    up to date by database triggers, e.g. after a restore without them."""
+    Transaction.begin()
+    try:
+        db.recount()
+        Transaction.commit()
+    except Exception:  # pragma: no cover
+        Transaction.rollback()
+        raise
+    g.logger.log('info', 'admin', 'Counts recounted')
+    job.set_progress(1, 1)
@@ -13,10 +13,16 @@ class CidocClass:
         self.name = data['name']
         self.code = data['code']
         self.comment = data['comment']
-        self.count = data['count']
         self.i18n: dict[str, str] = {}
-        self.sub: list[CidocClass] = []
-        self.super: list[CidocClass] = []
+        self.sub: list[str] = []
+        self.super: list[str] = []
+        self.sub_recursive: frozenset[str] = frozenset()
+
+    @property
+    def count(self) -> int:
+        if 'cidoc_class_counts' not in g:  # Counted on demand, once a request
+            g.cidoc_class_counts = db.get_counts()
+        return g.cidoc_class_counts.get(self.code, 0)
 
     @staticmethod
     def get_all(language: str) -> dict[str, CidocClass]:
@@ -24,6 +30,10 @@ class CidocClass:
         for row in db.get_hierarchy():
             classes[row['super_code']].sub.append(row['sub_code'])
             classes[row['sub_code']].super.append(row['super_code'])
+        closure: dict[str, frozenset[str]] = {}
+        for class_ in classes.values():
+            class_.sub_recursive = \
+                get_sub_recursive(classes, class_.code, closure)
         for row in db.get_translations(app.config['LANGUAGES']):
             classes[row['class_code']].i18n[row['language_code']] = row['text']
         for class_ in classes.values():
@@ -32,3 +42,15 @@ class CidocClass:
             elif g.settings['default_language'] in class_.i18n:
                 class_.name = class_.i18n[g.settings['default_language']]
         return classes
+
+
+def get_sub_recursive(
+        classes: dict[str, CidocClass],
+        code: str,
+        closure: dict[str, frozenset[str]]) -> frozenset[str]:
+    """Codes of a class and all classes inheriting from it."""
+    if code not in closure:
+        closure[code] = frozenset({code}).union(
+            *[get_sub_recursive(classes, sub, closure)
+              for sub in classes[code].sub])
+    return closure[code]
@@ -16,34 +16,27 @@ class CidocProperty:
         self.comment = data['comment']
         self.domain_class_code = data['domain_class_code']
         self.range_class_code = data['range_class_code']
-        self.count = data['count']
         self.sub: list[int] = []
         self.super: list[int] = []
         self.i18n: dict[str, str] = {}
         self.i18n_inverse: dict[str, str] = {}
+        self.valid_domains: frozenset[str] = frozenset()
+        self.valid_ranges: frozenset[str] = frozenset()
 
-    def find_object(self, attr: str, class_id: int) -> bool:
-        valid_domain_id = getattr(self, attr)
-        if valid_domain_id == class_id:
-            return True
-        return self.find_subs(
-            attr,
-            class_id,
-            g.cidoc_classes[valid_domain_id].sub)
+    @property
+    def count(self) -> int:
+        if 'property_counts' not in g:  # Counted on demand, once a request
+            g.property_counts = db.get_counts()
+        return g.property_counts.get(self.code, 0)
 
-    def find_subs(
-            self,
-            attr: str,
-            class_id: int,
-            valid_subs: list[int]) -> bool:
-        for sub_id in valid_subs:
-            if sub_id == class_id or \
-                    self.find_subs(
-                        attr,
-                        class_id,
-                        g.cidoc_classes[sub_id].sub):
-                return True
-        return False
+    def find_object(self, attr: str, class_id: str) -> bool:
+        valid = self.valid_domains if attr == 'domain_class_code' \
+            else self.valid_ranges
+        return class_id in valid
+
+    def is_valid(self, domain_code: str, range_code: str) -> bool:
+        return domain_code in self.valid_domains \
+            and range_code in self.valid_ranges
 
     @staticmethod
     def get_all(language: str) -> dict[str, CidocProperty]:
@@ -67,4 +60,8 @@ class CidocProperty:
                 property_.name_inverse = property_.i18n_inverse[language]
             elif default in property_.i18n_inverse:
                 property_.name_inverse = property_.i18n_inverse[default]
+            property_.valid_domains = \
+                g.cidoc_classes[property_.domain_class_code].sub_recursive
+            property_.valid_ranges = \
+                g.cidoc_classes[property_.range_class_code].sub_recursive
         return properties
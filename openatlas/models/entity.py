@@ -5,16 +5,19 @@ import json
 import re
 from typing import Any, Iterable, Optional, TYPE_CHECKING
 
+import numpy
 from flask import g, request
+from numpy.typing import NDArray
 from werkzeug.exceptions import abort
 
 from openatlas import app
 from openatlas.database import (
     date, entity as db, link as db_link, tools as db_tools)
 from openatlas.display.util2 import (
-    convert_size, datetime64_to_timestamp, format_date_part, sanitize,
-    timestamp_to_datetime64)
+    convert_size, datetime64_to_epoch, datetime64_to_timestamp,
+    epoch_to_datetime64, format_date_part, sanitize)
 from openatlas.models.annotation import AnnotationText
+from openatlas.models.file_registry import get_registry
 from openatlas.models.gis import Gis
 from openatlas.models.tools import get_carbon_link
 
@@ -22,7 +25,118 @@ if TYPE_CHECKING:  # pragma: no cover
     from openatlas.models.type import Type
 
 
-class Entity:
+class Dates:
+    """Begin and end dates of entities and links. Dates come as seconds since
+    1970 from the database and are only converted to datetime64 when
+    accessed or, for many items at once, with decode_all()."""
+
+    __slots__ = (
+        '_dates', '_begin_from', '_begin_to', '_end_from', '_end_to',
+        'begin_comment', 'end_comment')
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._dates: Optional[tuple[Optional[int], ...]] = None
+        self._begin_from: Optional[numpy.datetime64] = None
+        self._begin_to: Optional[numpy.datetime64] = None
+        self._end_from: Optional[numpy.datetime64] = None
+        self._end_to: Optional[numpy.datetime64] = None
+        self.begin_comment: Optional[str] = None
+        self.end_comment: Optional[str] = None
+        if 'begin_from' in data:
+            self._dates = (
+                data['begin_from'],
+                data['begin_to'],
+                data['end_from'],
+                data['end_to'])
+            self.begin_comment = data['begin_comment']
+            self.end_comment = data['end_comment']
+
+    @property
+    def encoded_dates(self) -> tuple[Optional[int], ...]:
+        return self._dates or ()
+
+    def decode_dates(
+            self,
+            dates: Optional[list[Optional[numpy.datetime64]]] = None) -> None:
+        if self._dates:
+            self._begin_from, self._begin_to, self._end_from, self._end_to = \
+                dates or epoch_to_datetime64(self._dates)
+            self._dates = None
+
+    @staticmethod
+    def decode_all(items: Iterable[Dates]) -> None:
+        encoded = [item for item in items if item.encoded_dates]
+        dates = epoch_to_datetime64(
+            seconds for item in encoded for seconds in item.encoded_dates)
+        for index, item in enumerate(encoded):
+            item.decode_dates(dates[index * 4:index * 4 + 4])
+
+    @staticmethod
+    def get_epochs(items: list[Any], column: str) -> NDArray[numpy.float64]:
+        """Seconds since 1970 of a date column, nan if missing"""
+        Dates.decode_all(items)
+        return datetime64_to_epoch(getattr(item, column) for item in items)
+
+    @property
+    def begin_from(self) -> Optional[numpy.datetime64]:
+        self.decode_dates()
+        return self._begin_from
+
+    @begin_from.setter
+    def begin_from(self, value: Optional[numpy.datetime64]) -> None:
+        self.decode_dates()
+        self._begin_from = value
+
+    @property
+    def begin_to(self) -> Optional[numpy.datetime64]:
+        self.decode_dates()
+        return self._begin_to
+
+    @begin_to.setter
+    def begin_to(self, value: Optional[numpy.datetime64]) -> None:
+        self.decode_dates()
+        self._begin_to = value
+
+    @property
+    def end_from(self) -> Optional[numpy.datetime64]:
+        self.decode_dates()
+        return self._end_from
+
+    @end_from.setter
+    def end_from(self, value: Optional[numpy.datetime64]) -> None:
+        self.decode_dates()
+        self._end_from = value
+
+    @property
+    def end_to(self) -> Optional[numpy.datetime64]:
+        self.decode_dates()
+        return self._end_to
+
+    @end_to.setter
+    def end_to(self, value: Optional[numpy.datetime64]) -> None:
+        self.decode_dates()
+        self._end_to = value
+
+    @property
+    def first(self) -> Optional[str]:
+        return format_date_part(self.begin_from, 'year') \
+            if self.begin_from else None
+
+    @property
+    def last(self) -> Optional[str]:
+        if self.end_to:
+            return format_date_part(self.end_to, 'year')
+        return format_date_part(self.end_from, 'year') \
+            if self.end_from else None
+
+
+class Entity(Dates):
+    __slots__ = (
+        'id', 'name', 'description', 'created', 'modified', 'cidoc_class',
+        'class_', 'reference_systems', 'origin_id', 'image_id', 'location',
+        'types', 'standard_type', 'aliases', 'public', 'creator',
+        'license_holder')
+
     def __init__(self, data: dict[str, Any]) -> None:
         self.id = data['id']
         self.name = data['name']
@@ -54,27 +168,7 @@ class Entity:
             self.aliases = dict(
                 sorted(self.aliases.items(), key=lambda item_: item_[1]))
 
-        self.begin_from = None
-        self.begin_to = None
-        self.begin_comment = None
-        self.end_from = None
-        self.end_to = None
-        self.end_comment = None
-        self.first = None
-        self.last = None
-        if 'begin_from' in data:
-            self.begin_from = timestamp_to_datetime64(data['begin_from'])
-            self.begin_to = timestamp_to_datetime64(data['begin_to'])
-            self.begin_comment = data['begin_comment']
-            self.end_from = timestamp_to_datetime64(data['end_from'])
-            self.end_to = timestamp_to_datetime64(data['end_to'])
-            self.end_comment = data['end_comment']
-            self.first = format_date_part(self.begin_from, 'year') \
-                if self.begin_from else None
-            self.last = format_date_part(self.end_from, 'year') \
-                if self.end_from else None
-            self.last = format_date_part(self.end_to, 'year') \
-                if self.end_to else self.last
+        super().__init__(data)
 
         if self.class_.name == 'file':
             self.public = False
@@ -141,17 +235,9 @@ class Entity:
         for linked_entity in entities:
             domain = linked_entity if inverse else self
             range_ = self if inverse else linked_entity
-            domain_error = True
-            range_error = True
-            if property_.find_object(
-                    'domain_class_code',
-                    domain.class_.cidoc_class.code):
-                domain_error = False
-            if property_.find_object(
-                    'range_class_code',
-                    range_.class_.cidoc_class.code):
-                range_error = False
-            if domain_error or range_error:  # pragma: no cover
+            if not property_.is_valid(
+                    domain.class_.cidoc_class.code,
+                    range_.class_.cidoc_class.code):  # pragma: no cover
                 text = \
                     f"invalid CIDOC link {domain.class_.cidoc_class.code}" \
                     f" > {code} > {range_.class_.cidoc_class.code}"
@@ -422,8 +508,8 @@ class Entity:
                 [self]}
 
     def get_file_size(self) -> str:
-        return convert_size(g.files[self.id].stat().st_size) \
-            if self.id in g.files else 'N/A'
+        size = get_registry(app.config['UPLOAD_PATH']).get_size(self.id)
+        return 'N/A' if size is None else convert_size(size)
 
     def get_file_ext(self) -> str:
         return g.files[self.id].suffix if self.id in g.files else 'N/A'
@@ -623,7 +709,10 @@ class Entity:
         return entity
 
 
-class Link:
+class Link(Dates):
+    __slots__ = (
+        'id', 'description', 'property', 'domain', 'range', 'type', 'types',
+        'object_')
     object_: Optional[Entity]  # Needed for first/last appearance
 
     def __init__(
@@ -640,19 +729,7 @@ class Link:
         self.types: dict[Entity, None] = {}
         if 'type_id' in row and row['type_id']:
             self.types[g.types[row['type_id']]] = None
-        if 'begin_from' in row:
-            self.begin_from = timestamp_to_datetime64(row['begin_from'])
-            self.begin_to = timestamp_to_datetime64(row['begin_to'])
-            self.begin_comment = row['begin_comment']
-            self.end_from = timestamp_to_datetime64(row['end_from'])
-            self.end_to = timestamp_to_datetime64(row['end_to'])
-            self.end_comment = row['end_comment']
-            self.first = format_date_part(self.begin_from, 'year') \
-                if self.begin_from else None
-            self.last = format_date_part(self.end_from, 'year') \
-                if self.end_from else None
-            self.last = format_date_part(self.end_to, 'year') \
-                if self.end_to else self.last
+        super().__init__(row)
 
     def update(self) -> None:
         db_link.update({
@@ -729,3 +806,28 @@ class Link:
     @staticmethod
     def delete_link_duplicates() -> int:
         return db_link.delete_link_duplicates()
+
+
+def get_table_count(filters: dict[str, Any]) -> int:
+    """Count for table filters: classes, term (optional), descriptions
+    (search term also in descriptions, default True) and exclude_ids"""
+    return db.get_table_count(filters)
+
+
+def get_table_page(
+        filters: dict[str, Any],
+        column: str,
+        desc: bool,
+        offset: int,
+        limit: Optional[int]) -> list[Entity]:
+    type_ids = []
+    if column == 'type':  # Sort by names of standard types
+        for class_ in filters['classes']:
+            if root_id := g.classes[class_].standard_type_id:
+                type_ids.append(root_id)
+                type_ids += g.types[root_id].get_sub_ids_recursive()
+    ids = db.get_table_ids(filters, column, desc, offset, limit, type_ids)
+    entities = {
+        entity.id: entity
+        for entity in Entity.get_by_ids(ids, types=True, aliases=True)}
+    return [entities[id_] for id_ in ids]
@@ -5,7 +5,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from flask import g
+
 from openatlas import app
+from openatlas.models.job import Job, task
 
 
 def current_date_for_filename() -> str:
@@ -15,7 +18,7 @@ def current_date_for_filename() -> str:
         f'{today.hour:02}{today.minute:02}'
 
 
-def sql_export(format_: str, postfix: Optional[str] = '') -> bool:
+def sql_export(format_: str, postfix: Optional[str] = '') -> Optional[str]:
     file = app.config['EXPORT_PATH'] \
            / f'{current_date_for_filename()}_export{postfix}.{format_}'
     command: Any = [
@@ -45,6 +48,13 @@ def sql_export(format_: str, postfix: Optional[str] = '') -> bool:
                 sub_process.wait()
         file.unlink()
     except Exception:  # pragma: no cover
-        return False
+        return None
+    return f'{file.name}.7z'
+
 
-    return True
+@task('sql_export')
+def sql_export_task(job: Job, format_: str) -> None:
+    job.result = sql_export(format_)
+    if not job.result:
+        raise OSError('SQL export failed')  # pragma: no cover
+    g.logger.log('info', 'database', 'SQL export')
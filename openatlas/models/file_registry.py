@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from flask import g
+
+from openatlas import app
+
+registries: dict[Path, FileRegistry] = {}
+
+
+class FileRegistry:
+    """Index of files named by entity id, e.g. 12.png, in a directory.
+
+    The index is kept for each process, persisted in TMP_PATH and only
+    rebuilt if the modification time of the directory changed, e.g. because
+    another process added or removed a file. Sizes and ctimes are read on
+    demand because overwriting a file doesn't change the directory."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.mtime: Optional[int] = None
+        self.files: dict[int, Path] = {}
+        hash_ = hashlib.md5(str(path.resolve()).encode()).hexdigest()
+        self.index_path = \
+            Path(app.config['TMP_PATH']) / f'file_registry_{hash_}.json'
+
+    def refresh(self) -> None:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            self.mtime = None
+            self.files = {}
+            return
+        if mtime == self.mtime or self.load(mtime):
+            return
+        files: dict[int, Path] = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name)
+                if stem.isdigit() and entry.is_file():
+                    files[int(stem)] = self.path / f'{stem}{ext}'
+        self.files = files
+        if time.time_ns() - mtime < 2 * 10**9:
+            # Racy, changes within the timestamp granularity could be missed
+            self.mtime = None
+            return
+        self.mtime = mtime
+        self.save()
+
+    def load(self, mtime: int) -> bool:
+        try:
+            with open(self.index_path, encoding='utf8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return False
+        if data['mtime'] != mtime or data['path'] != str(self.path):
+            return False
+        self.files = {
+            int(id_): self.path / name for id_, name in data['files'].items()}
+        self.mtime = mtime
+        return True
+
+    def save(self) -> None:
+        data: dict[str, Any] = {
+            'path': str(self.path),
+            'mtime': self.mtime,
+            'files': {id_: path.name for id_, path in self.files.items()}}
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}')
+        try:
+            with open(tmp_path, 'w', encoding='utf8') as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self.index_path)
+        except OSError:  # pragma: no cover
+            tmp_path.unlink(missing_ok=True)
+
+    def add(self, path: Path) -> None:
+        if path.stem.isdigit() and path.is_file():
+            self.files[int(path.stem)] = path
+            self.changed()
+
+    def remove(self, id_: int) -> None:
+        if self.files.pop(id_, None):
+            self.changed()
+
+    def changed(self) -> None:
+        """Take over the directory modification time after a change by this
+        process, so that other requests and processes use the saved index
+        instead of scanning the directory again."""
+        if self.mtime is None:  # Not up to date before, scan next time
+            return
+        try:
+            self.mtime = self.path.stat().st_mtime_ns
+        except OSError:  # pragma: no cover
+            self.mtime = None
+            return
+        self.save()
+
+    def get_stat(self, id_: int) -> Optional[os.stat_result]:
+        if id_ not in self.files:
+            return None
+        try:
+            return self.files[id_].stat()
+        except OSError:  # E.g. deleted by another process
+            return None
+
+    def get_size(self, id_: int) -> Optional[int]:
+        return stat.st_size if (stat := self.get_stat(id_)) else None
+
+    def get_ctime(self, id_: int) -> Optional[float]:
+        return stat.st_ctime if (stat := self.get_stat(id_)) else None
+
+
+def get_registry(path: Path | str) -> FileRegistry:
+    path = Path(path)
+    if path not in registries:
+        registries[path] = FileRegistry(path)
+    if 'refreshed_registries' not in g:
+        g.refreshed_registries = set()
+    if path not in g.refreshed_registries:  # Check only once a request
+        registries[path].refresh()
+        g.refreshed_registries.add(path)
+    return registries[path]
@@ -2,48 +2,45 @@ from __future__ import annotations
 
 import ast
 from collections import defaultdict
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, Iterable, Iterator, Optional, TYPE_CHECKING
 
 from flask import g, json
-from shapely.geometry import Point, Polygon, LineString
 
+from openatlas import app
 from openatlas.database import gis as db
 from openatlas.display.util2 import sanitize
 
 if TYPE_CHECKING:  # pragma: no cover
     from openatlas.models.entity import Entity
-    from openatlas.models.imports import Project
 
+FEATURES_PAGE = 1000  # Rows per query if features of all places are iterated
 
 class InvalidGeomException(Exception):
     pass
 
 
 class Gis:
-    @staticmethod
-    def get_by_id(id_: int) -> list[dict[str, Any]]:
-        return db.get_by_id(id_)
-
     @staticmethod
     def get_by_ids(ids: list[int]) -> defaultdict[int, list[dict[str, Any]]]:
         return db.get_by_ids(ids)
 
-    @staticmethod
-    def get_centroids_by_id(id_: int) -> Optional[list[dict[str, Any]]]:
-        return db.get_centroids_by_id(id_)
-
     @staticmethod
     def get_centroids_by_ids(ids: list[int]) -> defaultdict[int, list[Any]]:
         return db.get_centroids_by_ids(ids)
 
     @staticmethod
-    def get_wkt_by_id(id_: int) -> list[dict[str, Any]]:
-        return db.get_wkt_by_id(id_)
+    def get_wkt_by_ids(
+            ids: list[int]) -> defaultdict[int, list[dict[str, Any]]]:
+        return db.get_wkt_by_ids(ids)
 
     @staticmethod
     def get_all(
             objects: Optional[list[Entity]] = None,
-            structure: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+            structure: Optional[dict[str, Any]] = None,
+            places: bool = True) -> dict[str, Any]:
+        """If places is False, only geometries of objects and their
+        structure are included. Other places are then loaded by the map for
+        the visible area with get_places_by_bbox()."""
 
         if not objects:
             objects = []
@@ -75,41 +72,8 @@ class Gis:
                 + subunit_ids \
                 + sibling_ids
         object_ids = [x.id for x in objects] if objects else []
-        for row in db.get_all(extra_ids):
-            description = row['description'].replace('"', '\"') \
-                if row['description'] else ''
-            object_desc = row['object_desc'].replace('"', '\"') \
-                if row['object_desc'] else ''
-            if row['point']:
-                shape = 'point'
-                geojson = row['point']
-            elif row['linestring']:
-                shape = 'linestring'
-                geojson = row['linestring']
-            else:
-                shape = 'polygon'
-                geojson = row['polygon']
-            item = {
-                'type': 'Feature',
-                'geometry': json.loads(geojson),
-                'properties': {
-                    'objectId': row['object_id'],
-                    'objectName': row['object_name'].replace('"', '\"'),
-                    'objectDescription': object_desc,
-                    'locationId': row['location_id'],
-                    'id': row['id'],
-                    'name': row['name'].replace('"', '\"')
-                    if row['name'] else '',
-                    'description': description,
-                    'shapeType': row['type']}}
-            if 'types' in row and row['types']:
-                type_ids = ast.literal_eval(f"[{row['types']}]")
-                for type_id in list(set(type_ids)):
-                    type_ = g.types[type_id]
-                    if type_.root and g.types[type_.root[0]].name == 'Place':
-                        item['properties']['objectType'] = \
-                            type_.name.replace('"', '\"')
-                        break
+        for row in db.get_all(extra_ids + object_ids, places):
+            shape, item = get_feature(row)
             if structure \
                     and structure['supers'] \
                     and row['object_id'] == structure['supers'][-1].id:
@@ -152,11 +116,75 @@ class Gis:
             'gisPolygonAll': json.dumps(all_['polygon']),
             'gisPolygonSelected': json.dumps(selected['polygon']),
             'gisPolygonPointSelected': json.dumps(selected['polygon_point']),
+            'gisPlacesByBbox': json.dumps(not places),
+            'gisPlacesExtent': json.dumps(
+                None if places else Gis.get_places_extent()),
             'gisAllSelected': json.dumps(
                 selected['polygon']
                 + selected['linestring']
                 + selected['point'])}
 
+    @staticmethod
+    def get_all_features(shapes: Iterable[str]) -> Iterator[dict[str, Any]]:
+        """Features of all places by shape, queried in pages while they are
+        iterated. Points include the points on surface of polygons."""
+        for shape in shapes:
+            for row in get_place_rows(shape):
+                yield get_feature(row)[1]
+            if shape == 'point':
+                for row in get_place_rows('polygon'):
+                    item = get_feature(row)[1]
+                    item['geometry'] = json.loads(row['polygon_point'])
+                    yield item
+
+    @staticmethod
+    def count_features(shapes: Iterable[str]) -> int:
+        """Number of features get_all_features() yields for these shapes"""
+        return sum(
+            db.get_places_count(shape)
+            + (db.get_places_count('polygon') if shape == 'point' else 0)
+            for shape in shapes)
+
+    @staticmethod
+    def get_places_extent() -> Optional[list[list[float]]]:
+        """Bounds of all places as [[south, west], [north, east]], to fit
+        a map before places are loaded for the visible area only."""
+        if not (extent := db.get_places_extent()):
+            return None
+        return [
+            [extent['south'], extent['west']],
+            [extent['north'], extent['east']]]
+
+    @staticmethod
+    def get_places_by_bbox(
+            bbox: list[float],
+            zoom: int,
+            exclude_ids: list[int]) -> dict[str, list[dict[str, Any]]]:
+        features: dict[str, list[dict[str, Any]]] = {
+            'gisPointAll': [],
+            'gisLineAll': [],
+            'gisPolygonAll': []}
+        for row in db.get_places_by_bbox(
+                [
+                    max(bbox[0], -180),
+                    max(bbox[1], -90),
+                    min(bbox[2], 180),
+                    min(bbox[3], 90)],
+                360 / (256 * 2 ** min(max(zoom, 0), 30)),  # About a pixel
+                exclude_ids,
+                app.config['MAP_FEATURES_MAX']):
+            shape, item = get_feature(row)
+            features[{
+                'point': 'gisPointAll',
+                'linestring': 'gisLineAll',
+                'polygon': 'gisPolygonAll'}[shape]].append(item)
+            if row['polygon_point']:
+                polygon_point_item = dict(item)  # Make a copy
+                polygon_point_item['geometry'] = json.loads(
+                    row['polygon_point'])
+                features['gisPointAll'].append(polygon_point_item)
+        return features
+
     @staticmethod
     def insert(entity: Entity, data: dict[str, Any]) -> None:
         for shape in ['point', 'line', 'polygon']:
@@ -176,29 +204,93 @@ class Gis:
                         'type': item['properties']['shapeType'],
                         'geojson': json.dumps(item['geometry'])})
 
-    @staticmethod
-    def insert_wkt(
-            entity: Entity,
-            location: Entity,
-            project: Project,
-            wkt_: Polygon | Point | LineString) -> None:
-        shape_type = ''
-        match wkt_type := str(wkt_.type).lower():
-            case 'point':
-                shape_type = 'centerpoint'
-            case 'linestring':
-                shape_type = 'polyline'
-            case 'polygon':
-                shape_type = 'shape'
-        db.insert_wkt({
-            'entity_id': location.id,
-            'description':
-                f"Imported geometry of {sanitize(entity.name, 'text')} "
-                f"from the {sanitize(project.name, 'text')} project",
-            'type': shape_type,
-            'wkt': str(wkt_)},
-            wkt_type)
-
     @staticmethod
     def delete_by_entity(entity: Entity) -> None:
         db.delete_by_entity_id(entity.id)
+
+
+class GeometryLoader:
+    """Geometries of locations for one request. Ids of all locations needed
+    are given to load() to fetch them with one query, ids not loaded
+    before are fetched on access."""
+
+    def __init__(self, centroid: bool = False) -> None:
+        self.centroid = centroid
+        self.geoms: dict[int, list[dict[str, Any]]] = {}
+        self.centroids: dict[int, list[dict[str, Any]]] = {}
+        self.wkt: dict[int, list[dict[str, Any]]] = {}
+
+    def load(self, ids: Iterable[int]) -> None:
+        if not (ids := list({id_ for id_ in ids if id_ not in self.geoms})):
+            return
+        geoms = Gis.get_by_ids(ids)
+        centroids = Gis.get_centroids_by_ids(ids) if self.centroid else {}
+        for id_ in ids:
+            self.geoms[id_] = geoms.get(id_, [])
+            self.centroids[id_] = [c for c in centroids.get(id_, []) if c]
+
+    def load_wkt(self, ids: Iterable[int]) -> None:
+        if ids := list({id_ for id_ in ids if id_ not in self.wkt}):
+            wkt = Gis.get_wkt_by_ids(ids)
+            for id_ in ids:
+                self.wkt[id_] = wkt.get(id_, [])
+
+    def get_geoms(self, id_: int) -> list[dict[str, Any]]:
+        self.load([id_])
+        return list(self.geoms[id_])
+
+    def get_centroids(self, id_: int) -> list[dict[str, Any]]:
+        self.load([id_])
+        return list(self.centroids[id_])
+
+    def get_with_centroids(self, id_: int) -> list[dict[str, Any]]:
+        return self.get_geoms(id_) + self.get_centroids(id_)
+
+    def get_wkt(self, id_: int) -> list[dict[str, Any]]:
+        self.load_wkt([id_])
+        return list(self.wkt[id_])
+
+
+def get_place_rows(shape: str) -> Iterator[dict[str, Any]]:
+    after_id = 0
+    while rows := db.get_places(shape, after_id, FEATURES_PAGE):
+        yield from rows
+        after_id = rows[-1]['id']
+
+
+def get_feature(row: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    description = row['description'].replace('"', '\"') \
+        if row['description'] else ''
+    object_desc = row['object_desc'].replace('"', '\"') \
+        if row['object_desc'] else ''
+    if row['point']:
+        shape = 'point'
+        geojson = row['point']
+    elif row['linestring']:
+        shape = 'linestring'
+        geojson = row['linestring']
+    else:
+        shape = 'polygon'
+        geojson = row['polygon']
+    item = {
+        'type': 'Feature',
+        'geometry': json.loads(geojson),
+        'properties': {
+            'objectId': row['object_id'],
+            'objectName': row['object_name'].replace('"', '\"'),
+            'objectDescription': object_desc,
+            'locationId': row['location_id'],
+            'id': row['id'],
+            'name': row['name'].replace('"', '\"')
+            if row['name'] else '',
+            'description': description,
+            'shapeType': row['type']}}
+    if 'types' in row and row['types']:
+        type_ids = ast.literal_eval(f"[{row['types']}]")
+        for type_id in list(set(type_ids)):
+            type_ = g.types[type_id]
+            if type_.root and g.types[type_.root[0]].name == 'Place':
+                item['properties']['objectType'] = \
+                    type_.name.replace('"', '\"')
+                break
+    return shape, item
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import requests
+
+from openatlas.database import iiif as db
+
+
+class IiifConversion:
+    """Ledger entry of the IIIF conversion of a file. Failed conversions are
+    retried until IIIF_CONVERSION_ATTEMPTS is reached."""
+
+    def __init__(self, row: dict[str, Any]) -> None:
+        self.file_id = row['file_id']
+        self.status = row['status']
+        self.attempts = row['attempts']
+        self.message = row['message']
+        self.modified = row['modified']
+
+    @staticmethod
+    def get_all() -> list[IiifConversion]:
+        return [IiifConversion(row) for row in db.get_all()]
+
+    @staticmethod
+    def get_failed_ids(attempts: int) -> set[int]:
+        return set(db.get_failed_ids(attempts))
+
+    @staticmethod
+    def get_attempts(id_: int) -> int:
+        return db.get_attempts(id_)
+
+    @staticmethod
+    def log(id_: int, error: Optional[str] = None) -> None:
+        db.log(id_, 'failed' if error else 'done', error)
+
+    @staticmethod
+    def delete(id_: int) -> None:
+        db.delete(id_)
+
+    @staticmethod
+    def delete_failed() -> None:
+        db.delete_failed()
+
+
+def get_image_info(id_: int, url: str) -> dict[str, Any]:
+    """Return the info.json of an IIIF image which is cached in the
+    database and only fetched from the image server if missing or if the
+    image URL changed, e.g. because of changed IIIF settings."""
+    if (row := db.get_info(id_)) and row['url'] == url:
+        return row['info']
+    response = requests.get(f'{url}/info.json', timeout=30)
+    response.raise_for_status()  # Don't cache e.g. an error page
+    info = response.json()
+    db.set_info(id_, url, info)
+    return info
+
+
+def set_image_info(id_: int, url: str, width: int, height: int) -> None:
+    db.set_info(id_, url, {
+        '@context': 'http://iiif.io/api/image/2/context.json',
+        '@id': url,
+        'protocol': 'http://iiif.io/api/image',
+        'width': width,
+        'height': height,
+        'profile': ['http://iiif.io/api/image/2/level1.json']})
+
+
+def delete_image_info(id_: int) -> None:
+    db.delete_info(id_)
@@ -2,21 +2,19 @@ from __future__ import annotations
 
 import re
 from collections import defaultdict
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from flask import g
 from flask_login import current_user
 from shapely import wkt
 from shapely.errors import WKTReadingError
+from werkzeug.exceptions import abort
 
 from openatlas.api.import_scripts.util import (
     get_match_types, get_reference_system_by_name)
-from openatlas.api.resources.api_entity import ApiEntity
-from openatlas.api.resources.error import EntityDoesNotExistError
 from openatlas.database import imports as db
 from openatlas.display.util2 import sanitize
 from openatlas.models.entity import Entity
-from openatlas.models.gis import Gis
 
 
 class Project:
@@ -96,7 +94,84 @@ def check_single_type_duplicates(type_ids: list[str]) -> list[str]:
     return single_type_ids
 
 
-def import_data_(project: Project, class_: str, data: list[Any]) -> None:
+class ImportBatch:
+    """Rows of an import with pre-allocated entity ids, copied to the
+    database at once instead of inserting entities and links one by one."""
+
+    def __init__(self, project: Project, data: list[Any]) -> None:
+        self.project = project
+        self.size = max(3 * len(data), 1)  # Ids to allocate at once
+        self.ids: list[int] = []
+        self.tables: dict[str, list[tuple[Any, ...]]] = {
+            'model.entity': [],
+            'import.entity': [],
+            'model.link': [],
+            'model.gis': []}
+        self.origins: dict[str, tuple[int, str]] = {}  # Id and CIDOC class
+        self.references = get_references(data)
+        self.origin_references = get_origin_references(project, data)
+
+    def new_id(self) -> int:
+        if not self.ids:
+            self.ids = db.get_entity_ids(self.size)[::-1]
+        return self.ids.pop()
+
+    def insert(
+            self,
+            class_: str,
+            name: str,
+            description: Optional[str] = None,
+            row: Optional[dict[str, Any]] = None) -> tuple[int, str]:
+        id_ = self.new_id()
+        row = row or {}
+        self.tables['model.entity'].append((
+            id_,
+            class_,
+            g.classes[class_].cidoc_class.code,
+            name.strip(),
+            sanitize(description, 'text') if description else None,
+            row.get('begin_from') or None,
+            row.get('begin_to') or None,
+            str(row['begin_comment']).strip()
+            if row.get('begin_comment') else None,
+            row.get('end_from') or None,
+            row.get('end_to') or None,
+            str(row['end_comment']).strip()
+            if row.get('end_comment') else None))
+        return id_, g.classes[class_].cidoc_class.code
+
+    def link(
+            self,
+            code: str,
+            domain: tuple[int, str],
+            range_: tuple[int, str],
+            description: Optional[str] = None,
+            type_id: Optional[int] = None) -> None:
+        property_ = g.properties[code]
+        if not property_.is_valid(domain[1], range_[1]):
+            text = f"invalid CIDOC link {domain[1]} > {code} > {range_[1]}"
+            g.logger.log('error', 'model', text)
+            abort(400, text)
+        self.tables['model.link'].append(
+            (code, domain[0], range_[0], description, type_id))
+
+    def save(self, progress: Optional[Callable[[str, int], None]]) -> None:
+        for table, rows in self.tables.items():
+            db.copy_rows(table, rows)
+            if progress:
+                progress(table, len(rows))
+
+
+def import_data_(
+        project: Project,
+        class_: str,
+        data: list[Any],
+        progress: Optional[Callable[[str, int], None]] = None) -> None:
+    batch = ImportBatch(project, data)
+    parents = {
+        entity.id: entity for entity in Entity.get_by_ids({
+            int(row['openatlas_parent_id']) for row in data
+            if row.get('openatlas_parent_id')})}
     entities: dict[str | int, dict[str, Any]] = {}
     for row in data:
         if value := row.get('openatlas_class'):
@@ -104,56 +179,89 @@ def import_data_(project: Project, class_: str, data: list[Any]) -> None:
                     g.view_class_mapping['place'] +
                     g.view_class_mapping['artifact']):
                 class_ = value.lower().replace(' ', '_')
-        entity = Entity.insert(class_, row['name'], row.get('description'))
-        db.import_data(
-            project.id,
-            entity.id,
-            current_user.id,
-            origin_id=row.get('id'))
+        entity = batch.insert(class_, row['name'], row.get('description'), row)
+        batch.tables['import.entity'].append(
+            (project.id, row.get('id'), entity[0], current_user.id))
         if class_ in ['place', 'person', 'group']:
-            insert_alias(entity, row)
-        insert_dates(entity, row)
-        link_types(entity, row, class_)
-        link_references(entity, row, class_, project)
+            insert_alias(batch, entity, row)
+        link_types(batch, entity, row, class_)
+        link_references(batch, entity, row, class_)
         if class_ in g.view_class_mapping['place'] \
                 + g.view_class_mapping['artifact']:
-            insert_gis(entity, row, project)
+            insert_gis(batch, entity, row)
+        if row.get('id'):
+            batch.origins[str(row['id'])] = entity
         entities[row.get('id')] = {
             'entity': entity,
             'parent_id': row.get('parent_id'),
             'openatlas_parent_id':  row.get('openatlas_parent_id')}
     for entry in entities.values():
         if entry['parent_id']:
-            entities[entry['parent_id']]['entity'].link(
+            batch.link(
                 'P46',
+                entities[entry['parent_id']]['entity'],
                 entry['entity'])
         if entry['openatlas_parent_id']:
-            Entity.get_by_id(entry['openatlas_parent_id']).link(
+            if int(entry['openatlas_parent_id']) not in parents:
+                abort(418)
+            batch.link(
                 'P46',
+                get_link_entity(parents[int(entry['openatlas_parent_id'])]),
                 entry['entity'])
+    batch.save(progress)
 
 
-def insert_dates(entity: Entity, row: dict[str, Any]) -> None:
-    entity.update({'attributes': {
-        'begin_from': row.get('begin_from'),
-        'begin_to': row.get('begin_to'),
-        'begin_comment': row.get('begin_comment'),
-        'end_from': row.get('end_from'),
-        'end_to': row.get('end_to'),
-        'end_comment': row.get('end_comment')}})
+def get_link_entity(entity: Entity) -> tuple[int, str]:
+    return entity.id, entity.class_.cidoc_class.code
 
 
-def insert_alias(entity: Entity, row: dict[str, Any]) -> None:
+def get_references(data: list[Any]) -> dict[int, Entity]:
+    ids = set()
+    for row in data:
+        for reference in clean_reference_pages(
+                str(row.get('reference_ids') or '')):
+            if reference.split(';')[0].isdigit():
+                ids.add(int(reference.split(';')[0]))
+    return {entity.id: entity for entity in Entity.get_by_ids(ids)}
+
+
+def get_origin_references(
+        project: Project,
+        data: list[Any]) -> dict[str, tuple[int, str]]:
+    ids = db.get_ids_from_origin_ids(project.id, [
+        reference.split(';')[0]
+        for row in data if row.get('origin_reference_ids')
+        for reference in clean_reference_pages(
+            str(row['origin_reference_ids']))])
+    entities = {
+        entity.id: entity for entity in Entity.get_by_ids(set(ids.values()))}
+    return {
+        origin_id: get_link_entity(entities[id_])
+        for origin_id, id_ in ids.items() if id_ in entities}
+
+
+def insert_alias(
+        batch: ImportBatch,
+        entity: tuple[int, str],
+        row: dict[str, Any]) -> None:
     if aliases := row.get('alias'):
         for alias_ in aliases.split(";"):
-            entity.link('P1', Entity.insert('appellation', alias_))
+            if alias_.strip():
+                batch.link('P1', entity, batch.insert('appellation', alias_))
 
 
-def link_types(entity: Entity, row: dict[str, Any], class_: str) -> None:
+def link_types(
+        batch: ImportBatch,
+        entity: tuple[int, str],
+        row: dict[str, Any],
+        class_: str) -> None:
     if type_ids := row.get('type_ids'):
         for type_id in str(type_ids).split():
             if check_type_id(type_id, class_):
-                entity.link('P2', g.types[int(type_id)])
+                batch.link(
+                    'P2',
+                    entity,
+                    get_link_entity(g.types[int(type_id)]))
     if data := row.get('value_types'):
         for value_types in str(data).split():
             value_type = value_types.split(';')
@@ -161,31 +269,35 @@ def link_types(entity: Entity, row: dict[str, Any], class_: str) -> None:
                 if value_type[1].startswith('-') else value_type[1]
             if check_type_id(value_type[0], class_) and \
                     (number.isdigit() or number.replace('.', '', 1).isdigit()):
-                entity.link('P2', g.types[int(value_type[0])], value_type[1])
+                batch.link(
+                    'P2',
+                    entity,
+                    get_link_entity(g.types[int(value_type[0])]),
+                    value_type[1])
 
 
 def link_references(
-        entity: Entity,
+        batch: ImportBatch,
+        entity: tuple[int, str],
         row: dict[str, Any],
-        class_: str,
-        project: Project) -> None:
+        class_: str) -> None:
     if ref_ids := row.get('reference_ids'):
-        for references in clean_reference_pages(str(ref_ids)):
-            reference = references.split(';')
+        for references_ in clean_reference_pages(str(ref_ids)):
+            reference = references_.split(';')
             if len(reference) <= 2 and reference[0].isdigit():
-                try:
-                    ref_entity = ApiEntity.get_by_id(int(reference[0]))
-                except EntityDoesNotExistError:
+                if int(reference[0]) not in batch.references:
                     continue
-                page = reference[1] or None
-                ref_entity.link('P67', entity, page)
+                batch.link(
+                    'P67',
+                    get_link_entity(batch.references[int(reference[0])]),
+                    entity,
+                    reference[1] or None)
     if origin_ref_ids := row.get('origin_reference_ids'):
-        for references in clean_reference_pages(str(origin_ref_ids)):
-            reference = references.split(';')
-            if ref_id := get_id_from_origin_id(project, reference[0]):
-                ref_entity = ApiEntity.get_by_id(int(ref_id[0]))
-                page = reference[1] or None
-                ref_entity.link('P67', entity, page)
+        for references_ in clean_reference_pages(str(origin_ref_ids)):
+            reference = references_.split(';')
+            if ref_entity := batch.origin_references.get(reference[0]) \
+                    or batch.origins.get(reference[0]):
+                batch.link('P67', ref_entity, entity, reference[1] or None)
     match_types = get_match_types()
     systems = list(set(i for i in row if i.startswith('reference_system_')))
     for header in systems:
@@ -195,41 +307,62 @@ def link_references(
                     class_ in reference_system.classes):
                 values = data.split(';')
                 if values[1] in match_types:
-                    reference_system.link(
+                    batch.link(
                         'P67',
+                        get_link_entity(reference_system),
                         entity,
                         values[0],
                         type_id=match_types[values[1]].id)
 
 
-def insert_gis(entity: Entity, row: dict[str, Any], project: Project) -> None:
-    location = Entity.insert('object_location', f"Location of {row['name']}")
-    entity.link('P53', location)
+def insert_gis(
+        batch: ImportBatch,
+        entity: tuple[int, str],
+        row: dict[str, Any]) -> None:
+    location = batch.insert('object_location', f"Location of {row['name']}")
+    batch.link('P53', entity, location)
     if data := row.get('administrative_unit_id'):
         if ((str(data).isdigit() and int(data) in g.types) and
                 g.types[g.types[int(data)].root[0]].name in [
                     'Administrative unit']):
-            location.link('P89', g.types[int(data)])
+            batch.link('P89', location, get_link_entity(g.types[int(data)]))
     if data := row.get('historical_place_id'):
         if ((str(data).isdigit() and int(data) in g.types) and
                 g.types[g.types[int(data)].root[0]].name in [
                     'Historical place']):
-            location.link('P89', g.types[int(data)])
+            batch.link('P89', location, get_link_entity(g.types[int(data)]))
     if coordinates := row.get('wkt'):
         try:
             wkt_ = wkt.loads(coordinates)
         except WKTReadingError:
             wkt_ = None
         if wkt_:
-            if wkt_.geom_type in [
-                    'MultiPoint',
-                    'MultiLineString',
-                    'MultiPolygon',
-                    'GeometryCollection']:
-                for poly in wkt_:
-                    Gis.insert_wkt(entity, location, project, poly)
-            else:
-                Gis.insert_wkt(entity, location, project, wkt_)
+            name = sanitize(row['name'].strip(), 'text')
+            description = \
+                f"Imported geometry of {name} " \
+                f"from the {sanitize(batch.project.name, 'text')} project"
+            for geometry in split_geometry(wkt_):
+                shape = geometry.geom_type.lower()
+                batch.tables['model.gis'].append((
+                    location[0],
+                    '',
+                    description,
+                    {
+                        'point': 'centerpoint',
+                        'linestring': 'polyline',
+                        'polygon': 'shape'}[shape],
+                    *[
+                        f'SRID=4326;{geometry.wkt}' if shape == column
+                        else None
+                        for column in ['point', 'linestring', 'polygon']]))
+
+
+def split_geometry(geometry: Any) -> list[Any]:
+    if geometry.geom_type in ['Point', 'LineString', 'Polygon']:
+        return [geometry]
+    if hasattr(geometry, 'geoms'):  # Multi geometries and collections
+        return [part for sub in geometry.geoms for part in split_geometry(sub)]
+    return []  # pragma: no cover, e.g. a LinearRing
 
 
 def clean_reference_pages(value: str) -> list[str]:
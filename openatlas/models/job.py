@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import click
+from flask import g
+from flask_login import current_user, login_user
+
+from openatlas import PATH_SETTINGS, app
+from openatlas.database import job as db
+from openatlas.models.user import User
+
+tasks: dict[str, Callable[..., None]] = {}
+
+
+def task(name: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Register a function which can be run as job. It is called with the
+    job and the arguments given at Job.start()."""
+
+    def decorator(function: Callable[..., None]) -> Callable[..., None]:
+        tasks[name] = function
+        return function
+    return decorator
+
+
+class Job:
+    def __init__(self, row: dict[str, Any]) -> None:
+        self.id = row['id']
+        self.name = row['name']
+        self.status = row['status']
+        self.arguments = row['arguments'] or {}
+        self.progress = row['progress']
+        self.total = row['total']
+        self.message = row['message']
+        self.result = row['result']
+        self.user_id = row['user_id']
+        self.created = row['created']
+        self.started = row['started']
+        self.finished = row['finished']
+        self.progress_time = 0.0
+
+    def set_progress(self, progress: int, total: Optional[int] = None) -> None:
+        self.progress = progress
+        self.total = total if total is not None else self.total
+        if time.time() - self.progress_time > 1 or progress == self.total:
+            db.update_progress(self.id, self.progress, self.total)
+            self.progress_time = time.time()
+
+    def run(self) -> None:
+        try:
+            tasks[self.name](self, **self.arguments)
+            self.status = 'finished'
+        except Exception as e:  # pragma: no cover
+            g.logger.log('error', 'job', f'job {self.name} failed', e)
+            self.status = 'failed'
+            self.message = str(e)
+        db.finish(self.id, self.status, self.message, self.result)
+        db.unlock(self.id)
+
+    @staticmethod
+    def get_by_id(id_: int) -> Optional[Job]:
+        row = db.get_by_id(id_)
+        return Job(row) if row else None
+
+    @staticmethod
+    def get_all(limit: int = 100) -> list[Job]:
+        return [Job(row) for row in db.get_all(limit)]
+
+    @staticmethod
+    def get_latest(name: str) -> Optional[Job]:
+        row = db.get_latest(name)
+        return Job(row) if row else None
+
+    @staticmethod
+    def delete_finished() -> None:
+        Job.recover()
+        db.delete_finished()
+
+    @staticmethod
+    def recover() -> int:
+        """Mark running jobs of stopped workers as failed and start a worker
+        for queued jobs if none is running, e.g. after a restart."""
+        count = db.fail_stale('worker stopped')
+        if app.config['JOBS_IN_BACKGROUND'] and db.has_queued():
+            start_worker()
+        return count
+
+    @staticmethod
+    def start(name: str, arguments: Optional[dict[str, Any]] = None) -> Job:
+        id_ = db.insert(name, arguments or {}, current_user.id)
+        if app.config['JOBS_IN_BACKGROUND']:
+            start_worker()
+        else:  # E.g. for tests
+            db.start(id_)
+            Job(db.get_by_id(id_)).run()
+        return Job(db.get_by_id(id_))
+
+
+def start_worker() -> None:
+    """Start "flask run-jobs" in a new process if no worker is running.
+    Unlike a fork of the web worker it doesn't inherit threads, locks or
+    database connections. Database and path settings are passed on in case
+    they aren't the configured ones, e.g. in tests."""
+    if db.worker_running():
+        return
+    environment = os.environ | {
+        f'OPENATLAS_{key}': json.dumps(
+            str(app.config[key]) if key in PATH_SETTINGS
+            else app.config[key])
+        for key in [
+            'DATABASE_NAME', 'DATABASE_USER', 'DATABASE_PASS',
+            'DATABASE_PORT', 'DATABASE_HOST', *PATH_SETTINGS]}
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, '-m', 'flask', '--app', 'openatlas', 'run-jobs'],
+        cwd=Path(app.root_path).parent,
+        env=environment,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True)
+    threading.Thread(target=process.wait, daemon=True).start()  # Reap it
+
+
+def run_jobs() -> int:
+    """Run queued jobs until the queue is empty, in a worker process started
+    by Job.start() or e.g. by a service with "flask run-jobs". Only one
+    worker runs at a time, others return at once. Jobs are run in a request
+    context to provide g, the logger and the user who started them."""
+    count = 0
+    while True:
+        with app.test_request_context():
+            app.preprocess_request()
+            if not db.lock_worker():
+                return count
+            try:
+                if id_ := db.claim():
+                    job = Job(db.get_by_id(id_))
+                    if job.user_id and (user := User.get_by_id(job.user_id)):
+                        login_user(user)
+                    job.run()
+                    count += 1
+            finally:
+                db.unlock_worker()
+            # Checked after unlocking, for jobs queued while the worker was
+            # seen as running
+            if not id_ and not db.has_queued():
+                return count
+
+
+@click.command('run-jobs')
+def run_jobs_command() -> None:
+    click.echo(f'Jobs run: {run_jobs()}')
+
+
+app.cli.add_command(run_jobs_command)
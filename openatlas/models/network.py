@@ -1,98 +1,210 @@
-from typing import Optional
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Optional
 
 from flask import g
 
 from openatlas.database import network as db
-from openatlas.models.entity import Entity
+
+snapshot_cache: dict[str, NetworkSnapshot] = {}
+snapshot_lock = threading.Lock()
+
+
+class NetworkSnapshot:
+    """Entities of network classes and their links with network properties
+    or P53, to map object locations to their places. It is updated with the
+    changes logged by database triggers since the last use."""
+
+    max_age = 12 * 60 * 60  # Rebuild after, changes are kept for a day
+
+    def __init__(self, classes: list[str]) -> None:
+        self.classes = classes
+        self.created = time.time()
+        self.horizon = db.get_horizon()
+        self.entities: dict[int, tuple[str, str]] = {}
+        self.links: dict[int, tuple[int, int, str]] = {}
+        self.adjacency: dict[int, set[int]] = defaultdict(set)
+        self.locations: dict[int, int] = {}
+        self.add(
+            db.get_entities(classes),
+            db.get_links(classes, Network.properties + ['P53']))
+
+    def get_name(self, id_: int) -> str:
+        return self.entities[id_][0] if id_ in self.entities else ''
+
+    def get_class(self, id_: int) -> str:
+        return self.entities[id_][1] if id_ in self.entities else ''
+
+    def add(
+            self,
+            entities: Iterable[dict[str, Any]],
+            links: Iterable[dict[str, Any]]) -> None:
+        for row in entities:
+            self.entities[row['id']] = (
+                row['name'],
+                row['openatlas_class_name'])
+        for row in links:
+            self.links[row['id']] = (
+                row['domain_id'],
+                row['range_id'],
+                row['property_code'])
+            self.adjacency[row['domain_id']].add(row['id'])
+            self.adjacency[row['range_id']].add(row['id'])
+            if row['property_code'] == 'P53' \
+                    and self.get_class(row['domain_id']) == 'place':
+                self.locations[row['range_id']] = row['domain_id']
+
+    def remove_link(self, id_: int) -> None:
+        if id_ not in self.links:
+            return
+        domain_id, range_id, code = self.links.pop(id_)
+        self.adjacency[domain_id].discard(id_)
+        self.adjacency[range_id].discard(id_)
+        if code == 'P53' and self.locations.get(range_id) == domain_id:
+            del self.locations[range_id]
+
+    def update(self) -> None:
+        """Reload changed entities and links. Changes of transactions not
+        finished at the last update are read again because they may have
+        been committed in the meantime."""
+        horizon = db.get_horizon()
+        entity_ids: set[int] = set()
+        link_ids: set[int] = set()
+        for row in db.get_changes(self.horizon):
+            if row['entity_id']:
+                entity_ids.add(row['entity_id'])
+            else:
+                link_ids.add(row['link_id'])
+        self.horizon = horizon
+        if not entity_ids and not link_ids:
+            return
+        for id_ in entity_ids:
+            link_ids |= self.adjacency.get(id_, set())
+            self.entities.pop(id_, None)
+        for id_ in link_ids:
+            self.remove_link(id_)
+        self.add(
+            db.get_entities(self.classes, tuple(entity_ids))
+            if entity_ids else [],
+            db.get_links(
+                self.classes,
+                Network.properties + ['P53'],
+                tuple(link_ids),
+                tuple(entity_ids)))
 
 
 class Network:
+    # If changed, also change the log_network_change triggers of model.link
     properties = [
         'P7', 'P11', 'P14', 'P22', 'P23', 'P24', 'P25', 'P27', 'P31', 'P52',
         'P74', 'P107', 'OA7', 'OA8', 'OA9']
 
     @staticmethod
-    def get_ego_network_json(
+    def get_ego_network_data(
             colors: dict[str, str],
             id_: int,
             depth: int,
-            dimensions: Optional[int]) -> Optional[str]:
-        mapping = db.get_object_mapping()
+            dimensions: Optional[int],
+            max_nodes: Optional[int] = None) -> Optional[dict[str, Any]]:
+        with Network.get_snapshot() as snapshot:
+            mapping = dict(snapshot.locations)
+        locations = {object_: loc for loc, object_ in mapping.items()}
         entity_ids = {id_}
-        location_id = 0
-        if id_ in mapping.values():
-            location_id = \
-                list(mapping.keys())[list(mapping.values()).index(id_)]
-            entity_ids.add(location_id)
-        edges = []
+        frontier = {id_}
+        edges: dict[int, dict[str, int]] = {}
         for _ in range(depth):
-            for row in db.get_ego_network(entity_ids):
-                if row['property_code'] in Network.properties:
-                    domain_id = mapping[row['domain_id']] \
-                        if row['domain_id'] in mapping else row['domain_id']
-                    range_id = mapping[row['range_id']] \
-                        if row['range_id'] in mapping else row['range_id']
-                    entity_ids.add(domain_id)
-                    entity_ids.add(range_id)
-                    edges.append({
-                        'id': row['id'],
-                        'source': domain_id,
-                        'target': range_id})
+            if not frontier:
+                break
+            new_ids: set[int] = set()
+            ids = frontier | {locations[i] for i in frontier if i in locations}
+            for row in db.get_ego_network(ids):
+                if row['id'] in edges \
+                        or row['property_code'] not in Network.properties:
+                    continue
+                domain_id = mapping.get(row['domain_id'], row['domain_id'])
+                range_id = mapping.get(row['range_id'], row['range_id'])
+                missing = {domain_id, range_id} - entity_ids
+                if max_nodes and len(entity_ids) + len(missing) > max_nodes:
+                    continue
+                entity_ids |= missing
+                new_ids |= missing
+                edges[row['id']] = {
+                    'id': row['id'],
+                    'source': domain_id,
+                    'target': range_id}
+            frontier = new_ids
         nodes = []
-        if location_id in entity_ids:
-            entity_ids.remove(location_id)
-        for entity in Entity.get_by_ids(entity_ids):
+        for row in sorted(
+                db.get_entities_by_ids(entity_ids),
+                key=lambda x: x['id']):
             nodes.append({
-                'id': entity.id,
+                'id': row['id'],
                 'label' if dimensions else
-                'name': Network.truncate(entity.name.replace("'", "")),
-                'color': colors[entity.class_.name]
-                if entity.class_.name in colors else '#333333'})
-        return str({
+                'name': Network.truncate(row['name']),
+                'color': colors.get(row['openatlas_class_name'])
+                or '#333333'})
+        return {
             'nodes': nodes,
-            'edges' if dimensions else 'links': edges}) if nodes else None
+            'edges' if dimensions else 'links': list(edges.values())} \
+            if nodes else None
 
     @staticmethod
-    def get_network_json(
+    def get_network_data(
             colors: dict[str, str],
             show_orphans: bool,
-            dimensions: Optional[int]) -> Optional[str]:
-        mapping = db.get_object_mapping()
-        classes = [c.name for c in g.classes.values() if c.network_color]
-        entities: set[int] = set()
-        nodes = []
-        for row in db.get_entities(classes):
-            if row['id'] not in mapping \
-                    and row['id'] not in entities \
-                    and row['openatlas_class_name'] != 'source':
-                nodes.append({
-                    'id': row['id'],
-                    'label' if dimensions else
-                    'name': Network.truncate(row['name'].replace("'", "")),
-                    'color': colors[row['openatlas_class_name']]})
-                entities.add(row['id'])
+            dimensions: Optional[int]) -> Optional[dict[str, Any]]:
         edges = []
         edge_entity_ids = set()
-        for row in db.get_edges(classes, Network.properties):
-            domain_id = mapping[row['domain_id']] \
-                if row['domain_id'] in mapping else row['domain_id']
-            range_id = mapping[row['range_id']] \
-                if row['range_id'] in mapping else row['range_id']
-            edges.append({
-                'id': int(row['id']),
-                'source': domain_id,
-                'target': range_id})
-            edge_entity_ids.add(domain_id)
-            edge_entity_ids.add(range_id)
-        if not show_orphans:
-            nodes[:] = [d for d in nodes if int(d['id']) in edge_entity_ids]
-        else:
-            nodes[:] = [
-                d for d in nodes if int(d['id']) in edge_entity_ids
-                or (not d['name'].startswith('Location of'))]
-        return str({
+        nodes = []
+        with Network.get_snapshot() as snapshot:
+            mapping = snapshot.locations
+            for link_id, (domain_id, range_id, code) \
+                    in sorted(snapshot.links.items()):
+                if code not in Network.properties:
+                    continue
+                domain_id = mapping.get(domain_id, domain_id)
+                range_id = mapping.get(range_id, range_id)
+                edges.append({
+                    'id': link_id,
+                    'source': domain_id,
+                    'target': range_id})
+                edge_entity_ids.add(domain_id)
+                edge_entity_ids.add(range_id)
+            for id_, (name, class_) in snapshot.entities.items():
+                if class_ == 'source' or id_ in mapping:
+                    continue
+                if id_ not in edge_entity_ids and (
+                        not show_orphans or name.startswith('Location of')):
+                    continue
+                nodes.append({
+                    'id': id_,
+                    'label' if dimensions else 'name': Network.truncate(name),
+                    'color': colors[class_]})
+        return {
             'nodes': nodes,
-            'edges' if dimensions else 'links': edges}) if nodes else None
+            'edges' if dimensions else 'links': edges} if nodes else None
+
+    @staticmethod
+    @contextmanager
+    def get_snapshot() -> Iterator[NetworkSnapshot]:
+        # The snapshot is cached per process and locked while in use because
+        # it is updated in place.
+        classes = sorted(c.name for c in g.classes.values() if c.network_color)
+        with snapshot_lock:
+            snapshot = snapshot_cache.get('snapshot')
+            if snapshot \
+                    and snapshot.classes == classes \
+                    and time.time() - snapshot.created < snapshot.max_age:
+                snapshot.update()
+            else:
+                db.delete_changes()
+                snapshot = NetworkSnapshot(classes)
+                snapshot_cache['snapshot'] = snapshot
+            yield snapshot
 
     @staticmethod
     def truncate(string: str = '', length: int = 40) -> str:
@@ -90,6 +90,13 @@ class OpenatlasClass:
     def get_class_count() -> dict[str, int]:
         return db.get_class_count()
 
+    @staticmethod
+    def get_entity_count(classes: list[str]) -> int:
+        # Counts are read once a request from the trigger maintained table
+        if 'class_count' not in g:
+            g.class_count = db.get_class_count()
+        return sum(g.class_count.get(name, 0) for name in classes)
+
     @staticmethod
     def get_all() -> dict[str, OpenatlasClass]:
         classes = {}
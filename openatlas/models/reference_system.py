@@ -16,10 +16,15 @@ class ReferenceSystem(Entity):
         self.placeholder = row['identifier_example']
         self.precision_default_id = \
             list(self.types)[0].id if self.types else None
-        self.count = row['count']
         self.system = row['system']
         self.classes: list[str] = []
 
+    @property
+    def count(self) -> int:
+        if 'reference_system_counts' not in g:
+            g.reference_system_counts = db.get_counts()
+        return g.reference_system_counts.get(self.id, 0)
+
     def update(self, data: dict[str, Any], new: bool = False) -> Optional[int]:
         self.update_system(data)
         return super().update(data, new)
@@ -1,19 +1,17 @@
 from typing import Any
 
-from flask import g
 from flask_login import current_user
 
 from openatlas.database import entity as db
 from openatlas.models.entity import Entity
+from openatlas.models.job import Job, task
 
 
 def search(data: dict[str, Any]) -> list[Entity]:
+    """Entities found by name, alias or (optional) description, ordered by
+    relevance. Matches of aliases are resolved in the database query."""
     if not data['term']:
         return []
-    for class_ in data['classes']:
-        if g.classes[class_].alias_allowed:
-            data['classes'].append('appellation')
-            break
     entities = []
     for row in db.search(
             data['term'],
@@ -21,18 +19,10 @@ def search(data: dict[str, Any]) -> list[Entity]:
             data['desc'],
             data['own'],
             current_user.id):
-        if row['openatlas_class_name'] == 'appellation':
-            entity = Entity.get_linked_entity_safe_static(
-                row['id'],
-                'P1',
-                True)
-            if entity.class_.name not in data['classes']:
-                continue
-        else:
-            entity = Entity(row)
-        if entity and check_dates(entity, data):
+        entity = Entity(row)
+        if check_dates(entity, data):
             entities.append(entity)
-    return list({d.id: d for d in entities}.values())  # Remove duplicates
+    return entities
 
 
 def check_dates(entity: Entity, data: dict[str, Any]) -> bool:
@@ -67,3 +57,12 @@ def check_dates(entity: Entity, data: dict[str, Any]) -> bool:
 
 def get_subunits_without_super(classes: list[str]) -> list[int]:
     return db.get_subunits_without_super(classes)
+
+
+@task('search_index')
+def update_search_index(job: Job) -> None:
+    """Rebuild search vectors, needed after the default language changed
+    because descriptions are indexed with its text search configuration."""
+    count = db.update_search_vectors()
+    job.result = str(count)
+    job.set_progress(count, count)
@@ -19,8 +19,6 @@ app.config['PROPERTY_TYPES'] = [
 
 
 class Type(Entity):
-    count = 0
-    count_subs = 0
     category = ''
     multiple = False
     required = False
@@ -33,6 +31,22 @@ class Type(Entity):
         self.subs: list[int] = []
         self.classes: list[str] = []
 
+    @property
+    def count(self) -> int:
+        if 'type_counts' not in g:  # Counted on demand, once a request
+            g.type_counts = db.get_counts()
+        return g.type_counts.get(self.id, 0)
+
+    @property
+    def count_subs(self) -> int:
+        if 'type_count_subs' not in g:
+            g.type_count_subs = {}
+        if self.id not in g.type_count_subs:
+            g.type_count_subs[self.id] = sum(
+                g.types[id_].count + g.types[id_].count_subs
+                for id_ in self.subs)
+        return g.type_count_subs[self.id]
+
     def get_sub_ids_recursive(
             self,
             subs: Optional[list[int]] = None) -> list[int]:
@@ -124,13 +138,11 @@ class Type(Entity):
                 db.remove_entity_type(self.id, delete_ids)
 
     @staticmethod
-    def get_all(with_count: bool) -> dict[int, Type]:
+    def get_all() -> dict[int, Type]:
         types = {}
-        for row in db.get_types(with_count):
+        for row in db.get_types():
             type_ = Type(row)
             types[type_.id] = type_
-            type_.count = row['count'] or row['count_property']
-            type_.count_subs = 0
             type_.subs = []
             type_.root = [row['super_id']] if row['super_id'] else []
             type_.selectable = not row['non_selectable']
@@ -166,7 +178,6 @@ class Type(Entity):
             super_id: int,
             root: list[int]) -> list[int]:
         super_ = types[super_id]
-        super_.count_subs += type_.count
         if not super_.root:
             return root
         type_.root.insert(0, super_.root[-1])
@@ -380,21 +380,47 @@ function selectFromTable(element, table, id, label=undefined) {
   $('#' + table + '-modal').modal('hide');
 }
 
+/* Selections of multi select tables which load their rows page wise */
+const ajaxTableSelection = {};
+
+function initAjaxTableMulti(name, selection) {
+  ajaxTableSelection[name] = new Map(selection);
+  const table = $(`#${name}_table`);
+  table.on('draw.dt', () => table.find('input[type="checkbox"]').each(
+    function () {
+      $(this).prop('checked', ajaxTableSelection[name].has(this.id));
+    }));
+  table.on('change', 'input[type="checkbox"]', function () {
+    if ($(this).is(':checked'))
+      ajaxTableSelection[name].set(this.id, $(this).val());
+    else
+      ajaxTableSelection[name].delete(this.id);
+  });
+}
+
 function deselectFromTable(tableName, nodeId) {
   $(`#${tableName}_table`)?.find(`#${nodeId}[type="checkbox"]`)?.prop( "checked", false )
+  ajaxTableSelection[tableName]?.delete(String(nodeId));
   selectFromTableMulti(tableName)
 }
 
 function selectFromTableMulti(name) {
   let checkedNames = [];
   let ids = [];
-  $('#' + name + '_table').DataTable().rows().nodes().to$().find('input[type="checkbox"]').each(
-    function () {
-      if ($(this).is(':checked')) {
-        checkedNames.push({name:$(this).val(),id:$(this).attr('id')});
-        ids.push($(this).attr('id'));
-      }
+  if (name in ajaxTableSelection) {
+    ajaxTableSelection[name].forEach((label, id) => {
+      checkedNames.push({name: label, id: id});
+      ids.push(id);
     });
+  } else {
+    $('#' + name + '_table').DataTable().rows().nodes().to$().find('input[type="checkbox"]').each(
+      function () {
+        if ($(this).is(':checked')) {
+          checkedNames.push({name:$(this).val(),id:$(this).attr('id')});
+          ids.push($(this).attr('id'));
+        }
+      });
+  }
   $('#' + name + '-selection')
       .html(checkedNames.map(x => closableBadge(x.name,`deselectFromTable('${name}',${x.id})`)));
   $('#' + name).val(ids.length > 0 ? '[' + ids + ']' : '').trigger('change');
@@ -244,14 +244,50 @@ const allSelected = [
   ...gisPointSibling,
   ...gisPointSubs,
 ];
+
+// Load other places for the visible area only, if not already included
+let placesRequest = 0;
+function loadPlaces() {
+  const bounds = map.getBounds();
+  const request = ++placesRequest;
+  const exclude = [...new Set(allSelected
+    .map(feature => feature?.properties?.objectId)
+    .filter(id => id))];
+  $.getJSON('/ajax/gis', {
+    bbox: [
+      bounds.getWest(),
+      bounds.getSouth(),
+      bounds.getEast(),
+      bounds.getNorth()].join(','),
+    zoom: map.getZoom(),
+    exclude: exclude.join(',')
+  }, function (data) {
+    if (request !== placesRequest) return;  // A newer request was sent
+    const places = [...data.gisPointAll, ...data.gisPolygonAll, ...data.gisLineAll];
+    for (const layer of [pointLayer, polygonLayer, linestringLayer]) {
+      layer.clearLayers();
+      layer.addData(places);
+    }
+    cluster.clearLayers();
+    cluster.addLayer(pointLayer);
+  });
+}
+
 if (allSelected?.length > 0)
   map.fitBounds(L.featureGroup(allSelectedLayer).getBounds(), {
     maxZoom: mapDefaultZoom,
   });
+else if (gisPlacesExtent)  // Extent of all places, loaded for the view below
+  map.fitBounds(gisPlacesExtent, {maxZoom: mapDefaultZoom});
 else if (Object.keys(pointLayer?.getBounds()).length !== 0)
   map.fitBounds(pointLayer.getBounds(), {maxZoom: mapDefaultZoom});
 else map.setView([30, 0], 2);
 
+if (gisPlacesByBbox) {
+  map.on('moveend', loadPlaces);
+  loadPlaces();
+}
+
 // Overlay maps
 let overlayMapsControl = {};
 overlays.forEach((o) => {
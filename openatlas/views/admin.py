@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import importlib
+import json
 import math
 import os
 import shutil
@@ -20,9 +21,9 @@ from wtforms import StringField, TextAreaField
 from wtforms.validators import InputRequired
 
 from openatlas import app
-from openatlas.database.connect import Transaction
+from openatlas.database.connect import Transaction, get_pool_stats
 from openatlas.display.image_processing import (
-    create_resized_images, delete_orphaned_resized_images)
+    delete_orphaned_resized_images)
 from openatlas.display.tab import Tab
 from openatlas.display.table import Table
 from openatlas.display.util import (
@@ -33,20 +34,23 @@ from openatlas.display.util2 import (
 from openatlas.forms.display import display_form
 from openatlas.forms.field import SubmitField
 from openatlas.forms.setting import (
-    ApiForm, ContentForm, FrontendForm, GeneralForm, LogForm, MailForm,
-    MapForm, ModulesForm, SimilarForm, TestMailForm)
+    ApiForm, CheckLinksForm, ContentForm, FrontendForm, GeneralForm, LogForm,
+    MailForm, MapForm, ModulesForm, SimilarForm, TestMailForm)
 from openatlas.forms.util import get_form_settings, set_form_settings
 from openatlas.models.annotation import AnnotationImage
 from openatlas.models.checks import (
-    entities_linked_to_itself, invalid_cidoc_links, invalid_dates,
-    orphaned_subunits, orphans as get_orphans, similar_named,
+    INVALID_LINKS_PAGE, entities_linked_to_itself, invalid_cidoc_links,
+    invalid_dates, orphaned_subunits, orphans as get_orphans,
     single_type_duplicates)
 from openatlas.models.content import get_content, update_content
 from openatlas.models.entity import Entity, Link
+from openatlas.models.file_registry import get_registry
 from openatlas.models.imports import Project
+from openatlas.models.job import Job
 from openatlas.models.settings import Settings
 from openatlas.models.type import Type
 from openatlas.models.user import User
+from openatlas.views.job import flash_job
 
 
 @app.route('/admin', methods=['GET', 'POST'], strict_slashes=False)
@@ -66,7 +70,8 @@ def admin_index() -> str:
     if is_authorized('admin'):
         tabs['general'] = Tab(
             'general',
-            display_info(get_form_settings(GeneralForm())),
+            display_info(get_form_settings(GeneralForm()))
+            + get_database_pool_info(),
             buttons=[
                 manual('admin/general'),
                 button(_('edit'), url_for('settings', category='general')),
@@ -115,6 +120,16 @@ def admin_index() -> str:
         crumbs=[_('admin')])
 
 
+def get_database_pool_info() -> str:
+    if not (stats := get_pool_stats()):
+        return ''
+    return \
+        '<h1>' + uc_first(_('database connection pool')) + '</h1>' + \
+        display_info({
+            _(label): format_number(value) if label != 'process' else value
+            for label, value in stats.items()})
+
+
 def get_content_table() -> str:
     table = Table(['name'] + list(app.config['LANGUAGES']))
     for item, languages in get_content().items():
@@ -215,22 +230,49 @@ def admin_content(item: str) -> str | Response:
             _(item)])
 
 
-@app.route('/check_links')
+@app.route('/check_links', methods=['GET', 'POST'])
+@app.route('/check_links/<int:after>')
 @required_group('contributor')
-def check_links() -> str:
-    table = Table(['domain', 'property', 'range'])
-    for row in invalid_cidoc_links():
-        table.rows.append([
-            f"{link(row['domain'])} ({row['domain'].cidoc_class.code})",
-            link(row['property']),
-            f"{link(row['range'])} ({row['range'].cidoc_class.code})"])
+def check_links(after: int = 0) -> str | Response:
+    form = CheckLinksForm()
+    Job.recover()  # Otherwise a job of a stopped worker blocks new checks
+    job = Job.get_latest('check_links')
+    if form.validate_on_submit():
+        if not job or job.status not in ['queued', 'running']:
+            job = Job.start('check_links')
+        if job.status != 'finished':  # pragma: no cover
+            flash_job(job, '', url_for('check_links'))
+        return redirect(url_for('check_links'))
+    buttons = [manual('admin/data_integrity_checks')]
+    table = None
+    content = display_form(form)
+    if job and job.status == 'finished':
+        table = Table(['domain', 'property', 'range'])
+        rows = invalid_cidoc_links(after)
+        for row in rows:
+            table.rows.append([
+                link(
+                    row['domain_name'],
+                    url_for('view', id_=row['domain_id']),
+                    uc_first_=False) + f" ({row['domain_code']})",
+                link(g.properties[row['property_code']]),
+                link(
+                    row['range_name'],
+                    url_for('view', id_=row['range_id']),
+                    uc_first_=False) + f" ({row['range_code']})"])
+        if not rows and not after:
+            content += \
+                '<p>' + _('Congratulations, everything looks fine!') + '</p>'
+        if len(rows) == INVALID_LINKS_PAGE:
+            buttons.append(
+                button(
+                    _('next'),
+                    url_for('check_links', after=rows[-1]['id'])))
+    elif job and job.status in ['queued', 'running']:  # pragma: no cover
+        buttons.append(button(_('reload'), url_for('check_links')))
     return render_template(
         'tabs.html',
-        tabs={'links': Tab(
-            'links',
-            '' if table.rows else _('Congratulations, everything looks fine!'),
-            table,
-            [manual('admin/data_integrity_checks')])},
+        tabs={'links': Tab('links', content, table, buttons)},
         title=_('admin'),
         crumbs=[
             [_('admin'), f"{url_for('admin_index')}#tab-data"],
@@ -350,6 +392,9 @@ def settings(category: str) -> str | Response:
             Transaction.rollback()
             g.logger.log('error', 'database', 'transaction failed', e)
             flash(_('error transaction'), 'error')
+        if data.get('default_language', g.settings['default_language']) \
+                != g.settings['default_language']:  # Rebuild search vectors
+            flash_job(Job.start('search_index'), _('search index was updated'))
         return redirect(redirect_url)
     set_form_settings(form)
     manual_page = f"admin/{category.replace('frontend', 'presentation_site')}"
@@ -361,32 +406,63 @@ def settings(category: str) -> str | Response:
 
 
 @app.route('/check_similar', methods=['GET', 'POST'])
+@app.route('/check_similar/<int:job_id>', methods=['GET', 'POST'])
 @required_group('contributor')
-def check_similar() -> str:
+def check_similar(job_id: Optional[int] = None) -> str | Response:
     form = SimilarForm()
     form.classes.choices = [
         (class_.name, class_.label)
         for name, class_ in g.classes.items() if class_.label and class_.view]
-    table = None
     if form.validate_on_submit():
-        table = Table(['name', _('count')])
-        for item in similar_named(form.classes.data, form.ratio.data).values():
-            similar = [link(entity) for entity in item['entities']]
-            table.rows.append([
-                f"{link(item['entity'])}<br><br>{'<br><br>'.join(similar)}",
-                len(item['entities']) + 1])
+        new_job = Job.start(
+            'check_similar',
+            {'class_': form.classes.data, 'ratio': form.ratio.data})
+        url = url_for('check_similar', job_id=new_job.id)
+        if new_job.status != 'finished':  # pragma: no cover
+            flash_job(new_job, '', url)
+        return redirect(url)
+    table = None
+    buttons = []
+    if job_id:
+        job = Job.get_by_id(job_id)
+        if not job or job.name != 'check_similar':
+            abort(404)  # pragma: no cover
+        form.classes.data = job.arguments['class_']
+        form.ratio.data = job.arguments['ratio']
+        if job.status == 'finished':
+            table = get_similar_table(json.loads(job.result))
+        else:  # pragma: no cover
+            buttons.append(
+                button(_('reload'), url_for('check_similar', job_id=job.id)))
     content = display_form(form, manual_page='admin/data_integrity_checks')
     content += ('<p class="uc-first">' + _('no entries') + '</p>') \
         if table and not table.rows else ''
     return render_template(
         'tabs.html',
-        tabs={'similar': Tab('similar', content, table=table)},
+        tabs={
+            'similar': Tab('similar', content, table=table, buttons=buttons)},
         title=_('admin'),
         crumbs=[
             [_('admin'), f"{url_for('admin_index')}#tab-data"],
             _('check similar names')])
 
 
+def get_similar_table(similar: dict[str, list[int]]) -> Table:
+    ids = {int(id_) for id_ in similar}
+    for similar_ids in similar.values():
+        ids.update(similar_ids)
+    entities = {entity.id: entity for entity in Entity.get_by_ids(ids)}
+    table = Table(['name', _('count')])
+    for id_, similar_ids in similar.items():
+        if int(id_) not in entities:
+            continue  # pragma: no cover, deleted in the meantime
+        links = [link(entities[i]) for i in similar_ids if i in entities]
+        table.rows.append([
+            f"{link(entities[int(id_)])}<br><br>{'<br><br>'.join(links)}",
+            len(links) + 1])
+    return table
+
+
 @app.route('/check/dates')
 @required_group('contributor')
 def check_dates() -> str:
@@ -568,6 +644,9 @@ def admin_file_delete(filename: str) -> Response:
     if filename != 'all':  # Delete one file
         try:
             (app.config['UPLOAD_PATH'] / filename).unlink()
+            if filename.split('.')[0].isdigit():
+                get_registry(app.config['UPLOAD_PATH']).remove(
+                    int(filename.split('.')[0]))
             flash(f"{filename} {_('was deleted')}", 'info')
         except Exception as e:
             g.logger.log('error', 'file', f'deletion of {filename} failed', e)
@@ -623,6 +702,9 @@ def admin_annotation_remove_entity(
 def admin_file_iiif_delete(filename: str) -> Response:
     try:
         (Path(g.settings['iiif_path']) / filename).unlink()
+        if filename.split('.')[0].isdigit():
+            get_registry(g.settings['iiif_path']).remove(
+                int(filename.split('.')[0]))
         flash(f"{filename} {_('was deleted')}", 'info')
     except Exception as e:
         g.logger.log('error', 'file', f'deletion of IIIF {filename} failed', e)
@@ -739,11 +821,17 @@ def newsletter() -> str | Response:
             _('newsletter')])
 
 
-@app.route('/resize_images')
+@app.route('/resize_images', methods=['POST'])
 @required_group('admin')
 def resize_images() -> Response:
-    create_resized_images()
-    flash(_('images were created'), 'info')
+    flash_job(Job.start('resize_images'), _('images were created'))
+    return redirect(url_for('admin_index') + '#tab-data')
+
+
+@app.route('/admin/recount', methods=['POST'])
+@required_group('admin')
+def admin_recount() -> Response:
+    flash_job(Job.start('recount'), _('counts were updated'))
     return redirect(url_for('admin_index') + '#tab-data')
 
 
@@ -12,10 +12,12 @@ from openatlas.api.external.wikidata import fetch_wikidata
 from openatlas.database.connect import Transaction
 from openatlas.display.util import display_info, required_group
 from openatlas.display.util2 import uc_first
-from openatlas.forms.field import table
+from openatlas.forms.field import table, table_multi_row, table_row
 from openatlas.models.entity import Entity
+from openatlas.models.gis import Gis
 from openatlas.models.type import Type
 from openatlas.models.user import User
+from openatlas.views.entity_index import get_table_data
 
 
 @app.route('/ajax/bookmark', methods=['POST'])
@@ -48,6 +50,22 @@ def ajax_add_type() -> str:
     return str(entity.id)
 
 
+@app.route('/ajax/gis')
+@required_group('readonly')
+def ajax_gis() -> Response:
+    try:
+        bbox = [float(value) for value in request.args['bbox'].split(',')]
+        zoom = int(request.args.get('zoom', 0))
+        exclude_ids = [
+            int(id_) for id_ in request.args.get('exclude', '').split(',')
+            if id_]
+    except (KeyError, ValueError):
+        abort(400)
+    if len(bbox) != 4:
+        abort(400)
+    return jsonify(Gis.get_places_by_bbox(bbox, zoom, exclude_ids))
+
+
 @app.route('/ajax/get_type_tree/<int:root_id>')
 @required_group('readonly')
 def ajax_get_type_tree(root_id: Optional[int] = None) -> str:
@@ -94,6 +112,34 @@ def ajax_get_entity_table(content_domain: str) -> str:
     return table_.display(content_domain)
 
 
+@app.route('/ajax/table/<field_id>')
+@required_group('readonly')
+def ajax_table(field_id: str) -> Response:
+    classes = request.args.get('classes', '').split(',')
+    multiple = request.args.get('multiple') == '1'
+    try:
+        exclude_ids = [
+            int(id_) for id_ in request.args.get('exclude', '').split(',')
+            if id_]
+    except ValueError:
+        abort(400)
+    if any(class_ not in g.classes for class_ in classes):
+        abort(400)
+    if multiple:
+        header = [''] + g.table_headers[g.classes[classes[0]].view]
+    else:
+        header = g.table_headers[classes[0]]
+    return jsonify(
+        get_table_data(
+            {
+                'classes': classes,
+                'descriptions': False,
+                'exclude_ids': exclude_ids},
+            header,
+            table_multi_row if multiple
+            else lambda entity: table_row(entity, field_id)))
+
+
 @app.route('/ajax/wikidata_info', methods=['POST'])
 @required_group('readonly')
 def ajax_wikidata_info() -> str:
@@ -15,13 +15,14 @@ from openatlas.display import classes
 from openatlas.display.image_processing import resize_image
 from openatlas.display.util import (
     button, check_iiif_activation, check_iiif_file_exist,
-    convert_image_to_iiif, get_base_table_data, get_file_path,
-    get_iiif_file_path, link, required_group)
+    convert_image_to_iiif, delete_iiif_image, get_base_table_data,
+    get_file_path, link, required_group)
 from openatlas.display.util2 import is_authorized
 from openatlas.forms.manager_base import BaseManager
 from openatlas.forms.form import get_manager
 from openatlas.forms.util import was_modified
 from openatlas.models.entity import Entity
+from openatlas.models.file_registry import get_registry
 from openatlas.models.gis import InvalidGeomException
 from openatlas.models.reference_system import ReferenceSystem
 from openatlas.models.type import Type
@@ -210,6 +211,7 @@ def insert_files(manager: BaseManager) -> str:
             ext = secure_filename(file.filename).rsplit('.', 1)[1].lower()
             path = app.config['UPLOAD_PATH'] / name
             file.save(str(path))
+            get_registry(app.config['UPLOAD_PATH']).add(path)
             if f'.{ext}' in g.display_file_ext:
                 call(f'exiftran -ai {path}', shell=True)  # Fix rotation
             filenames.append(name)
@@ -232,6 +234,8 @@ def insert_files(manager: BaseManager) -> str:
         Transaction.rollback()
         for filename in filenames:
             (app.config['UPLOAD_PATH'] / filename).unlink()
+            get_registry(app.config['UPLOAD_PATH']).remove(
+                int(filename.split('.')[0]))
         g.logger.log('error', 'database', 'transaction failed', e)
         flash(_('error transaction'), 'error')
         url = url_for('index', view=g.classes['file'].view)
@@ -333,8 +337,9 @@ def get_redirect_url(manager: BaseManager) -> str:
 def delete_files(id_: int) -> None:
     if path := get_file_path(id_):  # Prevent missing file warning
         path.unlink()
+        get_registry(app.config['UPLOAD_PATH']).remove(id_)
     for resized_path in app.config['RESIZED_IMAGES'].glob(f'**/{id_}.*'):
         resized_path.unlink()
+        get_registry(resized_path.parent).remove(id_)
     if g.settings['iiif'] and check_iiif_file_exist(id_):
-        if path := get_iiif_file_path(id_):
-            path.unlink()
+        delete_iiif_image(id_)
@@ -1,4 +1,6 @@
-from flask import g, render_template, url_for
+from typing import Any, Callable
+
+from flask import abort, g, jsonify, render_template, request, url_for
 from flask_babel import format_number, lazy_gettext as _
 from werkzeug.wrappers import Response
 
@@ -10,8 +12,10 @@ from openatlas.display.util import (
     required_group)
 from openatlas.display.util2 import (
     format_date, is_authorized, manual, show_table_icons, uc_first)
-from openatlas.models.entity import Entity
+from openatlas.forms.field import is_server_side
+from openatlas.models.entity import Entity, get_table_count, get_table_page
 from openatlas.models.gis import Gis
+from openatlas.models.openatlas_class import OpenatlasClass
 
 
 @app.route('/index/<view>')
@@ -35,11 +39,59 @@ def index(view: str) -> str | Response:
         table=table,
         file_info=file_info,
         buttons=buttons,
-        gis_data=Gis.get_all() if view == 'place' else None,
+        gis_data=Gis.get_all(places=False) if view == 'place' else None,
         title=_(view.replace('_', ' ')),
         crumbs=crumbs)
 
 
+@app.route('/index/<view>/data')
+@required_group('readonly')
+def index_data(view: str) -> Response:
+    if view not in g.view_class_mapping \
+            or view in ['file', 'reference_system']:
+        abort(404)
+    return jsonify(
+        get_table_data(
+            {'classes': get_index_classes(view)},
+            g.table_headers[view],
+            get_base_table_data))
+
+
+def get_table_data(
+        filters: dict[str, Any],
+        header: list[str],
+        get_row: Callable[[Entity], list[Any]]) -> dict[str, Any]:
+    """Get a page of rows for a DataTables server side processing request,
+    see get_table_count() for filters."""
+    term = request.args.get('search[value]', '').strip()
+    try:
+        column = header[int(request.args.get('order[0][column]', 0))]
+        offset = max(int(request.args.get('start', 0)), 0)
+        length = int(request.args.get('length', 25))
+        draw = int(request.args.get('draw', 0))
+    except (IndexError, ValueError):
+        abort(400)
+    entities = get_table_page(
+        filters | {'term': term},
+        column,
+        request.args.get('order[0][dir]') == 'desc',
+        offset,
+        length if length > 0 else None)  # DataTables uses -1 for all
+    total = get_table_count(filters) if filters.get('exclude_ids') \
+        else OpenatlasClass.get_entity_count(filters['classes'])
+    return {
+        'draw': draw,
+        'recordsTotal': total,
+        'recordsFiltered':
+            get_table_count(filters | {'term': term})
+            if term else total,
+        'data': [get_row(entity) for entity in entities]}
+
+
+def get_index_classes(view: str) -> list[str]:
+    return ['place'] if view == 'place' else g.view_class_mapping[view]
+
+
 def get_table(view: str) -> tuple[Table, str]:
     file_info = ''
     table = Table(g.table_headers[view])
@@ -89,9 +141,12 @@ def get_table(view: str) -> tuple[Table, str]:
                 if system.precision_default_id else '',
                 system.description])
     else:
-        classes = 'place' if view == 'place' else g.view_class_mapping[view]
-        entities = Entity.get_by_class(classes, types=True, aliases=True)
-        table.rows = [get_base_table_data(entity) for entity in entities]
+        classes = get_index_classes(view)
+        if is_server_side(classes):
+            table.ajax = url_for('index_data', view=view)
+        else:
+            entities = Entity.get_by_class(classes, types=True, aliases=True)
+            table.rows = [get_base_table_data(entity) for entity in entities]
     return table, file_info
 
 
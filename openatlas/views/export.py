@@ -6,11 +6,13 @@ from werkzeug.utils import redirect
 from werkzeug.wrappers import Response
 
 from openatlas import app
+from openatlas.api.endpoints.special import ExportDatabase
 from openatlas.display.tab import Tab
 from openatlas.display.table import Table
 from openatlas.display.util import button, link, required_group
 from openatlas.display.util2 import convert_size, is_authorized, manual
-from openatlas.models.export import sql_export
+from openatlas.models.job import Job, task
+from openatlas.views.job import flash_job
 
 
 @app.route('/download/sql/<filename>')
@@ -26,15 +28,30 @@ def download_sql(filename: str) -> Response:
 @required_group('manager')
 def export_execute(format_: str) -> Response:
     if os.access(app.config['EXPORT_PATH'], os.W_OK):
-        if sql_export(format_):
-            g.logger.log('info', 'database', 'SQL export')
-            flash(_('data was exported'), 'info')
-        else:  # pragma: no cover
-            g.logger.log('error', 'database', 'SQL export failed')
-            flash(_('export failed'), 'error')
+        flash_job(
+            Job.start('sql_export', {'format_': format_}),
+            _('data was exported'))
     return redirect(url_for('export_sql'))
 
 
+@app.route('/export/database/<format_>')
+@required_group('manager')
+def export_database_execute(format_: str) -> Response:
+    if os.access(app.config['EXPORT_PATH'], os.W_OK):
+        flash_job(
+            Job.start('export_database', {'format_': format_}),
+            _('data was exported'))
+    return redirect(url_for('export_sql'))
+
+
+@task('export_database')
+def export_database_task(job: Job, format_: str) -> None:
+    response = ExportDatabase.get(format_)
+    job.result = response.headers['Content-Disposition'].split('filename=')[1]
+    (app.config['EXPORT_PATH'] / job.result).write_bytes(response.get_data())
+    g.logger.log('info', 'database', f'database export {format_}')
+
+
 @app.route('/export/sql')
 @required_group('manager')
 def export_sql() -> str:
@@ -70,7 +87,8 @@ def export_sql() -> str:
                         url_for('export_execute', format_='sql')),
                     button(
                         _('export database dump'),
-                        url_for('export_execute', format_='dump'))])},
+                        url_for('export_execute', format_='dump')),
+                    button(_('jobs'), url_for('job_index'))])},
         title=_('export SQL'),
         crumbs=[
             [_('admin'), f"{url_for('admin_index')}#tab-data"],
@@ -1,9 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Any, Optional
 
 from flask import (
     abort, flash, g, render_template, request, send_from_directory, url_for)
 from flask_babel import lazy_gettext as _
+from markupsafe import escape
 from werkzeug.utils import redirect
 from werkzeug.wrappers import Response
 
@@ -12,16 +14,21 @@ from openatlas.display.tab import Tab
 from openatlas.display.table import Table
 from openatlas.display.util import (
     button, check_iiif_activation, check_iiif_file_exist,
-    convert_image_to_iiif, delete_iiif_image, display_info, link,
-    required_group)
+    convert_image_to_iiif, delete_iiif_image, display_info, get_file_path,
+    get_iiif_file_path, link, required_group, run_iiif_conversion,
+    update_iiif_info)
 from openatlas.display.util2 import format_date, is_authorized, manual
 from openatlas.forms.form import get_table_form
 from openatlas.forms.setting import FileForm, IiifForm
 from openatlas.forms.util import get_form_settings
 from openatlas.models.entity import Entity
+from openatlas.models.file_registry import get_registry
+from openatlas.models.iiif import IiifConversion
+from openatlas.models.job import Job, task
 from openatlas.models.settings import Settings
 from openatlas.views.admin import (
     count_files_to_convert, count_files_to_delete, get_disk_space_info)
+from openatlas.views.job import flash_job
 
 
 @required_group('readonly')
@@ -51,6 +58,9 @@ def file_index() -> str:
                 button(
                     _('convert all files') + f' ({count_files_to_convert()})',
                     url_for('convert_iiif_files')),
+                button(
+                    _('IIIF conversion'),
+                    url_for('iiif_conversion_status')),
                 button(
                     _('delete all IIIF files') +
                     f' ({count_files_to_delete()})',
@@ -152,26 +162,102 @@ def get_manifest_url(id_: int) -> str:
 
 
 @app.route('/convert_iiif_files')
+@app.route('/convert_iiif_files/<int:retry>')
 @required_group('admin')
-def convert_iiif_files() -> Response:
-    convert()
-    return redirect(url_for('file_index') + '#tab-IIIF')
-
-
-def convert() -> None:
+def convert_iiif_files(retry: int = 0) -> Response:
     if not check_iiif_activation():  # pragma: no cover
         flash(_('please activate IIIF'), 'info')
-        return
-    if not g.settings['iiif_conversion']:  # pragma: no cover
+    elif not g.settings['iiif_conversion']:  # pragma: no cover
         flash(_('please activate IIIF conversion'), 'info')
-        return
+    else:
+        flash_job(
+            Job.start('iiif_conversion', {'retry': bool(retry)}),
+            _('all image files are converted'),
+            url_for('iiif_conversion_status'))
+    return redirect(url_for('iiif_conversion_status'))
+
+
+@task('iiif_conversion')
+def convert(job: Job, retry: bool = False) -> None:
+    """Convert all image files which aren't converted yet with parallel
+    vips processes. Already converted files are skipped so an interrupted
+    job can be resumed by starting it again. Failed conversions are retried
+    until IIIF_CONVERSION_ATTEMPTS is reached or, with retry, again."""
+    if retry:
+        IiifConversion.delete_failed()
+    attempts = app.config['IIIF_CONVERSION_ATTEMPTS']
+    failed = IiifConversion.get_failed_ids(attempts)
     existing_files = [entity.id for entity in Entity.get_by_class('file')]
-    for id_, file_path in g.files.items():
-        if check_iiif_file_exist(id_):
-            continue
-        if id_ in existing_files and file_path.suffix in g.display_file_ext:
-            convert_image_to_iiif(id_)
-    flash(_('all image files are converted'), 'info')
+    ids = [
+        id_ for id_, file_path in g.files.items()
+        if id_ in existing_files
+        and id_ not in failed
+        and file_path.suffix in g.display_file_ext
+        and not check_iiif_file_exist(id_)]
+    total = len(ids)
+    progress = 0
+    with ThreadPoolExecutor(app.config['IIIF_CONVERSION_WORKERS']) as pool:
+        while ids:
+            futures = {
+                pool.submit(
+                    run_iiif_conversion,
+                    get_file_path(id_),
+                    get_iiif_file_path(id_),
+                    g.settings['iiif_conversion']): id_
+                for id_ in ids}
+            ids = []
+            for future in as_completed(futures):
+                id_ = futures[future]
+                error = future.result()
+                IiifConversion.log(id_, error)
+                if error:
+                    if IiifConversion.get_attempts(id_) < attempts:
+                        ids.append(id_)
+                        continue
+                else:
+                    path = get_iiif_file_path(id_)
+                    get_registry(path.parent).add(path)
+                    update_iiif_info(id_)
+                progress += 1
+                job.set_progress(progress, total)
+    if failed := IiifConversion.get_failed_ids(attempts):
+        job.message = str(
+            _('IIIF conversion failed for %(count)s files', count=len(failed)))
+
+
+@app.route('/iiif_conversion')
+@required_group('admin')
+def iiif_conversion_status() -> str:
+    table = Table(
+        ['file', 'status', 'attempts', 'message', 'modified'],
+        order=[[4, 'desc']])
+    items = IiifConversion.get_all()
+    files = {e.id: e for e in Entity.get_by_ids([i.file_id for i in items])}
+    failed = 0
+    for item in items:
+        failed += item.status == 'failed'
+        table.rows.append([
+            link(files[item.file_id]),
+            _(item.status),
+            item.attempts,
+            escape(item.message) if item.message else '',
+            item.modified.replace(microsecond=0).isoformat()])
+    buttons = [
+        button(
+            _('convert all files') + f' ({count_files_to_convert()})',
+            url_for('convert_iiif_files'))]
+    if failed:
+        buttons.append(
+            button(
+                _('retry failed') + f' ({failed})',
+                url_for('convert_iiif_files', retry=1)))
+    return render_template(
+        'tabs.html',
+        tabs={'IIIF': Tab('IIIF', table=table, buttons=buttons)},
+        title=_('file'),
+        crumbs=[
+            [_('file'), f"{url_for('file_index')}#tab-IIIF"],
+            _('IIIF conversion')])
 
 
 @app.route('/delete_iiif_file/<int:id_>')
@@ -197,6 +283,7 @@ def delete_all_iiif_files() -> None:
     for id_ in g.files:
         if check_iiif_file_exist(id_):
             delete_iiif_image(id_)
+    IiifConversion.delete_failed()  # Files without a converted IIIF file
     flash(_('all IIIF files are deleted'), 'info')
 
 
@@ -212,9 +299,9 @@ def logo(id_: Optional[int] = None) -> str | Response:
     table = Table([''] + g.table_headers['file'] + ['date'])
     for entity in Entity.get_display_files():
         date = 'N/A'
-        if entity.id in g.files:
-            date = format_date(
-                datetime.fromtimestamp(g.files[entity.id].stat().st_ctime))
+        if ctime := get_registry(app.config['UPLOAD_PATH']).get_ctime(
+                entity.id):
+            date = format_date(datetime.fromtimestamp(ctime))
         table.rows.append([
             link(_('set'), url_for('logo', id_=entity.id)),
             entity.name,
@@ -1,3 +1,5 @@
+import json
+import uuid
 from collections import Counter, defaultdict
 from pathlib import Path
 from typing import Any, Optional
@@ -35,6 +37,8 @@ from openatlas.models.entity import Entity
 from openatlas.models.imports import (
     Project, check_duplicates, check_single_type_duplicates, check_type_id,
     clean_reference_pages, get_id_from_origin_id, get_origin_ids, import_data_)
+from openatlas.models.job import Job, task
+from openatlas.views.job import flash_job
 
 _('invalid columns')
 _('possible duplicates')
@@ -299,17 +303,16 @@ def import_data(project_id: int, class_: str) -> str:
 
         if not form.preview.data and checked_data and (
                 not file_data['backup_too_old'] or app.testing):
-            Transaction.begin()
-            try:
-                import_data_(project, class_, checked_data)
-                Transaction.commit()
-                g.logger.log('info', 'import', f'import: {len(checked_data)}')
-                flash(f"{_('import of')}: {len(checked_data)}", 'info')
-                imported = True
-            except Exception as e:  # pragma: no cover
-                Transaction.rollback()
-                g.logger.log('error', 'import', 'import failed', e)
-                flash(_('error transaction'), 'error')
+            # Rows are staged in a file, only its name is stored with the job
+            staging_file = \
+                app.config['TMP_PATH'] / f'import_{uuid.uuid4()}.json'
+            staging_file.write_text(json.dumps(checked_data), encoding='utf-8')
+            job = Job.start('import', {
+                'project_id': project.id,
+                'class_': class_,
+                'filename': staging_file.name})
+            flash_job(job, f"{_('import of')}: {len(checked_data)}")
+            imported = job.status == 'finished'
     return render_template(
         'import_data.html',
         form=form,
@@ -324,6 +327,30 @@ def import_data(project_id: int, class_: str) -> str:
             class_label])
 
 
+@task('import')
+def import_task(
+        job: Job,
+        project_id: int,
+        class_: str,
+        filename: str) -> None:
+    path = app.config['TMP_PATH'] / filename
+    data = json.loads(path.read_text(encoding='utf-8'))
+    path.unlink()
+    Transaction.begin()
+    try:
+        import_data_(
+            Project.get_by_id(project_id),
+            class_,
+            data,
+            lambda _table, _count: job.set_progress(job.progress + 1, 4))
+        Transaction.commit()
+    except Exception as e:
+        Transaction.rollback()
+        g.logger.log('error', 'import', 'import failed', e)
+        raise
+    g.logger.log('info', 'import', f'import: {len(data)}')
+
+
 def check_data_for_table_representation(
         form: ImportForm,
         class_: str,
@@ -0,0 +1,125 @@
+from typing import Optional
+
+from flask import flash, render_template, url_for
+from flask_babel import lazy_gettext as _
+from markupsafe import escape
+from werkzeug.exceptions import abort
+from werkzeug.utils import redirect
+from werkzeug.wrappers import Response
+
+from openatlas import app
+from openatlas.display.tab import Tab
+from openatlas.display.table import Table
+from openatlas.display.util import (
+    button, display_info, link, required_group)
+from openatlas.display.util2 import uc_first
+from openatlas.models.job import Job
+from openatlas.models.user import User
+
+
+def flash_job(job: Job, message: str, url: Optional[str] = None) -> None:
+    match job.status:
+        case 'finished':
+            flash(job.message or message, 'info')
+        case 'failed':  # pragma: no cover
+            flash(_('job failed'), 'error')
+        case _:
+            flash(
+                f"{uc_first(_('job started'))}: "
+                f"{link(_('status'), url or url_for('job_view', id_=job.id))}",
+                'info')
+
+
+def get_progress(job: Job) -> str:
+    if job.total:
+        return f'{job.progress}/{job.total}'
+    return str(job.progress) if job.progress else ''
+
+
+def get_result(job: Job) -> str:
+    if job.name == 'check_links' and job.result:
+        return link(_('show'), url_for('check_links'))
+    if job.name == 'check_similar' and job.result:
+        return link(_('show'), url_for('check_similar', job_id=job.id))
+    if job.result and (app.config['EXPORT_PATH'] / job.result).is_file():
+        return link(
+            job.result,
+            url_for('download_sql', filename=job.result),
+            uc_first_=False)
+    return job.result or ''
+
+
+def get_user(job: Job) -> str:
+    if job.user_id and (user := User.get_by_id(job.user_id)):
+        return link(user)
+    return ''
+
+
+@app.route('/admin/job')
+@required_group('manager')
+def job_index() -> str:
+    table = Table(
+        ['id', 'name', 'status', 'progress', 'user', 'created', 'finished',
+         'result'],
+        order=[[0, 'desc']])
+    Job.recover()
+    for job in Job.get_all():
+        table.rows.append([
+            link(str(job.id), url_for('job_view', id_=job.id)),
+            _(job.name.replace('_', ' ')),
+            _(job.status),
+            get_progress(job),
+            get_user(job),
+            job.created.replace(microsecond=0).isoformat(),
+            job.finished.replace(microsecond=0).isoformat()
+            if job.finished else '',
+            get_result(job)])
+    return render_template(
+        'tabs.html',
+        tabs={
+            'jobs': Tab(
+                'jobs',
+                table=table,
+                buttons=[
+                    button(
+                        _('delete finished jobs'),
+                        url_for('job_delete_finished'))])},
+        title=_('jobs'),
+        crumbs=[
+            [_('admin'), f"{url_for('admin_index')}#tab-data"],
+            _('jobs')])
+
+
+@app.route('/admin/job/<int:id_>')
+@required_group('manager')
+def job_view(id_: int) -> str:
+    if not (job := Job.get_by_id(id_)):
+        abort(404)  # pragma: no cover
+    return render_template(
+        'content.html',
+        content=display_info({
+            _('name'): _(job.name.replace('_', ' ')),
+            _('status'): _(job.status),
+            _('progress'): get_progress(job),
+            _('user'): get_user(job),
+            _('created'): job.created.replace(microsecond=0).isoformat(),
+            _('started'): job.started.replace(microsecond=0).isoformat()
+            if job.started else '',
+            _('finished'): job.finished.replace(microsecond=0).isoformat()
+            if job.finished else '',
+            _('message'): escape(job.message) if job.message else '',
+            _('result'): get_result(job)}),
+        buttons=[button(_('reload'), url_for('job_view', id_=job.id))],
+        title=_('jobs'),
+        crumbs=[
+            [_('admin'), f"{url_for('admin_index')}#tab-data"],
+            [_('jobs'), url_for('job_index')],
+            str(job.id)])
+
+
+@app.route('/admin/job/delete_finished')
+@required_group('manager')
+def job_delete_finished() -> Response:
+    Job.delete_finished()
+    flash(_('finished jobs deleted'), 'info')
+    return redirect(url_for('job_index'))
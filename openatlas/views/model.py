@@ -276,18 +276,19 @@ def network(dimensions: Optional[int] = 0, id_: Optional[int] = None) -> str:
         (class_.name, class_.label)
         for class_ in [x for x in classes if x.name != 'object_location']]
     if entity:
-        json_data = Network.get_ego_network_json(
+        network_data = Network.get_ego_network_data(
             {c.name: getattr(form, c.name).data for c in classes},
             entity.id,
             int(form.depth.data),
-            dimensions)
+            dimensions,
+            app.config['NETWORK_EGO_MAX_NODES'])
         crumbs = [
             [_(entity.class_.view.replace('_', ' ')),
              url_for('index', view=entity.class_.view)],
             entity,
             _('network')]
     else:
-        json_data = Network.get_network_json(
+        network_data = Network.get_network_data(
             {c.name: getattr(form, c.name).data for c in classes},
             bool(form.orphans.data),
             dimensions)
@@ -295,7 +296,7 @@ def network(dimensions: Optional[int] = 0, id_: Optional[int] = None) -> str:
             _('network visualization'),
             f'{dimensions}D' if dimensions else _('classic')]
     buttons = [manual('tools/network')]
-    if json_data:
+    if network_data:
         if dimensions:
             buttons.append(
                 button('classic', url_for('network', dimensions=0, id_=id_)))
@@ -325,6 +326,6 @@ def network(dimensions: Optional[int] = 0, id_: Optional[int] = None) -> str:
                 'height': form.height.data,
                 'charge': form.charge.data,
                 'distance': form.distance.data}},
-        json_data=json_data,
+        network_data=network_data,
         title=_('model'),
         crumbs=crumbs)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 
 from flask import abort, flash, g, render_template, url_for
 from flask_babel import format_number, lazy_gettext as _
@@ -50,20 +50,25 @@ def type_index() -> str:
         'place': {},
         'value': {},
         'system': {}}
+    # Request data is kept apart from the types which are shared by requests
+    chart_data: dict[int, Optional[dict[str, Any]]] = {}
+    reference_systems: dict[int, list[Link]] = {}
     for type_ in [type_ for type_ in g.types.values() if not type_.root]:
         if type_.category in types:
-            type_.chart_data = get_chart_data(type_)
+            chart_data[type_.id] = get_chart_data(type_)
             types[type_.category][type_] = render_template(
                 'forms/tree_select_item.html',
                 name=sanitize(type_.name),
                 data=walk_tree(type_.subs))
-            for link_ in type_.get_links('P67', inverse=True):
-                if link_.domain.class_.view == 'reference_system':
-                    type_.reference_systems.append(link_)
+            reference_systems[type_.id] = [
+                link_ for link_ in type_.get_links('P67', inverse=True)
+                if link_.domain.class_.view == 'reference_system']
     return render_template(
         'type/index.html',
         buttons=[manual('entity/type')],
         types=types,
+        chart_data=chart_data,
+        reference_systems=reference_systems,
         title=_('types'),
         crumbs=[_('types')])
 
@@ -15,6 +15,7 @@ class TestBaseCase(unittest.TestCase):
     def setUp(self) -> None:
         app.testing = True
         app.config.from_pyfile('testing.py')
+        app.config['JOBS_IN_BACKGROUND'] = False  # Run jobs in the request
         self.setup_database()
         self.client = app.test_client()
         with app.app_context():
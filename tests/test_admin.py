@@ -1,11 +1,16 @@
 from pathlib import Path
 
 from flask import g, url_for
+from fuzzywuzzy import fuzz
 
 from openatlas import app
-from openatlas.database import entity as db
+from openatlas.database import entity as db, job as job_db
+from openatlas.database.connect import get_pool_stats
 from openatlas.forms.util import form_to_datetime64
-from openatlas.models.entity import Link
+from openatlas.models.checks import invalid_cidoc_links, similar_name_pairs
+from openatlas.models.entity import Entity, Link
+from openatlas.models.job import Job, run_jobs
+from openatlas.models.openatlas_class import OpenatlasClass
 from tests.base import TestBaseCase, get_hierarchy, insert
 
 
@@ -28,14 +33,45 @@ class AdminTests(TestBaseCase):
                 'type_id': None})
 
         assert b'Oliver Twist' in c.get(url_for('orphans')).data
+
+        rv = c.get(url_for('admin_index'))
+        assert b'Database connection pool' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            stats = get_pool_stats()
+            assert stats['in use'] == 1
+            assert stats['idle'] == stats['open'] - 1
         assert b'Login' in c.get(url_for('log')).data
         assert b'Login' not in c.get(url_for('log_delete')).data
 
         rv = c.get(url_for('check_dates'))
         assert b'Congratulations, everything looks fine!' in rv.data
 
+        rv = c.post(url_for('check_links'), follow_redirects=True)
+        assert b'Invalid linked entity' in rv.data
+        job_count = len(Job.get_all())
         rv = c.get(url_for('check_links'))
         assert b'Invalid linked entity' in rv.data
+        assert len(Job.get_all()) == job_count
+
+        with app.test_request_context():
+            app.preprocess_request()
+            last_id = invalid_cidoc_links()[-1]['id']
+        rv = c.get(url_for('check_links', after=last_id))
+        assert b'Invalid linked entity' not in rv.data
+        assert b'Congratulations' not in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            stopped_id = job_db.insert('check_links', {}, None)
+            job_db.start(stopped_id)
+            job_db.unlock(stopped_id)  # As if its worker was stopped
+        rv = c.post(url_for('check_links'), follow_redirects=True)
+        assert b'Invalid linked entity' in rv.data
+        with app.test_request_context():
+            app.preprocess_request()
+            assert Job.get_by_id(stopped_id).status == 'failed'
 
         file_ = 'Test77.txt'
         file_path = Path(app.config['UPLOAD_PATH'] / file_)
@@ -114,12 +150,47 @@ class AdminTests(TestBaseCase):
             follow_redirects=True)
         assert b'Congratulations, everything looks fine!' in rv.data
 
+        rv = c.post(url_for('admin_recount'), follow_redirects=True)
+        assert b'Counts were updated' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            assert OpenatlasClass.get_class_count()['person'] \
+                == len(Entity.get_by_class('person'))
+
+        with app.test_request_context():
+            app.preprocess_request()
+            queued_id = job_db.insert('recount', {}, None)
+            stopped_id = job_db.insert('recount', {}, None)
+            job_db.start(stopped_id)
+            job_db.unlock(stopped_id)  # As if its worker was stopped
+            assert Job.recover() == 1
+            assert Job.get_by_id(stopped_id).status == 'failed'
+        assert run_jobs() == 1
+        with app.test_request_context():
+            app.preprocess_request()
+            assert Job.get_by_id(queued_id).status == 'finished'
+
         rv = c.post(
             url_for('check_similar'),
             data={'classes': 'person', 'ratio': 100},
             follow_redirects=True)
         assert b'Oliver Twist' in rv.data
 
+        rv = c.get(url_for('job_index'))
+        assert b'check similar' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            persons = Entity.get_by_class('person')
+            ratios = {
+                (e.id, s.id): fuzz.ratio(e.name, s.name)
+                for e in persons for s in persons if e.id < s.id}
+            assert set(similar_name_pairs('person', 80)) \
+                <= {pair for pair, ratio in ratios.items() if ratio >= 80}
+            assert set(similar_name_pairs('person', 100)) \
+                == {pair for pair, ratio in ratios.items() if ratio == 100}
+
         rv = c.get(url_for('settings', category='mail'))
         assert b'mail from' in rv.data
 
@@ -145,7 +145,8 @@ class Api(ApiTestCase):
 
         for rv in [
                 c.get(url_for('api_04.geometric_entities')),
-                c.get(url_for('api_04.geometric_entities', download=True))]:
+                c.get(url_for('api_04.geometric_entities', download=True)),
+                c.get(url_for('api_04.geometric_entities', stream=True))]:
             rv = rv.get_json()
             assert rv['features'][0]['geometry']['coordinates']
             assert rv['features'][0]['properties']['id']
@@ -351,6 +352,34 @@ class Api(ApiTestCase):
             assert rv['pagination']['index']
             assert rv['pagination']['totalPages']
 
+        rv = c.get(url_for(
+            'api_04.system_class',
+            class_='place',
+            limit=0,
+            stream=True)).get_json()
+        assert rv['results'][0]['features'][0]['@id']
+        assert rv['pagination']['entities'] == len(rv['results'])
+        assert rv['pagination']['totalPages'] == 1
+        assert c.get(url_for(
+            'api_04.system_class',
+            class_='place',
+            count=True)).get_json() == rv['pagination']['entities']
+        rv = c.get(url_for(
+            'api_04.system_class',
+            class_='place',
+            format='geojson',
+            stream=True)).get_json()
+        assert rv['results'][0]['features'][0]['properties']['@id']
+        rv = c.get(url_for(
+            'api_04.query',
+            entities=location.id,
+            cidoc_classes='E18',
+            view_classes='artifact',
+            system_classes='person',
+            limit=0,
+            stream=True)).get_json()
+        assert rv['pagination']['entities'] == len(rv['results']) == 8
+
         # Test Entities with show=none
         rv = c.get(url_for('api_04.cidoc_class', class_='E21', show='none'))
         rv = rv.get_json()['results'][0]['features'][0]
@@ -637,6 +666,32 @@ class Api(ApiTestCase):
         assert b'(autogenerated)' in rv.data
         assert 'application/json' in rv.headers.get('Content-Type')
 
+        # Geometries of several entities loaded at once
+        rv = c.get(
+            url_for(
+                'api_04.view_class',
+                class_='place',
+                format='geojson',
+                centroid=True,
+                limit=0))
+        geoms: dict[str, list[dict[str, Any]]] = {}
+        for item in rv.get_json()['features']:
+            if item['geometry']:
+                geoms.setdefault(item['properties']['name'], []).append(
+                    item['geometry'])
+        assert [16.37069611, 48.208571233] \
+            in [geom['coordinates'] for geom in geoms['Shire']]
+        assert any(
+            '(autogenerated)' in geom['title']
+            for geom in geoms['Home of Baggins'])
+        rv = c.get(
+            url_for(
+                'api_04.view_class',
+                class_='place',
+                format='loud',
+                limit=0))
+        assert b'16.37069611 48.208571233' in rv.data
+
         rv = c.get(
             url_for(
                 'api_04.display',
@@ -41,6 +41,52 @@ class ArtifactTest(TestBaseCase):
         rv = c.get(url_for('index', view='artifact'))
         assert b'Love-letter' in rv.data
 
+        app.config['TABLE_SERVER_SIDE_ROWS'] = 1
+        rv = c.get(url_for('index', view='artifact'))
+        assert b'serverSide' in rv.data
+
+        rv = c.get(url_for('insert', class_='move'))
+        assert b'/ajax/table/moved_artifact' in rv.data
+        app.config['TABLE_SERVER_SIDE_ROWS'] = 5000
+
+        rv = c.get(
+            url_for(
+                'ajax_table',
+                field_id='moved_artifact',
+                classes='artifact',
+                multiple=1,
+                exclude=sub_artifact.id),
+            query_string={'search[value]': 'love'})
+        assert 'checkbox' in rv.get_json()['data'][0][0]
+        assert rv.get_json()['recordsFiltered'] == 1
+
+        rv = c.get(
+            url_for('ajax_table', field_id='super', classes='place'),
+            query_string={'search[value]': 'hom'})
+        assert 'selectFromTable' in rv.get_json()['data'][0][0]
+
+        rv = c.get(
+            url_for('ajax_table', field_id='super', classes='place'),
+            query_string={'search[value]': '%'})
+        assert rv.get_json()['recordsFiltered'] == 0
+
+        rv = c.get(url_for('ajax_table', field_id='super', classes='x'))
+        assert rv.status_code == 400
+
+        rv = c.get(url_for('ajax_table', field_id='super', classes='place,x'))
+        assert rv.status_code == 400
+
+        rv = c.get(
+            url_for('index_data', view='artifact'),
+            query_string={
+                'draw': 1,
+                'start': 0,
+                'length': 10,
+                'search[value]': 'love',
+                'order[0][column]': 2,
+                'order[0][dir]': 'desc'})
+        assert 'Love-letter' in rv.get_json()['data'][0][0]
+
         rv = c.get(url_for('update', id_=artifact_id))
         assert b'Love-letter' in rv.data
 
@@ -1,6 +1,8 @@
 from flask import url_for
 
 from openatlas import app
+from openatlas.display.util2 import epoch_to_datetime64, format_date_part
+from openatlas.models.entity import Entity
 from tests.base import TestBaseCase
 
 
@@ -60,3 +62,13 @@ class DateTest(TestBaseCase):
                 data=data,
                 follow_redirects=True)
             assert b'Required for time span' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            place = [
+                e for e in Entity.get_by_class('place')
+                if e.name == 'Date place'][0]
+            assert place.first == '-1949' and place.last == '1996'
+            dates = epoch_to_datetime64([None] * 99 + [-62167219200])
+            assert dates[0] is None
+            assert format_date_part(dates[-1], 'year') == '-1'
@@ -33,6 +33,21 @@ class ExportImportTest(ExportImportTestCase):
         rv = c.get(url_for('download_sql', filename=f'{date_}_export.dump.7z'))
         assert b'7z' in rv.data
 
+        rv = c.get(
+            url_for('export_database_execute', format_='json'),
+            follow_redirects=True)
+        assert b'Data was exported' in rv.data
+
+        rv = c.get(url_for('job_index'))
+        assert b'export database' in rv.data
+        assert b'-export.json' in rv.data
+
+        rv = c.get(url_for('job_view', id_=1))
+        assert b'finished' in rv.data
+
+        rv = c.get(url_for('job_delete_finished'), follow_redirects=True)
+        assert b'Finished jobs deleted' in rv.data
+
         assert b'Warning' in c.get(url_for('sql_index')).data
         assert b'execute' in c.get(url_for('sql_execute')).data
 
@@ -81,6 +96,7 @@ class ExportImportTest(ExportImportTestCase):
                 data={'file': file, 'duplicate': True},
                 follow_redirects=True)
         assert b'Vienna' in rv.data
+        assert not list(app.config['TMP_PATH'].glob('import_*.json'))
 
         with open(self.static_path / 'example.csv', 'rb') as file:
             rv = c.post(
@@ -5,6 +5,8 @@ from flask import g, url_for
 
 from openatlas import app
 from openatlas.models.entity import Entity
+from openatlas.models.file_registry import get_registry
+from openatlas.models.iiif import IiifConversion
 from tests.base import TestBaseCase, get_hierarchy, insert
 
 
@@ -88,9 +90,49 @@ class FileTest(TestBaseCase):
         rv = c.get(url_for('convert_iiif_files'), follow_redirects=True)
         assert b'All image files are converted' in rv.data
 
+        rv = c.get(url_for('iiif_conversion_status'))
+        assert b'IIIF File' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            broken = insert('file', 'Broken image')
+            broken_path = Path(app.config['UPLOAD_PATH']) / f'{broken.id}.png'
+            broken_path.write_bytes(b'Not an image')
+            registry = get_registry(broken_path.parent)
+            registry.add(broken_path)
+            broken_path.write_bytes(b'Still not an image')  # In place
+            assert registry.get_size(broken.id) == 18
+
+        attempts = app.config['IIIF_CONVERSION_ATTEMPTS']
+        rv = c.get(url_for('convert_iiif_files'), follow_redirects=True)
+        assert b'IIIF conversion failed for 1 files' in rv.data
+
+        rv = c.get(url_for('iiif_conversion_status'))
+        assert b'Broken image' in rv.data and b'retry failed' in rv.data
+
+        c.get(url_for('convert_iiif_files'))
+        with app.test_request_context():
+            app.preprocess_request()
+            assert IiifConversion.get_attempts(broken.id) == attempts
+            assert IiifConversion.get_attempts(int(iiif_id)) == 1
+            assert not list(Path(g.settings['iiif_path']).glob('*.part.*'))
+
+        app.config['IIIF_CONVERSION_ATTEMPTS'] = 1
+        c.get(url_for('convert_iiif_files', retry=1))
+        app.config['IIIF_CONVERSION_ATTEMPTS'] = attempts
+        with app.test_request_context():
+            app.preprocess_request()
+            assert IiifConversion.get_attempts(broken.id) == 1
+
         rv = c.get(url_for('delete_iiif_files'), follow_redirects=True)
         assert b'IIIF files are deleted' in rv.data
 
+        with app.test_request_context():
+            app.preprocess_request()
+            assert not IiifConversion.get_all()
+            broken.delete()
+            broken_path.unlink()
+
         filename = f'{iiif_id}.png'
         with c.get(url_for('display_logo', filename=filename)):
             pass
@@ -155,6 +197,7 @@ class FileTest(TestBaseCase):
         rv = c.get(url_for('view', id_=iiif_id))
         assert b'enable IIIF view' in rv.data
 
+        app.config['IIIF_INFO_FROM_FILE'] = True
         rv = c.get(
             url_for('make_iiif_available', id_=iiif_id),
             follow_redirects=True)
@@ -190,6 +233,8 @@ class FileTest(TestBaseCase):
 
         rv = c.get(url_for('api.iiif_canvas', id_=iiif_id))
         assert bool(str(iiif_id) in rv.get_json()['@id'])
+        assert rv.get_json()['width']
+        app.config['IIIF_INFO_FROM_FILE'] = False
 
         with app.test_request_context():
             app.preprocess_request()
@@ -92,9 +92,12 @@ class ImageTest(TestBaseCase):
         assert b'Test_File' in rv.data
 
         app.config['IMAGE_SIZE']['tmp'] = '1'
-        rv = c.get(url_for('resize_images'), follow_redirects=True)
+        rv = c.post(url_for('resize_images'), follow_redirects=True)
         assert b'Images were created' in rv.data
 
+        rv = c.get(url_for('job_index'))
+        assert b'images in' in rv.data
+
         rv = c.get(
             url_for('admin_delete_orphaned_resized_images'),
             follow_redirects=True)
@@ -1,4 +1,4 @@
-from flask import url_for
+from flask import g, url_for
 
 from openatlas import app
 from tests.base import TestBaseCase, insert
@@ -31,13 +31,46 @@ class ModelTests(TestBaseCase):
             source.link('P67', event)
             place = insert('place', 'Camelot')
             actor.link('P74', place.get_linked_entity_safe('P53'))
+            assert g.properties['P11'].is_valid('E7', 'E21')
+            assert not g.properties['P11'].is_valid('E21', 'E7')
 
         rv = c.get(url_for('network', dimensions=0, id_=place.id))
         assert b'Depth' in rv.data
 
+        rv = c.post(
+            url_for('network', dimensions=2, id_=place.id),
+            data={'depth': 3})
+        assert b'Battle of Camlann' in rv.data
+
+        app.config['NETWORK_EGO_MAX_NODES'] = 2
+        rv = c.post(
+            url_for('network', dimensions=2, id_=place.id),
+            data={'depth': 3})
+        assert b'King Arthur' in rv.data
+        assert b'Battle of Camlann' not in rv.data
+        app.config['NETWORK_EGO_MAX_NODES'] = 2000
+
         rv = c.get(url_for('network', dimensions=2))
         assert b'Show orphans' in rv.data
 
+        rv = c.post(url_for('network', dimensions=3), data={'orphans': True})
+        assert b'King Arthur' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            queen = insert('person', 'Queen Guinevere')
+            event.link('P11', queen)
+
+        rv = c.post(url_for('network', dimensions=3))
+        assert b'Queen Guinevere' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            event.delete_links(['P11'])
+
+        rv = c.post(url_for('network', dimensions=3))
+        assert b'Queen Guinevere' not in rv.data
+
         rv = c.get(url_for('network', dimensions=0))
         assert b'Show orphans' in rv.data
 
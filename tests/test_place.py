@@ -92,6 +92,23 @@ class PlaceTest(TestBaseCase):
         rv = c.get(url_for('view', id_=place.id+1))
         assert b"can't be viewed directly" in rv.data
 
+        rv = c.get(url_for('ajax_gis', bbox='0,0,20,20', zoom=5))
+        assert rv.json['gisPointAll'][0]['properties']['name'] == 'Valhalla'
+        assert rv.json['gisPolygonAll'] and rv.json['gisLineAll']
+
+        rv = c.get(
+            url_for(
+                'ajax_gis',
+                bbox='0,0,20,20',
+                exclude=f'{place.id},{place2.id}'))
+        assert not rv.json['gisPointAll']
+
+        rv = c.get(url_for('ajax_gis', bbox='0,0,20'))
+        assert rv.status_code == 400
+
+        rv = c.get(url_for('index', view='place'))
+        assert b'const gisPlacesExtent =    [[17.0, 9.0], [17.8' in rv.data
+
         data['geonames_id'] = ''
         rv = c.post(
             url_for('update', id_=place.id),
@@ -1,6 +1,9 @@
 from flask import url_for
 
 from openatlas import app
+from openatlas.database import entity as db
+from openatlas.models.entity import Entity
+from openatlas.models.settings import Settings
 from tests.base import TestBaseCase, insert
 
 
@@ -15,7 +18,17 @@ class SearchTest(TestBaseCase):
             person.link('P1', insert('appellation', 'Waldo alias'))
             object_ = insert('place', 'Waldorf')
             object_.link('P1', insert('appellation', 'Waldorf alias'))
-            insert('person', 'Waldo without date')
+            hidden = insert(
+                'person',
+                'Waldo without date',
+                'Hides in crowded places')
+            modified = Entity.get_by_id(hidden.id).modified
+            Settings.update({'default_language': 'de'})
+            assert db.update_search_vectors()
+            assert not db.update_search_vectors()
+            Settings.update({'default_language': 'en'})
+            assert db.update_search_vectors()
+            assert Entity.get_by_id(hidden.id).modified == modified
 
         rv = c.post(url_for('search_index'), data={'global-term': ''})
         assert b'no entries' in rv.data
@@ -38,6 +51,20 @@ class SearchTest(TestBaseCase):
             data={'term': 'do', 'classes': 'person'})
         assert b'Waldo' in rv.data
 
+        rv = c.post(
+            url_for('search_index'),
+            data={'term': 'orf ali', 'classes': 'place'})
+        assert b'Waldorf' in rv.data
+
+        rv = c.post(
+            url_for('search_index'),
+            data={
+                'term': 'crowd',
+                'classes': 'person',
+                'desc': True,
+                'include_dateless': True})
+        assert b'Waldo without date' in rv.data
+
         rv = c.post(
             url_for('search_index'),
             data={'term': 'x', 'begin_year': 2, 'end_year': -1})
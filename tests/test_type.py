@@ -18,8 +18,20 @@ class TypeTest(TestBaseCase):
             location = place.get_linked_entity_safe('P53')
             location.link('P89', g.types[historical_type.subs[0]])
 
+            g.wikidata.link(
+                'P67',
+                g.types[historical_type.subs[0]],
+                'Q123',
+                type_id=g.reference_match_type.subs[0])
+
         rv = c.get(url_for('view', id_=historical_type.subs[0]))
-        assert b'Historical place' in rv.data
+        assert b'Historical place' in rv.data and b'Q123' in rv.data
+
+        with app.test_request_context():
+            app.preprocess_request()
+            historical_sub = g.types[historical_type.subs[0]]
+            assert not historical_sub.reference_systems
+            assert historical_sub.image_id is None
 
         rv = c.get(url_for('insert', class_='type', origin_id=actor_type.id))
         assert b'Actor relation' in rv.data